@@ -0,0 +1,133 @@
+"""
+Fault-injection scenarios for the incident API retry policy and circuit breaker.
+
+Runs OrderProcessor.process_option_1 against the local services in
+benchmarks/localServices.py with a LatencyHTTPServer that fails on purpose:
+
+- flaky: a share of requests is answered with 503; retries should absorb them
+- outage: every request fails for --outage-seconds, then the API recovers; the breaker
+  should stop calls during the outage and parked requests should complete afterwards
+
+Each scenario runs with the breaker enabled and with it effectively disabled (a failure
+threshold nothing reaches), and reports API calls made, injected failures, requests
+completed and wall time.
+
+Run from the project root:
+    python -m benchmarks.apiFaultInjection [--backlog 200] [--outage-seconds 3]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+from benchmarks.localServices import (
+    InMemoryCollection, SQLiteMySQLConnection, LatencyHTTPServer, build_open_orders, create_customer_database
+)
+from orderManipulator import OrderMani, caseRegistration
+from orderManipulator.OrderMani import OrderProcessor
+from utils.api import connectAPI
+from utils.config.processingConfig import get_processing_config
+from utils.database import connectSQL
+from utils.database.connectSQL import MySQLConnectionPool
+
+
+def use_api_policy(args, breaker_enabled):
+    """Points connectAPI at a retry/breaker policy for this run and rebuilds the shared breaker."""
+    http_config = connectAPI.get_http_config()
+    http_config.update(
+        retry_attempts=args.retry_attempts,
+        retry_backoff_initial=args.backoff_ms / 1000,
+        retry_backoff_max=args.backoff_ms * 8 / 1000,
+        breaker_failure_threshold=args.failure_threshold if breaker_enabled else 10 ** 9,
+        breaker_reset_timeout=args.reset_seconds
+    )
+    connectAPI.get_http_config = lambda: dict(http_config)
+    connectAPI.reset_api_circuit_breaker()
+
+
+def drain(processor, collection, deadline):
+    """Polls like run_polling until no request is Open or the deadline passes."""
+    while collection.status_counts().get("Open") and time.monotonic() < deadline:
+        processor.process_option_1(processor.get_open_orders(order_id=1))
+        if processor.api_breaker.is_open():
+            time.sleep(max(processor.api_breaker.retry_after(), 0.05))
+            processor.parked = False
+
+
+def run_scenario(name, args, accounts, api, breaker_enabled):
+    use_api_policy(args, breaker_enabled)
+    collection = InMemoryCollection(build_open_orders(args.backlog, accounts))
+    OrderMani.get_mongo_collection = lambda: collection
+    processor = OrderProcessor()
+
+    api.requests = api.failures = 0
+    api.failure_rate = args.failure_rate if name == "flaky" else 0.0
+    recovery = None
+    if name == "outage":
+        api.set_outage(True)
+        recovery = threading.Timer(args.outage_seconds, api.set_outage, args=(False,))
+        recovery.start()
+
+    started = time.perf_counter()
+    try:
+        drain(processor, collection, time.monotonic() + args.timeout)
+    finally:
+        processor.close()
+        if recovery is not None:
+            recovery.cancel()
+        api.set_outage(False)
+    elapsed = time.perf_counter() - started
+
+    completed = collection.status_counts().get("Completed", 0)
+    print(f"  {name:<8}{'on' if breaker_enabled else 'off':>9}{api.requests:>11}{api.failures:>10}"
+          f"{completed:>11}/{args.backlog:<6}{elapsed:>8.2f}s")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Incident API retry and circuit breaker scenarios")
+    parser.add_argument("--backlog", type=int, default=200, help="Open requests per scenario")
+    parser.add_argument("--workers", type=int, default=4, help="Worker threads")
+    parser.add_argument("--failure-rate", type=float, default=0.3, help="Share of failed requests when flaky")
+    parser.add_argument("--outage-seconds", type=float, default=3.0, help="Length of the outage scenario")
+    parser.add_argument("--retry-attempts", type=int, default=3, help="Attempts per API call")
+    parser.add_argument("--backoff-ms", type=float, default=20.0, help="Initial retry backoff")
+    parser.add_argument("--failure-threshold", type=int, default=5, help="Failures that open the breaker")
+    parser.add_argument("--reset-seconds", type=float, default=1.0, help="Breaker open period")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Give up on a scenario after this long")
+    parser.add_argument("--verbose", action="store_true", help="Keep application logging enabled")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    processing_config = get_processing_config()
+    processing_config.update(worker_threads=args.workers, max_in_flight=args.workers * 2)
+    OrderMani.get_processing_config = lambda: dict(processing_config)
+    accounts = [f"{index:010d}" for index in range(args.backlog)]
+
+    with tempfile.TemporaryDirectory() as workdir, LatencyHTTPServer(0.001) as api:
+        database = os.path.join(workdir, "customers.sqlite")
+        create_customer_database(database, accounts)
+        connectSQL._pool = MySQLConnectionPool(
+            lambda: SQLiteMySQLConnection(database), size=max(5, args.workers)
+        )
+        caseRegistration.read_api_config = lambda: api.url
+
+        print(f"backlog={args.backlog} workers={args.workers} attempts={args.retry_attempts} "
+              f"threshold={args.failure_threshold} reset={args.reset_seconds}s")
+        print(f"  {'scenario':<8}{'breaker':>9}{'api calls':>11}{'failed':>10}{'completed':>11}{'':<7}{'time':>8}")
+        try:
+            for name in ("flaky", "outage"):
+                for breaker_enabled in (True, False):
+                    run_scenario(name, args, accounts, api, breaker_enabled)
+        finally:
+            connectSQL.close_mysql_pool()
+            connectAPI.close_http_session()
+
+
+if __name__ == "__main__":
+    main()
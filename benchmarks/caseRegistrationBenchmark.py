@@ -0,0 +1,232 @@
+"""
+Offline throughput benchmark for case registration.
+
+Runs OrderProcessor.process_option_1 -> IncidentProcessor.process_incident end to end
+against local stand-ins (benchmarks/localServices.py): an in-memory request collection,
+a SQLite database with synthetic debt_cust_detail/debt_payment rows behind the MySQL
+connection pool, and a local incident API with configurable latency.
+
+For each backlog size it reports incidents/sec, p50/p99 latency per stage and peak
+traced memory. Results can be saved with --json-out and compared against a saved
+baseline with --baseline; the run exits with status 1 if throughput regressed by more
+than --tolerance.
+
+Run from the project root:
+    python -m benchmarks.caseRegistrationBenchmark --backlog 100 1000 5000
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import wraps
+from benchmarks.localServices import (
+    InMemoryCollection, SQLiteMySQLConnection, LatencyHTTPServer, build_open_orders, create_customer_database
+)
+from orderManipulator import OrderMani, caseRegistration
+from orderManipulator.caseRegistration import IncidentProcessor
+from orderManipulator.OrderMani import OrderProcessor
+from utils.api.connectAPI import close_http_session
+from utils.config.processingConfig import get_processing_config
+from utils.database import connectSQL
+from utils.database.connectSQL import MySQLConnectionPool
+
+# Stage name -> (class, method) timed on every call
+STAGES = {
+    "batch_load": (OrderProcessor, "load_customer_rows"),
+    "transform": (OrderProcessor, "load_customer_snapshots"),
+    "payment_batch": (OrderProcessor, "load_latest_payments"),
+    "incident": (OrderProcessor, "process_case"),
+    "case_data": (IncidentProcessor, "load_case_data"),
+    "customer_details": (IncidentProcessor, "read_customer_details"),
+    "payment": (IncidentProcessor, "get_payment_data"),
+    "encode": (IncidentProcessor, "format_json_object"),
+    "api": (IncidentProcessor, "send_to_api"),
+}
+
+
+class StageTimer:
+    """Wraps the STAGES methods to record the duration of every call."""
+
+    def __init__(self):
+        self.samples = {stage: [] for stage in STAGES}
+        self._originals = {}
+
+    def __enter__(self):
+        for stage, (cls, name) in STAGES.items():
+            original = getattr(cls, name)
+            self._originals[stage] = original
+            setattr(cls, name, self._timed(stage, original))
+        return self
+
+    def __exit__(self, *exc):
+        for stage, (cls, name) in STAGES.items():
+            setattr(cls, name, self._originals[stage])
+
+    def _timed(self, stage, method):
+        samples = self.samples[stage]
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - started)  # list.append is thread-safe
+        return timed
+
+    def reset(self):
+        for samples in self.samples.values():
+            samples.clear()
+
+    def summary(self):
+        """Returns {stage: {'count', 'p50_ms', 'p99_ms'}} for stages that were called."""
+        summary = {}
+        for stage, samples in self.samples.items():
+            if samples:
+                ordered = sorted(samples)
+                summary[stage] = {
+                    "count": len(ordered),
+                    "p50_ms": percentile(ordered, 50) * 1000,
+                    "p99_ms": percentile(ordered, 99) * 1000,
+                }
+        return summary
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def run_backlog(backlog, accounts, args, timer, trace_memory=False):
+    """
+    Processes one backlog of open option 1 requests and returns its measurements.
+    """
+    collection = InMemoryCollection(build_open_orders(backlog, accounts))
+    OrderMani.get_mongo_collection = lambda: collection
+    processor = OrderProcessor()
+    timer.reset()
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        processed, errors = processor.process_option_1(processor.get_open_orders(order_id=1))
+    finally:
+        processor.close()
+    elapsed = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    completed = collection.status_counts().get("Completed", 0)
+    if completed != processed:
+        raise AssertionError(f"{processed} incidents reported processed but {completed} requests completed")
+    return {
+        "backlog": backlog,
+        "processed": processed,
+        "errors": errors,
+        "seconds": elapsed,
+        "incidents_per_sec": processed / elapsed if elapsed else 0.0,
+        "stages": timer.summary(),
+        "peak_memory_mb": peak / (1024 * 1024) if peak is not None else None,
+    }
+
+
+def print_result(result):
+    memory = f"{result['peak_memory_mb']:.1f} MB" if result["peak_memory_mb"] is not None else "n/a"
+    print(f"\nbacklog={result['backlog']}: {result['processed']} processed, {result['errors']} errors in "
+          f"{result['seconds']:.2f}s -> {result['incidents_per_sec']:.1f} incidents/sec, peak memory {memory}")
+    print(f"  {'stage':<18}{'calls':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for stage, stats in result["stages"].items():
+        print(f"  {stage:<18}{stats['count']:>8}{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+
+def check_baseline(results, baseline_path, tolerance):
+    """Returns the list of backlog sizes whose throughput fell more than tolerance below the baseline."""
+    with open(baseline_path) as baseline_file:
+        baseline = {entry["backlog"]: entry for entry in json.load(baseline_file)["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["backlog"])
+        if previous and result["incidents_per_sec"] < previous["incidents_per_sec"] * (1 - tolerance):
+            regressions.append(result["backlog"])
+            print(f"REGRESSION backlog={result['backlog']}: {result['incidents_per_sec']:.1f} incidents/sec "
+                  f"vs baseline {previous['incidents_per_sec']:.1f}")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline case registration throughput benchmark")
+    parser.add_argument("--backlog", type=int, nargs="+", default=[100, 1000, 5000],
+                        help="Open request counts to process")
+    parser.add_argument("--accounts", type=int, default=0,
+                        help="Distinct accounts in the backlog (0 = one per request)")
+    parser.add_argument("--rows-per-account", type=int, default=3, help="debt_cust_detail rows per account")
+    parser.add_argument("--payments-per-account", type=int, default=3, help="debt_payment rows per account")
+    parser.add_argument("--api-latency-ms", type=float, default=5.0, help="Incident API response delay")
+    parser.add_argument("--mysql-latency-ms", type=float, default=0.5, help="Delay added to every MySQL query")
+    parser.add_argument("--workers", type=int, default=0, help="Worker threads (0 = WORKER_THREADS from config)")
+    parser.add_argument("--pool-size", type=int, default=0, help="MySQL pool size (0 = max(5, workers))")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--json-out", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier --json-out to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed fractional throughput drop versus the baseline")
+    parser.add_argument("--verbose", action="store_true", help="Keep application logging enabled")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    processing_config = get_processing_config()
+    if args.workers:
+        processing_config.update(worker_threads=args.workers, max_in_flight=args.workers * 2)
+    OrderMani.get_processing_config = lambda: dict(processing_config)
+    pool_size = args.pool_size or max(5, processing_config["worker_threads"])
+
+    account_count = args.accounts or max(args.backlog)
+    accounts = [f"{index:010d}" for index in range(account_count)]
+    results = []
+
+    with tempfile.TemporaryDirectory() as workdir, LatencyHTTPServer(args.api_latency_ms / 1000) as api:
+        database = os.path.join(workdir, "customers.sqlite")
+        create_customer_database(database, accounts, args.rows_per_account, args.payments_per_account)
+        connectSQL._pool = MySQLConnectionPool(
+            lambda: SQLiteMySQLConnection(database, args.mysql_latency_ms / 1000), size=pool_size
+        )
+        caseRegistration.read_api_config = lambda: api.url
+
+        print(f"workers={processing_config['worker_threads']} pool={pool_size} accounts={account_count} "
+              f"rows/account={args.rows_per_account} api latency={args.api_latency_ms}ms "
+              f"mysql latency={args.mysql_latency_ms}ms")
+        try:
+            with StageTimer() as timer:
+                for backlog in args.backlog:
+                    result = run_backlog(backlog, accounts, args, timer)
+                    if not args.no_memory:
+                        result["peak_memory_mb"] = run_backlog(
+                            backlog, accounts, args, timer, trace_memory=True)["peak_memory_mb"]
+                    print_result(result)
+                    results.append(result)
+        finally:
+            connectSQL.close_mysql_pool()
+            close_http_session()
+
+    if args.json_out:
+        with open(args.json_out, "w") as output:
+            json.dump({"args": vars(args), "results": results}, output, indent=2)
+    if args.baseline and check_baseline(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: per-incident document cost.
+
+Compares building the full ~60-key dict for every incident (what initialize_mongo_doc
+used to do) with IncidentDocument, which only allocates per-incident fields. Reports
+construction time and retained memory per document while a batch is held in flight.
+
+Run from the project root:
+    python -m benchmarks.incidentDocumentBenchmark [--count N]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+from orderManipulator.incidentDocument import IncidentDocument, INCIDENT_TEMPLATE, TIMESTAMP_FIELDS
+
+LIST_FIELDS = [key for key, value in INCIDENT_TEMPLATE.items() if value == []]
+
+
+def build_dict(incident_id):
+    """A fresh dict with new lists and timestamps per incident, as the previous implementation built."""
+    now = datetime.now().replace(microsecond=0).isoformat() + ".000Z"
+    document = dict(INCIDENT_TEMPLATE)
+    document.update({key: now for key in TIMESTAMP_FIELDS})
+    document.update({key: [] for key in LIST_FIELDS})
+    document.update({
+        "Incident_Id": incident_id,
+        "Account_Num": str(incident_id),
+        "Contact_Details": [],
+        "Product_Details": [],
+        "Customer_Details": {},
+        "Account_Details": {},
+        "Last_Actions": [],
+        "Marketing_Details": [dict(INCIDENT_TEMPLATE["Marketing_Details"][0])]
+    })
+    return document
+
+
+def build_document(incident_id):
+    return IncidentDocument(incident_id, str(incident_id))
+
+
+def measure(build, count):
+    """Returns (microseconds per document, retained bytes per document)."""
+    gc.collect()
+    started = time.perf_counter()
+    documents = [build(incident_id) for incident_id in range(count)]
+    elapsed = time.perf_counter() - started
+    del documents
+
+    gc.collect()
+    tracemalloc.start()
+    documents = [build(incident_id) for incident_id in range(count)]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del documents
+    return elapsed / count * 1e6, retained / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incident document construction")
+    parser.add_argument("--count", type=int, default=20000, help="Documents held in flight")
+    args = parser.parse_args()
+
+    print(f"{args.count} documents")
+    for name, build in (("dict (previous)", build_dict), ("IncidentDocument", build_document)):
+        per_document, retained = measure(build, args.count)
+        print(f"  {name:<18} {per_document:8.2f} us/document  {retained:8.0f} bytes/document")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Micro-benchmark: incident payload encoding.
+
+Compares the previous three-pass format_json_object (dumps -> loads -> dumps(indent=4))
+with the single-pass encoder, on the json module and on orjson when installed, and with
+IncidentDocument.to_json (pre-encoded template fields). Checks that every variant decodes
+to the same payload, keys in the same order.
+
+Run from the project root:
+    python -m benchmarks.jsonEncoderBenchmark [--products N] [--number N]
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, date
+from decimal import Decimal
+from orderManipulator import incidentEncoder
+from orderManipulator.caseRegistration import IncidentProcessor
+
+
+def build_document(products):
+    """Returns an IncidentDocument with the given number of products and a payment."""
+    processor = IncidentProcessor("0000000001", 1, None)
+    rows = [{
+        "ACCOUNT_NUM": "0000000001",
+        "LOAD_DATE": datetime(2024, 3, 1, 8, 30, 15),
+        "ACCOUNT_EFFECTIVE_DTM_BSS": date(2019, 6, 1),
+        "TECNICAL_CONTACT_EMAIL": "billing@example.com",
+        "MOBILE_CONTACT": f"07{index % 10:08d}",
+        "WORK_CONTACT": "0112345678",
+        "CONTACT_PERSON": "Example Holdings",
+        "ASSET_ADDRESS": "12 Main Street, Colombo",
+        "ZIP_CODE": "00100",
+        "NIC": 123456789,
+        "CUSTOMER_TYPE_ID": 2,
+        "CUSTOMER_TYPE": "Corporate",
+        "ACCOUNT_STATUS_BSS": "Active",
+        "CREDIT_CLASS_ID": 3,
+        "CREDIT_CLASS_NAME": "Gold",
+        "BILLING_CENTER_NAME": "Colombo",
+        "CUSTOMER_SEGMENT_ID": Decimal("4"),  # Must be converted by the encoder
+        "EMAIL": "billing@example.com",
+        "ASSET_ID": f"AS{index:06d}",
+        "PROMOTION_INTEG_ID": "PROMO",
+        "CUSTOMER_REF": "CR0001",
+        "BSS_PRODUCT_SEQ": index,
+        "PRODUCT_NAME": "Fibre 100",
+        "ASSET_STATUS": "Active",
+        "CUSTOMER_TYPE_CAT": "B",
+        "OSS_SERVICE_ABBREVIATION": "FTTH",
+        "CITY": "Colombo",
+        "PROVINCE": "Western"
+    } for index in range(products)]
+    processor.apply_customer_rows(rows)
+    processor.apply_payment_row({
+        "ACCOUNT_PAYMENT_SEQ": 42,
+        "ACCOUNT_PAYMENT_DAT": datetime(2024, 2, 28, 10, 0, 0),
+        "AP_ACCOUNT_PAYMENT_MNY": Decimal("1520.75")
+    })
+    return processor.mongo_data
+
+
+def three_pass(document):
+    """The previous format_json_object implementation."""
+    json_data = json.loads(json.dumps(document.as_dict(), default=incidentEncoder.serialize_value))
+    json_data["Customer_Details"]["Nic"] = str(json_data["Customer_Details"].get("Nic", ""))
+    json_data["Account_Details"]["Email_Address"] = str(json_data["Account_Details"].get("Email_Address", ""))
+    return json.dumps(json_data, indent=4)
+
+
+def single_pass_json(document):
+    """The single-pass encoder forced onto the json module."""
+    backend, incidentEncoder.orjson = incidentEncoder.orjson, None
+    try:
+        return incidentEncoder.encode_incident(document.as_dict())
+    finally:
+        incidentEncoder.orjson = backend
+
+
+def decode_ordered(payload):
+    """Decodes objects as lists of (key, value) pairs, so key order is compared too."""
+    return json.loads(payload, object_pairs_hook=list)
+
+
+def single_pass(document):
+    """The single-pass encoder on the best available backend."""
+    return incidentEncoder.encode_incident(document.as_dict())
+
+
+def template(document):
+    """IncidentDocument.to_json: only per-incident fields are encoded."""
+    return document.to_json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incident payload encoding")
+    parser.add_argument("--products", type=int, nargs="+", default=[1, 20, 500],
+                        help="Product_Details sizes to benchmark")
+    parser.add_argument("--number", type=int, default=2000, help="Encodes per measurement")
+    args = parser.parse_args()
+
+    variants = [("three-pass (previous)", three_pass), ("single-pass json", single_pass_json)]
+    if incidentEncoder.orjson is not None:
+        variants.append(("single-pass orjson", single_pass))
+    else:
+        print("orjson not installed; skipping the orjson variant")
+    variants.append((f"template {incidentEncoder.get_json_backend()}", template))
+
+    for products in args.products:
+        document = build_document(products)
+        expected = decode_ordered(three_pass(document))
+        number = max(1, args.number // max(1, products // 20))
+        print(f"\nProduct_Details={products} ({number} encodes per variant)")
+        baseline = None
+        for name, encode in variants:
+            if decode_ordered(encode(document)) != expected:
+                raise AssertionError(f"{name} output differs from the previous encoder")
+            per_call = min(timeit.repeat(lambda: encode(document), number=number, repeat=3)) / number
+            baseline = baseline or per_call
+            print(f"  {name:<24} {per_call * 1e6:10.1f} us/encode  {baseline / per_call:5.1f}x  "
+                  f"{len(encode(document)):8d} bytes")
+
+
+if __name__ == "__main__":
+    main()
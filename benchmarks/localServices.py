@@ -0,0 +1,578 @@
+"""
+Local stand-ins for the services case registration talks to, for offline benchmarks:
+
+- InMemoryCollection: the subset of the pymongo Collection API OrderProcessor uses
+  (AsyncInMemoryCollection exposes it with the AsyncCollection API AsyncOrderProcessor uses)
+- SQLiteMySQLConnection: a pymysql-like connection over a synthetic SQLite database
+  holding debt_cust_detail and debt_payment rows (AsyncSQLitePool: the aiomysql-like pool)
+- LatencyHTTPServer: a local incident API that answers after a configurable delay and
+  can inject failures (a random error rate, given incidents, or a full outage toggled
+  at runtime); it can keep the payloads it received
+"""
+import asyncio
+import contextlib
+import copy
+import json
+import random
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pymysql
+from pymongo.errors import OperationFailure
+
+
+def _lookup(document, dotted_key):
+    value = document
+    for part in dotted_key.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def matches(document, query):
+    """Evaluates the MongoDB filter operators used by this project against a document."""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(document, branch) for branch in condition):
+                return False
+            continue
+        value = _lookup(document, key)
+        if isinstance(condition, dict) and condition and all(op.startswith("$") for op in condition):
+            for op, operand in condition.items():
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$nin" and value in operand:
+                    return False
+                if op == "$ne" and value == operand:
+                    return False
+                if op == "$lt" and not (value is not None and value < operand):
+                    return False
+                if op == "$lte" and not (value is not None and value <= operand):
+                    return False
+                if op == "$gt" and not (value is not None and value > operand):
+                    return False
+                if op == "$exists" and (value is not None) != bool(operand):
+                    return False
+                if op == "$mod" and not (isinstance(value, int) and value % operand[0] == operand[1]):
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _project(document, projection):
+    if not projection:
+        return copy.deepcopy(document)
+    projected = {"_id": document.get("_id")}
+    for key in projection:
+        parts = key.split(".")
+        source, target = document, projected
+        for part in parts[:-1]:
+            source = source.get(part) if isinstance(source, dict) else None
+            if source is None:
+                break
+            target = target.setdefault(part, {})
+        else:
+            if isinstance(source, dict) and parts[-1] in source:
+                target[parts[-1]] = copy.deepcopy(source[parts[-1]])
+    return projected
+
+
+class _Result:
+    def __init__(self, matched=0, modified=0):
+        self.matched_count = matched
+        self.modified_count = modified
+
+
+class InMemoryCursor:
+    """Iterates over a snapshot of matching documents; batch_size is accepted and ignored."""
+
+    def __init__(self, documents):
+        self._documents = documents
+
+    def batch_size(self, size):
+        return self
+
+    def __iter__(self):
+        return iter(self._documents)
+
+
+class InMemoryCollection:
+    """
+    Thread-safe in-memory collection. Documents are indexed by parameters.incident_id
+    so status updates do not scan the whole backlog.
+    """
+
+    def __init__(self, documents=()):
+        self._lock = threading.RLock()
+        self._documents = {}
+        self._by_incident = {}
+        for document in documents:
+            self.insert_one(document)
+
+    def insert_one(self, document):
+        with self._lock:
+            document = copy.deepcopy(document)
+            document.setdefault("_id", len(self._documents) + 1)
+            self._documents[document["_id"]] = document
+            incident_id = _lookup(document, "parameters.incident_id")
+            self._by_incident.setdefault(incident_id, []).append(document)
+
+    def _candidates(self, query):
+        incident_id = query.get("parameters.incident_id")
+        if incident_id is not None and not isinstance(incident_id, dict):
+            return list(self._by_incident.get(incident_id, ()))
+        return list(self._documents.values())
+
+    def find(self, query=None, projection=None, limit=0, **kwargs):
+        query = query or {}
+        with self._lock:
+            found = [_project(doc, projection) for doc in self._candidates(query) if matches(doc, query)]
+        return InMemoryCursor(found[:limit] if limit else found)
+
+    def find_one(self, query=None, projection=None, **kwargs):
+        return next(iter(self.find(query, projection)), None)
+
+    def count_documents(self, query, limit=0, **kwargs):
+        with self._lock:
+            count = sum(1 for doc in self._candidates(query) if matches(doc, query))
+        return min(count, limit) if limit else count
+
+    def _apply(self, document, update):
+        for key, value in update.get("$set", {}).items():
+            target = document
+            parts = key.split(".")
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+        for key in update.get("$unset", {}):
+            document.pop(key, None)
+
+    def update_one(self, query, update, **kwargs):
+        with self._lock:
+            for document in self._candidates(query):
+                if matches(document, query):
+                    self._apply(document, update)
+                    return _Result(1, 1)
+        return _Result(0, 0)
+
+    def update_many(self, query, update, **kwargs):
+        modified = 0
+        with self._lock:
+            for document in self._candidates(query):
+                if matches(document, query):
+                    self._apply(document, update)
+                    modified += 1
+        return _Result(modified, modified)
+
+    def find_one_and_update(self, query, update, projection=None, sort=None, return_document=False, **kwargs):
+        with self._lock:
+            for document in self._candidates(query):
+                if matches(document, query):
+                    before = _project(document, projection)
+                    self._apply(document, update)
+                    return _project(document, projection) if return_document else before
+        return None
+
+    def bulk_write(self, operations, ordered=True, **kwargs):
+        modified = sum(self.update_one(op._filter, op._doc).modified_count for op in operations)
+        return _Result(modified, modified)
+
+    def create_index(self, keys, **kwargs):
+        return "_".join(f"{key}_{direction}" for key, direction in keys)
+
+    def watch(self, *args, **kwargs):
+        # Behave like a standalone mongod so OrderProcessor falls back to polling
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+
+    def status_counts(self):
+        with self._lock:
+            counts = {}
+            for document in self._documents.values():
+                status = document.get("request_status")
+                counts[status] = counts.get(status, 0) + 1
+        return counts
+
+
+class AsyncInMemoryCursor(InMemoryCursor):
+    """InMemoryCursor with async iteration and to_list, like a pymongo AsyncCursor."""
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self._documents:
+            yield document
+
+    async def to_list(self, length=None):
+        return list(self._documents[:length] if length else self._documents)
+
+
+class AsyncInMemoryCollection:
+    """
+    The subset of the pymongo AsyncCollection API AsyncOrderProcessor uses, over an
+    InMemoryCollection (sync_collection) so results can be compared with the sync engine.
+    """
+
+    def __init__(self, sync_collection):
+        self.sync_collection = sync_collection
+
+    def find(self, query=None, projection=None, **kwargs):
+        return AsyncInMemoryCursor(list(self.sync_collection.find(query, projection, **kwargs)))
+
+    async def find_one(self, query=None, projection=None, **kwargs):
+        return self.sync_collection.find_one(query, projection, **kwargs)
+
+    async def update_one(self, query, update, **kwargs):
+        return self.sync_collection.update_one(query, update, **kwargs)
+
+    async def update_many(self, query, update, **kwargs):
+        return self.sync_collection.update_many(query, update, **kwargs)
+
+    async def create_index(self, keys, **kwargs):
+        return self.sync_collection.create_index(keys, **kwargs)
+
+
+def build_open_orders(count, accounts, order_id=1):
+    """Returns count open requests of order_id spread evenly over the given account numbers."""
+    return [{
+        "_id": index + 1,
+        "order_id": order_id,
+        "account_number": accounts[index % len(accounts)],
+        "parameters": {"incident_id": index + 1},
+        "request_status": "Open"
+    } for index in range(count)]
+
+
+CUSTOMER_COLUMNS = (
+    "ACCOUNT_NUM", "LOAD_DATE", "TECNICAL_CONTACT_EMAIL", "MOBILE_CONTACT", "WORK_CONTACT",
+    "CONTACT_PERSON", "ASSET_ADDRESS", "ZIP_CODE", "NIC", "CUSTOMER_TYPE_ID", "CUSTOMER_TYPE",
+    "ACCOUNT_EFFECTIVE_DTM_BSS", "ACCOUNT_STATUS_BSS", "CREDIT_CLASS_ID", "CREDIT_CLASS_NAME",
+    "BILLING_CENTER_NAME", "CUSTOMER_SEGMENT_ID", "EMAIL", "ASSET_ID", "PROMOTION_INTEG_ID",
+    "CUSTOMER_REF", "BSS_PRODUCT_SEQ", "PRODUCT_NAME", "ASSET_STATUS", "CUSTOMER_TYPE_CAT",
+    "OSS_SERVICE_ABBREVIATION", "CITY", "PROVINCE"
+)
+PAYMENT_COLUMNS = ("AP_ACCOUNT_NUMBER", "ACCOUNT_PAYMENT_DAT", "ACCOUNT_PAYMENT_SEQ", "AP_ACCOUNT_PAYMENT_MNY")
+
+
+def create_customer_database(path, accounts, rows_per_account=3, payments_per_account=3, seed=1):
+    """
+    Creates a SQLite database with synthetic debt_cust_detail and debt_payment rows.
+
+    Args:
+        path (str): Database file to create
+        accounts (list): Account numbers to generate rows for
+        rows_per_account (int): debt_cust_detail rows (products) per account
+        payments_per_account (int): debt_payment rows per account
+        seed (int): Random seed, so runs are comparable
+    """
+    rnd = random.Random(seed)
+    db = sqlite3.connect(path)
+    integer_columns = {"CUSTOMER_TYPE_ID", "CREDIT_CLASS_ID", "BSS_PRODUCT_SEQ"}
+    db.execute("CREATE TABLE debt_cust_detail ({})".format(", ".join(
+        f"{name} {'INTEGER' if name in integer_columns else 'TEXT'}" for name in CUSTOMER_COLUMNS)))
+    db.execute("CREATE TABLE debt_payment (AP_ACCOUNT_NUMBER TEXT, ACCOUNT_PAYMENT_DAT TEXT, "
+               "ACCOUNT_PAYMENT_SEQ INTEGER, AP_ACCOUNT_PAYMENT_MNY REAL)")
+    db.execute("CREATE INDEX idx_cust_account ON debt_cust_detail (ACCOUNT_NUM)")
+    db.execute("CREATE INDEX idx_payment_account ON debt_payment (AP_ACCOUNT_NUMBER, ACCOUNT_PAYMENT_DAT)")
+
+    customer_rows = []
+    payment_rows = []
+    for account in accounts:
+        for row in range(rows_per_account):
+            customer_rows.append((
+                account, f"2024-01-{row % 28 + 1:02d} 10:00:00",
+                rnd.choice(["billing@example.com", "ops@example.com", "n/a", None]),
+                f"07{rnd.randrange(10 ** 8):08d}", rnd.choice(["0112345678", None]),
+                "Example Customer", f"{row + 1} Main Street", "10100", f"{rnd.randrange(10 ** 9):09d}V",
+                rnd.choice([1, 2]), "Individual", "2019-06-01 00:00:00", "Active",
+                rnd.randrange(1, 5), "Standard", "Colombo", "Retail", "customer@example.com",
+                f"AS{account}-{row}", "PROMO", "CR0001", row, "Fibre 100", "Active", "B", "FTTH",
+                "Colombo", "Western"
+            ))
+        for payment in range(payments_per_account):
+            payment_rows.append((account, f"2024-{payment % 12 + 1:02d}-15 09:30:00", payment,
+                                 round(rnd.uniform(100, 5000), 2)))
+    db.executemany(f"INSERT INTO debt_cust_detail VALUES ({', '.join('?' * len(CUSTOMER_COLUMNS))})",
+                   customer_rows)
+    db.executemany("INSERT INTO debt_payment VALUES (?, ?, ?, ?)", payment_rows)
+    db.commit()
+    db.close()
+
+
+class SQLiteCursor:
+    """pymysql-style cursor: %s placeholders, tuple or dict rows, optional per-query latency."""
+
+    def __init__(self, connection, dict_rows):
+        self._connection = connection
+        self._cursor = connection._db.cursor()
+        self._dict_rows = dict_rows
+        self.description = None
+        self.rowcount = -1
+
+    def execute(self, query, args=None):
+        if self._connection.latency:
+            time.sleep(self._connection.latency)
+        self._connection.queries += 1
+        self._cursor.execute(query.replace("%s", "?"), tuple(args or ()))
+        self.description = self._cursor.description
+        self.rowcount = self._cursor.rowcount
+        return self.rowcount
+
+    def _row(self, row):
+        if not self._dict_rows:
+            return row
+        return dict(zip([column[0] for column in self.description], row))
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return None if row is None else self._row(row)
+
+    def fetchmany(self, size=None):
+        return [self._row(row) for row in self._cursor.fetchmany(size or self._cursor.arraysize)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def nextset(self):
+        return None
+
+    def __iter__(self):
+        return (self._row(row) for row in self._cursor)
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SQLiteMySQLConnection:
+    """pymysql-like connection over a SQLite file, for MySQLConnectionPool factories."""
+
+    def __init__(self, path, latency=0.0):
+        """
+        Args:
+            path (str): SQLite database created by create_customer_database
+            latency (float): Seconds added to every query to simulate a network round trip
+        """
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self.latency = latency
+        self.queries = 0
+
+    def cursor(self, cursor_class=None):
+        dict_rows = cursor_class is not None and issubclass(cursor_class, pymysql.cursors.DictCursorMixin)
+        return SQLiteCursor(self, dict_rows)
+
+    def ping(self, reconnect=False):
+        return True
+
+    def commit(self):
+        self._db.commit()
+
+    def rollback(self):
+        self._db.rollback()
+
+    def close(self):
+        self._db.close()
+
+
+class AsyncSQLiteCursor:
+    """aiomysql-style cursor over a SQLiteCursor; latency is awaited instead of slept."""
+
+    def __init__(self, connection, cursor):
+        self.connection = connection
+        self._cursor = cursor
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    async def execute(self, query, args=None):
+        if self.connection.latency:
+            await asyncio.sleep(self.connection.latency)
+        return self._cursor.execute(query, args)
+
+    async def fetchone(self):
+        return self._cursor.fetchone()
+
+    async def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size)
+
+    async def fetchall(self):
+        return self._cursor.fetchall()
+
+    async def nextset(self):
+        return None
+
+    async def close(self):
+        self._cursor.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class AsyncSQLiteConnection:
+    """aiomysql-like connection over a SQLite file."""
+
+    def __init__(self, path, latency=0.0):
+        self._connection = SQLiteMySQLConnection(path)
+        self.latency = latency
+        self.rollbacks = 0
+
+    @property
+    def queries(self):
+        return self._connection.queries
+
+    def cursor(self, cursor_class=None):
+        import aiomysql
+        dict_rows = cursor_class is not None and issubclass(cursor_class, (aiomysql.DictCursor, aiomysql.SSDictCursor))
+        return AsyncSQLiteCursor(self, SQLiteCursor(self._connection, dict_rows))
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self._connection.close()
+
+
+class AsyncSQLitePool:
+    """aiomysql-like pool handing out AsyncSQLiteConnections over one SQLite file."""
+
+    def __init__(self, path, latency=0.0):
+        """
+        Args:
+            path (str): SQLite database created by create_customer_database
+            latency (float): Seconds awaited before every query
+        """
+        self._path = path
+        self._latency = latency
+        self._idle = []
+        self.acquires = 0
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        self.acquires += 1
+        connection = self._idle.pop() if self._idle else AsyncSQLiteConnection(self._path, self._latency)
+        try:
+            yield connection
+        finally:
+            self._idle.append(connection)
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+    async def wait_closed(self):
+        pass
+
+
+class _IncidentAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    # Send each response in one segment so Nagle/delayed ACK do not add ~40 ms per request
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if not self.server.owner.record_request(payload):
+            body = b'{"status": "error"}'
+            self.send_response(self.server.owner.fail_status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        body = json.dumps({
+            "status": "success",
+            "Incident_Id": payload.get("Incident_Id"),
+            "Account_Num": payload.get("Account_Num")
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LatencyHTTPServer:
+    """
+    Local incident API on 127.0.0.1 that answers each POST after a fixed delay.
+    A share of requests (failure_rate), or every request during an outage, is answered
+    with fail_status instead; requests and failures are counted.
+    """
+
+    def __init__(self, latency=0.0, failure_rate=0.0, fail_status=503, seed=7, fail_incidents=(),
+                 keep_payloads=False):
+        """
+        Args:
+            latency (float): Seconds the server waits before answering
+            failure_rate (float): Fraction of requests answered with fail_status
+            fail_status (int): HTTP status of injected failures
+            seed (int): Seed for the failure draw, so runs are repeatable
+            fail_incidents (iterable): Incident_Id values always answered with fail_status
+            keep_payloads (bool): Keep every received payload in payloads
+        """
+        self.failure_rate = failure_rate
+        self.fail_status = fail_status
+        self.fail_incidents = set(fail_incidents)
+        self.requests = 0
+        self.failures = 0
+        self.keep_payloads = keep_payloads
+        self.payloads = []
+        self._outage = False
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _IncidentAPIHandler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.owner = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="bench-api", daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/Request_Incident_External_information"
+
+    def set_outage(self, down):
+        """Answer every request with fail_status while down is True."""
+        with self._lock:
+            self._outage = bool(down)
+
+    def record_request(self, payload):
+        """Count and keep one request; returns False if it should fail."""
+        with self._lock:
+            self.requests += 1
+            if self.keep_payloads:
+                self.payloads.append(payload)
+            if (self._outage or payload.get("Incident_Id") in self.fail_incidents
+                    or (self.failure_rate and self._random.random() < self.failure_rate)):
+                self.failures += 1
+                return False
+            return True
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
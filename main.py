@@ -1,11 +1,68 @@
+import argparse
 from orderManipulator.OrderMani import OrderProcessor
+from orderManipulator.shardSupervisor import ShardSupervisor
+from orderManipulator.requestLogIndexes import (
+    ensure_request_log_indexes, migrate_account_field, count_legacy_account_documents
+)
+from utils.database.connectMongoDB import get_mongo_collection
 from utils.logger.logger import get_logger
+from utils.metrics.metrics import start_metrics_exporter
 
 logger = get_logger("OrderProcessor")
 
+def parse_args():
+    """Parse command line options for the order processor."""
+    parser = argparse.ArgumentParser(description="Process open requests from Request_Progress_Log")
+    parser.add_argument(
+        "--mode",
+        choices=["interactive", "daemon"],
+        default="interactive",
+        help="interactive: choose an option from the menu each cycle; "
+             "daemon: route every enabled order type automatically (see [DAEMON] in databaseConfig.ini)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="daemon mode only: number of processes, each owning a hash partition of account numbers"
+    )
+    parser.add_argument(
+        "--migrate-account-field",
+        action="store_true",
+        help="create the Request_Progress_Log indexes, move account_num into account_number "
+             "on every request, then exit (resumable: run again to continue)"
+    )
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.mode != "daemon":
+        parser.error("--workers greater than 1 requires --mode daemon")
+    return args
+
+def run_account_field_migration():
+    """Ensure indexes and migrate legacy account_num fields, logging progress."""
+    collection = get_mongo_collection()
+    if collection is None:
+        raise ConnectionError("Failed to connect to MongoDB collection")
+    ensure_request_log_indexes(collection)
+    logger.info(f"{count_legacy_account_documents(collection)} requests still use account_num")
+    migrated = migrate_account_field(collection)
+    logger.info(f"Migrated {migrated} requests; {count_legacy_account_documents(collection)} still use account_num")
+
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        processor = OrderProcessor()
-        processor.run()
+        if args.migrate_account_field:
+            run_account_field_migration()
+        elif args.workers > 1:
+            # One process per account partition, each with its own connection pools
+            ShardSupervisor(args.workers, mode=args.mode).run()
+        else:
+            start_metrics_exporter()
+            processor = OrderProcessor()
+            if args.mode == "daemon":
+                processor.run_daemon()
+            else:
+                processor.run()
     except Exception as e:
-        logger.critical(f"Failed to start OrderProcessor: {e}")
\ No newline at end of file
+        logger.critical(f"Failed to start OrderProcessor: {e}")
@@ -1,83 +1,532 @@
+import threading
 import time
-from utils.database.connectMongoDB import get_mongo_collection
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure, PyMongoError
+from utils.database.connectMongoDB import get_mongo_collection, get_mongo_config
 from .caseRegistration import IncidentProcessor
-from utils.logger.logger import get_logger
+from .customerBatchLoader import CustomerDetailsBatchLoader, LatestPaymentBatchLoader
+from .customerSnapshotBuilder import build_customer_snapshots
+from .customerSnapshotCache import get_customer_snapshot_cache
+from .requestClaims import RequestClaims, IN_PROGRESS, CLAIM_FIELDS, build_claimable_filter
+from .requestLogIndexes import ensure_request_log_indexes
+from utils.config.processingConfig import get_processing_config, get_daemon_config
+from utils.config.configRegistry import add_reload_hook, remove_reload_hook, check_config
+from utils.filePath.filePath import get_filePath
+from utils.api.connectAPI import get_api_circuit_breaker
+from utils.database.mongoBulkWriter import BulkUpdateBuffer
+from utils.logger.logger import get_logger, get_incident_logger
+from utils.metrics.metrics import timed, increment, INCIDENTS, STATUS_UPDATES
 
 # Initialize logger for order processing tasks
 logger = get_logger("task_status_logger")
 
+# Only the fields the order handlers read are decoded from each open request
+OPEN_ORDER_PROJECTION = {
+    "order_id": 1,
+    "account_number": 1,
+    "account_num": 1,
+    "shard_key": 1,
+    "parameters.incident_id": 1
+}
+
+# Server error codes meaning change streams are unavailable (e.g. standalone mongod)
+CHANGE_STREAM_UNSUPPORTED_CODES = (40573, 40324)
+
+def get_account_field(doc):
+    """
+    Returns:
+        str: Name of the field holding the document's account number: "account_number",
+            or the legacy "account_num" for documents that have not been migrated
+    """
+    return "account_number" if doc.get("account_number") else "account_num"
+
+def build_completion_update(account_number, incident_id, response, claimed_by=None, account_field=None):
+    """
+    Build the filter and update that move an open request to Completed.
+    
+    Args:
+        account_number (str): Customer account number of the request
+        incident_id (int): Incident ID of the request
+        response (dict): API response stored on the document
+        claimed_by (str, optional): Worker id holding the request's claim. When given,
+            only an In_Progress request still owned by that worker is completed.
+        account_field (str, optional): Field the request stores its account number in
+            (see get_account_field). When given the filter matches that field alone and
+            is served by one index; otherwise both field names are tried.
+        
+    Returns:
+        tuple: (filter, update) for update_one
+    """
+    if account_field is not None:
+        query = {account_field: account_number}
+    else:
+        query = {
+            "$or": [
+                {"account_number": account_number},
+                {"account_num": account_number}  # Handle different field names
+            ]
+        }
+    query.update({
+        "parameters.incident_id": incident_id,
+        "request_status": "Open"  # Only update open requests
+    })
+    update = {
+        "$set": {
+            "request_status": "Completed",
+            "completed_at": time.time(),  # Current timestamp
+            "api_response": response  # Store API response
+        }
+    }
+    if claimed_by is not None:
+        query.update(request_status=IN_PROGRESS, claimed_by=claimed_by)
+        update["$unset"] = {field: "" for field in CLAIM_FIELDS}
+    return query, update
+
+def build_completion_check(query, update):
+    """
+    Build a filter that matches the request only if this completion update was applied.
+    
+    Args:
+        query (dict): Filter returned by build_completion_update
+        update (dict): Update returned by build_completion_update
+        
+    Returns:
+        dict: Filter on the request's identity and the completed_at value it was given
+    """
+    check = {key: value for key, value in query.items() if key not in ("request_status", "claimed_by")}
+    check["completed_at"] = update["$set"]["completed_at"]
+    return check
+
+def get_option_1_accounts(documents, skip_accounts=()):
+    """
+    Collect the account numbers of all Option 1 documents in a batch.
+    
+    Args:
+        documents (list): MongoDB documents returned by get_open_orders
+        skip_accounts (collection): Accounts (as str) to leave out, e.g. cached ones
+        
+    Returns:
+        list: Non-empty account numbers in document order
+    """
+    account_numbers = [
+        doc.get('account_number') or doc.get('account_num')
+        for doc in documents
+        if doc.get('order_id') == 1
+    ]
+    return [account for account in account_numbers if account and str(account) not in skip_accounts]
+
+def build_open_orders_query(order_id=None, claims=False, shard_count=1, shard_index=0):
+    """
+    Build the filter of requests a worker may pick up. Shared by OrderProcessor and
+    AsyncOrderProcessor.
+    
+    Args:
+        order_id (int, optional): Only match orders of this type
+        claims (bool): Work claims are enabled, so In_Progress requests with an expired
+            lease are matched as well
+        shard_count (int): Number of shards
+        shard_index (int): This worker's shard; only requests whose shard_key falls in
+            its partition are matched (see OrderProcessor.assign_shard_keys)
+        
+    Returns:
+        dict: Filter for find / find_one
+    """
+    if claims:
+        query = build_claimable_filter(time.time(), order_id)
+    else:
+        query = {"request_status": "Open"}
+        if order_id is not None:
+            query["order_id"] = order_id
+    if shard_count > 1:
+        # Served by the request_status/order_id/shard_key index; other shards' requests are never read
+        query["shard_key"] = {"$mod": [shard_count, shard_index]}
+    return query
+
+def lease_expired(doc, lease_expires_at):
+    """
+    Returns:
+        bool: True (and logged) if the worker's claim on the document ran out while earlier
+            requests were processed; another worker may hold it now
+    """
+    if lease_expires_at is None or time.time() < lease_expires_at:
+        return False
+    logger.warning(f"Lease on document {doc.get('_id', 'NO_ID')} expired before it was processed; skipping it")
+    return True
+
+def build_option_1_case(doc, customer_rows_by_account, customer_snapshots=None, payment_rows_by_account=None):
+    """
+    Validate an Option 1 document and pick its pre-fetched data out of the batch loads.
+    
+    Args:
+        doc (dict): MongoDB document to process
+        customer_rows_by_account (dict): Pre-fetched rows from load_customer_rows, or None
+        customer_snapshots (dict, optional): Pre-built sections from load_customer_snapshots
+        payment_rows_by_account (dict, optional): Latest payments from load_latest_payments
+        
+    Returns:
+        dict: Keyword arguments for process_case, or None (logged) if the document lacks
+            its account number or incident ID
+    """
+    doc_id = doc.get('_id', 'NO_ID')
+    account_number = doc.get('account_number') or doc.get('account_num')
+    incident_id = doc.get('parameters', {}).get('incident_id')
+    if not account_number:
+        logger.warning(f"Missing 'account_number' in document: {doc_id}")
+        return None
+    if not incident_id:
+        logger.warning(f"Missing 'incident_id' in document: {doc_id}")
+        return None
+    
+    customer_rows = None
+    stream_customer_rows = False
+    if customer_rows_by_account is not None:
+        # None for an account over the stream row threshold
+        customer_rows = customer_rows_by_account.get(str(account_number), [])
+        stream_customer_rows = customer_rows is None
+    payment_rows = None
+    if payment_rows_by_account is not None:
+        payment_rows = payment_rows_by_account.get(str(account_number), [])
+    return {
+        "account_number": account_number,
+        "incident_id": incident_id,
+        "customer_rows": customer_rows,
+        "customer_snapshot": (customer_snapshots or {}).get(str(account_number)),
+        "account_field": get_account_field(doc),
+        "payment_rows": payment_rows,
+        "stream_customer_rows": stream_customer_rows
+    }
+
+def load_customer_snapshots(customer_rows_by_account, customer_cache=None):
+    """
+    Transform a batch's pre-fetched rows into document sections in one columnar pass,
+    and store them in the snapshot cache. Blocking; the async engine runs it in a thread.
+    
+    Args:
+        customer_rows_by_account (dict): Rows from load_customer_rows, or None
+        customer_cache (CustomerSnapshotCache, optional): Cache the sections are stored in
+        
+    Returns:
+        dict: {account_number (str): sections}; accounts missing from it fall back to
+            the per-row path
+    """
+    if not customer_rows_by_account:
+        return {}
+    snapshots = build_customer_snapshots(customer_rows_by_account)
+    if customer_cache is not None:
+        customer_cache.put_many(snapshots)
+    return snapshots
+
+def report_completion(case_logger, account_number, modified):
+    """
+    Count and log the result of a request's Completed status update.
+    
+    Args:
+        case_logger: Incident logger of the request
+        account_number (str): Customer account number of the request
+        modified (bool): The update changed the document
+    """
+    increment(STATUS_UPDATES, "modified" if modified else "not_modified")
+    if modified:
+        case_logger.info(f"Successfully updated document for account {account_number}")
+    else:
+        case_logger.warning(f"Failed to update document for account {account_number}")
+
+def shard_key_of(account_number):
+    """
+    Hash an account number with a function that is stable across processes and runs.
+    Stored on requests as shard_key, so shards can select theirs with $mod server-side.
+    
+    Args:
+        account_number (str): Customer account number
+        
+    Returns:
+        int: Unsigned 32-bit crc32 of the account number
+    """
+    return zlib.crc32(str(account_number).encode("utf-8"))
+
+def shard_of(account_number, shard_count):
+    """
+    Map an account number to a shard.
+    
+    Args:
+        account_number (str): Customer account number
+        shard_count (int): Number of shards
+        
+    Returns:
+        int: Shard index in range(shard_count)
+    """
+    return shard_key_of(account_number) % shard_count
+
 class OrderProcessor:
     """
     Main class for processing customer orders and managing case registration workflows.
     Handles MongoDB interactions, order processing, and provides a user menu interface.
     """
     
-    def __init__(self):
-        """Initialize MongoDB connection and verify collection access"""
+    def __init__(self, shard_index=0, shard_count=1):
+        """
+        Initialize MongoDB connection and verify collection access
+        
+        Args:
+            shard_index (int): Partition of account numbers this processor owns
+            shard_count (int): Number of partitions (1 = every account)
+        """
         self.collection = get_mongo_collection()
         if self.collection is None:
             raise ConnectionError("Failed to connect to MongoDB collection")
+        mongo_config = get_mongo_config()
+        if mongo_config['ensure_indexes']:
+            try:
+                ensure_request_log_indexes(self.collection)
+            except PyMongoError as e:
+                logger.error(f"Could not ensure Request_Progress_Log indexes: {e}")
+
+        # How the daemon wakes up; switching between events and polling needs a restart
+        self.wakeup = get_daemon_config()['wakeup']
         logger.info("MongoDB connection established successfully")
 
-    def process_case(self, account_number, incident_id):
+        # Hash partition of account numbers handled by this process (see shard_of)
+        self.shard_index = shard_index
+        self.shard_count = max(1, shard_count)
+        self.processed_total = 0
+        self.error_total = 0
+
+        # Lease-based claims let several processes share the Open set (None = read it directly)
+        self.claims = None
+        if mongo_config['work_claims']:
+            self.claims = RequestClaims(self.collection, lease_seconds=mongo_config['claim_lease_seconds'])
+            logger.info(f"Claiming requests as worker {self.claims.owner}")
+
+        # Completed requests are written in bulk unless the batch size is 1
+        self.completion_buffer = None
+        if mongo_config['status_bulk_size'] > 1:
+            self.completion_buffer = BulkUpdateBuffer(
+                self.collection,
+                max_batch=mongo_config['status_bulk_size'],
+                max_delay=mongo_config['status_flush_interval']
+            )
+        self.completion_failures = 0
+        self._completion_lock = threading.Lock()
+
+        # Open requests are left queued (parked) while the incident API circuit is open
+        self.api_breaker = get_api_circuit_breaker()
+        self.parked = False
+
+        # Worker pool for concurrent incident processing (None = sequential)
+        self.worker_threads = get_processing_config()['worker_threads']
+        # Customer sections of recently seen accounts (None = every incident reads debt_cust_detail)
+        self.customer_cache = get_customer_snapshot_cache()
+        self.executor = None
+        if self.worker_threads > 1:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.worker_threads,
+                thread_name_prefix="incident-worker"
+            )
+            logger.info(f"Concurrent processing enabled with {self.worker_threads} worker threads")
+
+        # Batch sizes, poll intervals and the like follow edits to databaseConfig.ini
+        self.reload_settings()
+        add_reload_hook(self.reload_settings)
+
+    def reload_settings(self, path=None):
+        """
+        Read the settings that can change while the processor runs. Called once at start-up
+        and, as a config reload hook, whenever databaseConfig.ini changes. WORKER_THREADS,
+        WORK_CLAIMS, WAKEUP and the status bulk size still need a restart.
+
+        Args:
+            path: Config file that was reloaded (unused; every setting is re-read)
+        """
+        mongo_config = get_mongo_config()
+        self.batch_size = mongo_config['open_order_batch_size']
+        self.poll_interval_min = mongo_config['poll_interval_min']
+        self.poll_interval_max = mongo_config['poll_interval_max']
+        self.change_stream_max_await_ms = mongo_config['change_stream_max_await_ms']
+        if self.claims is not None:
+            self.claims.lease_seconds = mongo_config['claim_lease_seconds']
+
+        # Order types the daemon routes automatically, and their cursor batch sizes
+        daemon_config = get_daemon_config()
+        self.enabled_order_ids = tuple(daemon_config['enabled_order_ids'])
+        self.order_batch_sizes = daemon_config['batch_sizes']
+
+        processing_config = get_processing_config()
+        self.max_in_flight = processing_config['max_in_flight']
+        self.vectorized_transform = processing_config['vectorized_transform']
+        self.latest_payment_query = processing_config['latest_payment_query']
+        self.stream_row_threshold = processing_config['stream_row_threshold']
+
+    def close(self):
+        """Shut down the incident worker pool and write any buffered status updates."""
+        remove_reload_hook(self.reload_settings)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        if self.completion_buffer is not None:
+            self.completion_buffer.flush()
+
+    def process_case(self, account_number, incident_id, customer_rows=None, customer_snapshot=None,
+                     account_field=None, payment_rows=None, stream_customer_rows=False):
         """
         Process customer details for case registration and update MongoDB document on success.
         
         Args:
             account_number (str): Customer account number to process
             incident_id (int): Associated incident ID for the case
+            customer_rows (list, optional): Pre-fetched debt_cust_detail rows for the account
+            customer_snapshot (dict, optional): Pre-built customer sections for the account
+            account_field (str, optional): Field the request stores the account number in
+            payment_rows (list, optional): Pre-fetched latest debt_payment row for the account
+            stream_customer_rows (bool): The batch load found the account over the row limit
             
         Returns:
-            bool: True if processing and update were successful, False otherwise
+            bool: True if processing and update were successful, False otherwise. With
+                bulk status updates, True means the update was queued; a later failure is
+                reported through completion_failures.
         """
-        logger.info(f"Processing case for account: {account_number}, incident: {incident_id}")
+        case_logger = get_incident_logger("task_status_logger", account_number, incident_id)
+        case_logger.info(f"Processing case for account: {account_number}, incident: {incident_id}")
         
         # Initialize incident processor with account details
         processor = IncidentProcessor(
             account_num=account_number,
             incident_id=incident_id,
-            mongo_collection=self.collection
+            mongo_collection=self.collection,
+            customer_rows=customer_rows,
+            customer_snapshot=customer_snapshot,
+            payment_rows=payment_rows,
+            customer_row_limit=self.stream_row_threshold,
+            stream_customer_rows=stream_customer_rows,
+            customer_cache=self.customer_cache
         )
         
         # Process the incident (retrieve data, format, send to API)
-        success, response = processor.process_incident()
+        with timed("incident"):
+            success, response = processor.process_incident()
+        increment(INCIDENTS, "success" if success else "failure")
         
         if success:
-            # Update MongoDB document to mark as completed
-            update_result = self.collection.update_one(
-                {
-                    "$or": [
-                        {"account_number": account_number},
-                        {"account_num": account_number}  # Handle different field names
-                    ],
-                    "parameters.incident_id": incident_id,
-                    "request_status": "Open"  # Only update open requests
-                },
-                {
-                    "$set": {
-                        "request_status": "Completed",
-                        "completed_at": time.time(),  # Current timestamp
-                        "api_response": response  # Store API response
-                    }
-                }
-            )
+            claimed_by = self.claims.owner if self.claims is not None else None
+            query, update = build_completion_update(account_number, incident_id, response, claimed_by,
+                                                    account_field)
             
-            if update_result.modified_count == 1:
-                logger.info(f"Successfully updated document for account {account_number}")
+            if self.completion_buffer is not None:
+                # Queue the status update; its result is logged when the batch is written
+                def on_written(modified):
+                    report_completion(case_logger, account_number, modified)
+                    if not modified:
+                        with self._completion_lock:
+                            self.completion_failures += 1
+                
+                with timed("status_update"):
+                    self.completion_buffer.add(
+                        query, update,
+                        verify_filter=build_completion_check(query, update),
+                        callback=on_written
+                    )
                 return True
-            else:
-                logger.warning(f"Failed to update document for account {account_number}")
-                return False
+            
+            # Update MongoDB document to mark as completed
+            with timed("status_update"):
+                update_result = self.collection.update_one(query, update)
+            modified = update_result.modified_count == 1
+            report_completion(case_logger, account_number, modified)
+            return modified
         return False
 
-    def get_open_orders(self):
+    def get_open_orders(self, order_id=None, batch_size=None):
         """
-        Retrieve all open orders from MongoDB collection.
+        Stream open orders from MongoDB collection.
+        The order_id filter and field projection are applied server-side and
+        documents are fetched in cursor batches rather than materialized as a list.
         
+        Args:
+            order_id (int, optional): Only return orders of this type
+            batch_size (int, optional): Documents per cursor batch (defaults to config)
+            
         Returns:
-            list: Collection of documents with request_status="Open"
+            Cursor: Iterable of projected documents with request_status="Open", plus
+                In_Progress ones with an expired lease when work claims are enabled
         """
-        return list(self.collection.find({"request_status": "Open"}))
+        if self.shard_count > 1:
+            self.assign_shard_keys()
+        return self.collection.find(self.build_open_orders_filter(order_id), OPEN_ORDER_PROJECTION).batch_size(
+            batch_size or self.get_batch_size(order_id)
+        )
+
+    def build_open_orders_filter(self, order_id=None):
+        """
+        Returns:
+            dict: Filter matching requests this worker may pick up. A shard only matches
+                requests whose shard_key falls in its partition (see assign_shard_keys).
+        """
+        return build_open_orders_query(order_id, self.claims is not None, self.shard_count, self.shard_index)
+
+    def assign_shard_keys(self):
+        """
+        Store shard_key on open requests that were inserted without one, so the sharded
+        open-orders filter can select them. In_Progress requests are keyed too: one
+        claimed before sharding was enabled becomes reclaimable when its lease expires,
+        and would otherwise never match any shard. Every shard runs this; each update only
+        matches a request that still has no key, so concurrent shards do not conflict.
+        
+        Returns:
+            int: Number of requests that received a shard_key
+        """
+        unkeyed = {"request_status": {"$in": ["Open", IN_PROGRESS]},
+                   "order_id": {"$in": list(self.enabled_order_ids)}, "shard_key": None}
+        operations = [
+            UpdateOne(
+                {"_id": doc["_id"], "shard_key": None},
+                {"$set": {"shard_key": shard_key_of(doc.get('account_number') or doc.get('account_num'))}}
+            )
+            for doc in self.collection.find(unkeyed, {"account_number": 1, "account_num": 1}, limit=self.batch_size)
+        ]
+        if not operations:
+            return 0
+        assigned = self.collection.bulk_write(operations, ordered=False).modified_count
+        logger.info(f"Assigned shard keys to {assigned} new requests")
+        return assigned
+
+    def get_batch_size(self, order_id=None):
+        """
+        Returns:
+            int: Configured batch size for the order type, or OPEN_ORDER_BATCH_SIZE
+        """
+        return self.order_batch_sizes.get(order_id, self.batch_size)
+
+    def has_open_orders(self, order_id=None):
+        """
+        Check whether any open order exists without fetching the open set.
+        
+        Args:
+            order_id (int, optional): Only consider orders of this type
+            
+        Returns:
+            bool: True if at least one matching open order exists
+        """
+        return self.collection.find_one(self.build_open_orders_filter(order_id), {"_id": 1}) is not None
+
+    def iter_batches(self, documents, batch_size=None):
+        """
+        Split a document stream into lists of at most batch_size documents.
+        
+        Args:
+            documents (iterable): Documents or cursor to split
+            batch_size (int, optional): Documents per list (defaults to OPEN_ORDER_BATCH_SIZE)
+            
+        Yields:
+            list: Consecutive documents from the stream
+        """
+        iterator = iter(documents)
+        while True:
+            batch = list(islice(iterator, batch_size or self.batch_size))
+            if not batch:
+                return
+            yield batch
 
     def process_option_1(self, documents):
         """
@@ -85,51 +534,233 @@ class OrderProcessor:
         Filters documents by order_id=1 and processes valid cases.
         
         Args:
-            documents (list): MongoDB documents to process
+            documents (iterable): MongoDB documents or cursor to process
             
         Returns:
             tuple: (processed_count, error_count) tracking successful and failed operations
         """
         processed_count = 0
         error_count = 0
+        failures_before = self.completion_failures
         
-        for doc in documents:
-            try:
-                doc_id = doc.get('_id', 'NO_ID')  # Get document ID or default
-                
-                # Skip documents not matching option 1 criteria
-                if doc.get('order_id') != 1:
-                    continue
-                    
-                # Extract required fields with fallbacks
-                account_number = doc.get('account_number') or doc.get('account_num')
-                parameters = doc.get('parameters', {})
-                incident_id = parameters.get('incident_id')
-                
-                # Validate required fields
-                if not account_number:
-                    logger.warning(f"Missing 'account_number' in document: {doc_id}")
-                    error_count += 1
+        # Pre-fetch customer details for every option 1 account, one cursor batch at a time
+        for batch in self.iter_batches(documents, self.get_batch_size(1)):
+            if self.shard_count > 1:
+                batch = [doc for doc in batch if self.owns(doc)]
+                if not batch:
                     continue
-                if not incident_id:
-                    logger.warning(f"Missing 'incident_id' in document: {doc_id}")
-                    error_count += 1
+            if self.api_breaker.is_open():
+                # Leave the rest of the backlog Open until the breaker lets a probe through
+                self.parked = True
+                logger.warning(f"Incident API circuit is open; parking open requests for "
+                               f"{self.api_breaker.retry_after():.1f}s")
+                break
+            if self.claims is not None:
+                batch = self.claims.claim([doc['_id'] for doc in batch if '_id' in doc], OPEN_ORDER_PROJECTION)
+                if not batch:
                     continue
-                    
-                # Process valid case and track results
-                if self.process_case(account_number, incident_id):
-                    processed_count += 1
-                else:
-                    error_count += 1
-                    
-            except Exception as e:
-                error_count += 1
-                logger.error(f"Error processing document {doc_id}: {str(e)}")
-                continue
+            
+            try:
+                cached_snapshots = self.load_cached_snapshots(batch)
+                customer_rows_by_account = self.load_customer_rows(batch, skip_accounts=cached_snapshots)
+                customer_snapshots = self.load_customer_snapshots(customer_rows_by_account)
+                customer_snapshots.update(cached_snapshots)
+                payment_rows_by_account = self.load_latest_payments(batch)
                 
+                # Leases are renewed for each group of max_in_flight requests just before it runs,
+                # so a batch that outlasts one lease never sends a request another worker reclaimed
+                for group in self.iter_batches(batch, self.max_in_flight):
+                    lease_expires_at = None
+                    if self.claims is not None:
+                        held, lease_expires_at = self.claims.renew([doc['_id'] for doc in group])
+                        group = [doc for doc in group if doc['_id'] in held]
+                    for result in self.run_bounded(
+                        lambda doc, lease_expires_at=lease_expires_at: self.process_option_1_document(
+                            doc, customer_rows_by_account, customer_snapshots, payment_rows_by_account,
+                            lease_expires_at=lease_expires_at),
+                        group
+                    ):
+                        if result is True:
+                            processed_count += 1
+                        elif result is False:
+                            error_count += 1
+            finally:
+                if self.claims is not None:
+                    self.release_claims(batch)
+            
+            if self.completion_buffer is not None:
+                self.completion_buffer.flush_if_due()
+        
+        # Write the remaining status updates and move failed ones to the error count
+        if self.completion_buffer is not None:
+            self.completion_buffer.flush()
+            failed_updates = self.completion_failures - failures_before
+            processed_count -= failed_updates
+            error_count += failed_updates
+                
+        self.processed_total += processed_count
+        self.error_total += error_count
         logger.info(f"Processed {processed_count} documents, {error_count} errors")
         return processed_count, error_count
 
+    def owns(self, doc):
+        """
+        Returns:
+            bool: True if the document's shard_key (or, for a request that has none yet,
+                its account's hash) falls in this processor's shard
+        """
+        shard_key = doc.get('shard_key')
+        if shard_key is None:
+            shard_key = shard_key_of(doc.get('account_number') or doc.get('account_num'))
+        return shard_key % self.shard_count == self.shard_index
+
+    def process_option_1_document(self, doc, customer_rows_by_account, customer_snapshots=None,
+                                  payment_rows_by_account=None, lease_expires_at=None):
+        """
+        Validate and process a single Option 1 document. Safe to call from worker threads.
+        
+        Args:
+            doc (dict): MongoDB document to process
+            customer_rows_by_account (dict): Pre-fetched rows from load_customer_rows, or None
+            customer_snapshots (dict, optional): Pre-built sections from load_customer_snapshots
+            payment_rows_by_account (dict, optional): Latest payments from load_latest_payments
+            lease_expires_at (float, optional): When this worker's claim on the request runs out
+            
+        Returns:
+            bool: True if processed, False on error, None if the document was skipped,
+                parked because the incident API circuit is open, or its lease ran out
+        """
+        doc_id = doc.get('_id', 'NO_ID')  # Get document ID or default
+        try:
+            # Skip documents not matching option 1 criteria
+            if doc.get('order_id') != 1:
+                return None
+            # Parked: the request stays Open and is picked up once the circuit half-opens
+            if self.api_breaker.is_open():
+                self.parked = True
+                return None
+            if lease_expired(doc, lease_expires_at):
+                return None
+                
+            # Validate required fields and process the case with its pre-fetched data
+            case = build_option_1_case(doc, customer_rows_by_account, customer_snapshots, payment_rows_by_account)
+            if case is None:
+                return False
+            return self.process_case(**case)
+                
+        except Exception as e:
+            logger.error(f"Error processing document {doc_id}: {str(e)}")
+            return False
+
+    def release_claims(self, documents):
+        """
+        Hand the claimed documents of a batch that were not completed back to the Open set.
+        Buffered completions are written first so they are not released by mistake.
+        
+        Args:
+            documents (list): Documents claimed for the batch
+        """
+        if self.completion_buffer is not None:
+            self.completion_buffer.flush()
+        try:
+            released = self.claims.release([doc['_id'] for doc in documents])
+            if released:
+                logger.info(f"Released {released} unfinished requests back to Open")
+        except PyMongoError as e:
+            logger.error(f"Could not release claimed requests; they will be reclaimed when their lease expires: {e}")
+
+    def run_bounded(self, func, items):
+        """
+        Apply func to each item, on the worker pool when concurrency is enabled.
+        At most max_in_flight calls are submitted but unfinished at any time, and
+        results are yielded back on the calling thread so counters need no locking.
+        
+        Args:
+            func (callable): Function taking one item
+            items (iterable): Items to process
+            
+        Yields:
+            Result of func for each item, in completion order when running concurrently
+        """
+        if self.executor is None:
+            for item in items:
+                yield func(item)
+            return
+
+        in_flight = set()
+        for item in items:
+            if len(in_flight) >= self.max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            in_flight.add(self.executor.submit(func, item))
+        for future in in_flight:
+            yield future.result()
+
+    def load_cached_snapshots(self, documents):
+        """
+        Look up the customer sections of a batch's option 1 accounts in the snapshot cache.
+        
+        Args:
+            documents (list): One batch of MongoDB documents returned by get_open_orders
+            
+        Returns:
+            dict: {account_number (str): sections} for the cached accounts
+        """
+        if self.customer_cache is None:
+            return {}
+        return self.customer_cache.get_many(get_option_1_accounts(documents))
+
+    def load_customer_rows(self, documents, skip_accounts=()):
+        """
+        Batch load debt_cust_detail rows for all option 1 documents in the current cycle.
+        
+        Args:
+            documents (list): One batch of MongoDB documents returned by get_open_orders
+            skip_accounts (collection): Accounts whose sections are already known (cached)
+            
+        Returns:
+            dict: {account_number (str): [rows], or None for accounts over the stream row
+                threshold}, or None if the batch load failed and each incident should
+                query its own rows
+        """
+        account_numbers = get_option_1_accounts(documents, skip_accounts)
+        if not account_numbers:
+            return {}
+        return CustomerDetailsBatchLoader(row_limit=self.stream_row_threshold).load(account_numbers)
+
+    def load_latest_payments(self, documents):
+        """
+        Batch load the latest debt_payment row of every option 1 account in a batch.
+        
+        Args:
+            documents (list): One batch of MongoDB documents returned by get_open_orders
+            
+        Returns:
+            dict: {account_number (str): [latest row] or []}, or None if the batch load
+                failed and each incident should query its own payment
+        """
+        account_numbers = get_option_1_accounts(documents)
+        if not account_numbers:
+            return {}
+        return LatestPaymentBatchLoader(strategy=self.latest_payment_query).load(account_numbers)
+
+    def load_customer_snapshots(self, customer_rows_by_account):
+        """
+        Transform a batch's pre-fetched rows into document sections in one columnar pass.
+        
+        Args:
+            customer_rows_by_account (dict): Rows from load_customer_rows, or None
+            
+        Returns:
+            dict: {account_number (str): sections}; accounts missing from it fall back to
+                the per-row path, and the dict is empty when the transform is disabled.
+                The sections are also stored in the snapshot cache.
+        """
+        if not self.vectorized_transform:
+            return {}
+        return load_customer_snapshots(customer_rows_by_account, self.customer_cache)
+
     def show_menu(self):
         """
         Display interactive menu to user and capture selection.
@@ -148,17 +779,23 @@ class OrderProcessor:
             logger.warning("Invalid menu input - expected number 1-4")
             return None
 
-    def process_selected_option(self, option, documents):
+    def process_selected_option(self, option, documents=None):
         """
         Route processing to the appropriate handler based on user selection.
         
         Args:
             option (int): User-selected menu option
-            documents (list): MongoDB documents to process
+            documents (iterable, optional): MongoDB documents to process. When omitted,
+                the open orders for the selected option are streamed from MongoDB.
+                
+        Returns:
+            tuple: (processed_count, error_count) for the selected handler
         """
         match option:
             case 1:
-                self.process_option_1(documents)  # Case registration
+                if documents is None:
+                    documents = self.get_open_orders(order_id=1)
+                return self.process_option_1(documents)  # Case registration
             case 2:
                 logger.info("Option 2 selected - Monitor Payment")
                 # Future implementation
@@ -170,6 +807,198 @@ class OrderProcessor:
                 # Future implementation
             case _:
                 logger.warning(f"Invalid option selected: {option}")
+        return 0, 0
+
+    def dispatch_documents(self, documents):
+        """
+        Route open-order documents to their handlers by order_id.
+        Documents of order types that are not enabled for the daemon are ignored.
+        
+        Args:
+            documents (list): Projected open-order documents, e.g. from change events
+            
+        Returns:
+            int: Number of documents processed successfully
+        """
+        by_order_type = {}
+        for doc in documents:
+            by_order_type.setdefault(doc.get('order_id'), []).append(doc)
+        
+        processed_count = 0
+        for order_id, order_documents in by_order_type.items():
+            if order_id not in self.enabled_order_ids:
+                continue
+            processed, _ = self.process_selected_option(order_id, order_documents)
+            processed_count += processed
+        return processed_count
+
+    def dispatch_open_orders(self):
+        """
+        Scan the open set once and route every enabled order type that has open requests.
+        A shard first stores shard_key on requests that arrived without one.
+        
+        Returns:
+            int: Number of documents processed successfully
+        """
+        # Notices edits to databaseConfig.ini between scans; reload_settings applies them
+        check_config(get_filePath("databaseConfig"))
+        if self.shard_count > 1:
+            self.assign_shard_keys()
+        processed_count = 0
+        for order_id in self.enabled_order_ids:
+            if self.has_open_orders(order_id=order_id):
+                processed, _ = self.process_selected_option(order_id)
+                processed_count += processed
+        return processed_count
+
+    def watch_open_orders(self, resume_after=None):
+        """
+        Open a change stream on Request_Progress_Log for inserts, updates and replaces
+        that leave a request Open.
+        
+        Args:
+            resume_after (dict, optional): Resume token to continue a previous stream
+            
+        Returns:
+            ChangeStream: Stream of change events carrying the projected fullDocument
+        """
+        match = {
+            "operationType": {"$in": ["insert", "update", "replace"]},
+            "fullDocument.request_status": "Open",
+            # Requests released by a worker are retried by the periodic rescan, not at once
+            "updateDescription.updatedFields.released_at": {"$exists": False},
+            "fullDocument.order_id": {"$in": list(self.enabled_order_ids)}
+        }
+        if self.shard_count > 1:
+            # New requests have no shard_key yet and reach every shard (owns picks the owner);
+            # storing the key later is not an event of its own
+            match["$or"] = [
+                {"fullDocument.shard_key": {"$mod": [self.shard_count, self.shard_index]}},
+                {"fullDocument.shard_key": None}
+            ]
+            match["updateDescription.updatedFields.shard_key"] = {"$exists": False}
+        pipeline = [
+            {"$match": match},
+            {"$project": {
+                "operationType": 1,
+                "fullDocument._id": 1,
+                **{f"fullDocument.{field}": 1 for field in OPEN_ORDER_PROJECTION}
+            }}
+        ]
+        return self.collection.watch(
+            pipeline,
+            full_document="updateLookup",
+            max_await_time_ms=self.change_stream_max_await_ms,
+            resume_after=resume_after
+        )
+
+    def run_event_driven(self):
+        """
+        Non-interactive loop driven by change streams: requests that become Open are
+        dispatched as soon as their events arrive. The open set is also rescanned every
+        poll_interval_max seconds, because requests that stay Open (failed, released or
+        with an expired lease) produce no new events. Falls back to adaptive polling when
+        the server does not support change streams.
+        """
+        logger.info("Starting Order Processor in event-driven mode")
+        resume_token = None
+        last_rescan = time.monotonic()
+        while True:
+            try:
+                with self.watch_open_orders(resume_after=resume_token) as stream:
+                    # Catch up on requests that were opened before the stream started
+                    if resume_token is None:
+                        self.dispatch_open_orders()
+                    
+                    while stream.alive:
+                        # Collect the events that are already available, then dispatch them together
+                        documents = {}
+                        change = stream.try_next()
+                        while change is not None:
+                            doc = change.get("fullDocument") or {}
+                            documents[doc.get("_id")] = doc
+                            if len(documents) >= self.batch_size:
+                                break
+                            change = stream.try_next()
+                        resume_token = stream.resume_token
+                        
+                        # Parked requests produce no new events; rescan once the breaker half-opens
+                        if self.parked and not self.api_breaker.is_open():
+                            self.parked = False
+                            logger.info("Incident API circuit is half-open; resuming parked requests")
+                            self.dispatch_open_orders()
+                            last_rescan = time.monotonic()
+                        
+                        # Failed, released and lease-expired requests stay Open without new events
+                        if time.monotonic() - last_rescan >= self.poll_interval_max:
+                            self.dispatch_open_orders()
+                            last_rescan = time.monotonic()
+                        
+                        if documents:
+                            logger.info(f"Dispatching {len(documents)} requests from change events")
+                            self.dispatch_documents(list(documents.values()))
+                        if self.completion_buffer is not None:
+                            self.completion_buffer.flush_if_due()
+                            
+            except KeyboardInterrupt:
+                logger.info("Program terminated by user")
+                break
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAM_UNSUPPORTED_CODES:
+                    logger.warning(f"Change streams unavailable ({e}); falling back to adaptive polling")
+                    self.run_polling()
+                    return
+                logger.error(f"Change stream error: {e}")
+                time.sleep(self.poll_interval_min)
+            except PyMongoError as e:
+                logger.error(f"Change stream error: {e}")
+                time.sleep(self.poll_interval_min)
+            except Exception as e:
+                logger.error(f"Unexpected error: {str(e)}")
+                time.sleep(5)  # Wait after error before retrying
+        self.close()
+
+    def run_daemon(self):
+        """
+        Headless main loop: routes every enabled order type to its handler without a menu.
+        Wakes up on change streams, or on adaptive polling when WAKEUP = polling.
+        """
+        logger.info(f"Starting Order Processor daemon for order types {list(self.enabled_order_ids)}")
+        if self.wakeup == "polling":
+            self.run_polling()
+        else:
+            self.run_event_driven()
+
+    def run_polling(self):
+        """
+        Non-interactive loop that polls for open requests. The wait between polls starts
+        at poll_interval_min, doubles while cycles find nothing to process, and resets
+        as soon as a cycle processes a request.
+        """
+        logger.info("Starting Order Processor in polling mode")
+        interval = self.poll_interval_min
+        while True:
+            try:
+                if self.dispatch_open_orders() > 0:
+                    interval = self.poll_interval_min
+                    continue
+                
+                # Requests are parked: wait for the breaker to half-open instead of backing off
+                if self.api_breaker.is_open():
+                    time.sleep(max(self.api_breaker.retry_after(), self.poll_interval_min))
+                    self.parked = False
+                    continue
+                    
+                time.sleep(interval)
+                interval = min(interval * 2, self.poll_interval_max)
+                
+            except KeyboardInterrupt:
+                logger.info("Program terminated by user")
+                break
+            except Exception as e:
+                logger.error(f"Unexpected error: {str(e)}")
+                time.sleep(5)  # Wait after error before retrying
+        self.close()
 
     def run(self):
         """
@@ -183,14 +1012,12 @@ class OrderProcessor:
         while True:
             try:
                 # Check for open orders periodically
-                open_orders = self.get_open_orders()
-                
-                if not open_orders:
+                if not self.has_open_orders():
                     logger.info("No open orders found. Waiting...")
                     time.sleep(5)  # Wait before checking again
                     continue
                     
-                logger.info(f"Found {len(open_orders)} open orders")
+                logger.info("Found open orders")
                 
                 # Get user input and validate
                 option = self.show_menu()
@@ -199,7 +1026,7 @@ class OrderProcessor:
                     continue
                 
                 # Process the selected option
-                self.process_selected_option(option, open_orders)
+                self.process_selected_option(option)
                 time.sleep(1)  # Brief pause between operations
                 
             except KeyboardInterrupt:
@@ -208,6 +1035,7 @@ class OrderProcessor:
             except Exception as e:
                 logger.error(f"Unexpected error: {str(e)}")
                 time.sleep(5)  # Wait after error before retrying
+        self.close()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,707 @@
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+import aiohttp
+import aiomysql
+from tenacity import AsyncRetrying, stop_after_attempt, retry_if_exception
+from pymongo import AsyncMongoClient
+from .caseRegistration import IncidentProcessor
+from .caseDataAccess import (
+    CUSTOMER_DETAILS_STATEMENT, LATEST_PAYMENT_STATEMENT, build_case_statements, build_case_data
+)
+from .customerBatchLoader import CustomerDetailsBatchLoader, LatestPaymentBatchLoader
+from .customerSnapshotCache import get_customer_snapshot_cache
+from .OrderMani import (
+    OPEN_ORDER_PROJECTION, build_completion_update, get_option_1_accounts, build_open_orders_query,
+    lease_expired, build_option_1_case, load_customer_snapshots, report_completion
+)
+from .requestLogIndexes import REQUEST_LOG_INDEXES
+from .requestClaims import (
+    new_worker_id, build_claimable_filter, build_claim_update, build_renew_update, build_release_update
+)
+from utils.api.connectAPI import (
+    read_api_config, get_http_config, record_api_latency, get_api_circuit_breaker, api_retry_wait,
+    RETRYABLE_STATUSES, SERVER_FAILURE_STATUSES, API_RETRIES
+)
+from utils.config.processingConfig import get_processing_config
+from utils.database.connectMongoDB import get_mongo_config
+from utils.database.connectSQL import get_mysql_config, DEFAULT_POOL_SIZE
+from utils.database.sqlStatements import run_statements_async, stream_rows_async, STREAM_FETCH_SIZE
+from utils.logger.logger import get_logger, get_incident_logger
+from utils.metrics.metrics import timed, increment, start_metrics_exporter, INCIDENTS
+from utils.custom_exceptions.customize_exceptions import APIConfigError, CircuitOpenError
+
+# Initialize logger for order processing tasks
+logger = get_logger("task_status_logger")
+
+
+def _is_retryable(exc):
+    """Connect-phase failures and 429/503 only, as in connectAPI._is_retryable."""
+    if isinstance(exc, (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError)):
+        return True
+    return isinstance(exc, aiohttp.ClientResponseError) and exc.status in RETRYABLE_STATUSES
+
+
+def _is_server_failure(exc):
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status in SERVER_FAILURE_STATUSES
+    return isinstance(exc, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+@asynccontextmanager
+async def acquire_mysql_connection(mysql_pool):
+    """
+    Check a connection out of an aiomysql pool and roll it back on release, as
+    MySQLConnectionPool does for the sync engine, so no transaction or read snapshot
+    outlives the checkout. A connection that cannot be rolled back is closed instead of
+    returned (the pool drops closed connections).
+
+    Args:
+        mysql_pool (aiomysql.Pool): Pool created with autocommit off
+
+    Yields:
+        aiomysql.Connection: The checked-out connection
+    """
+    async with mysql_pool.acquire() as mysql_conn:
+        try:
+            yield mysql_conn
+        finally:
+            try:
+                await mysql_conn.rollback()
+            except Exception as e:
+                logger.warning(f"Closing MySQL connection that could not be rolled back: {e}")
+                mysql_conn.close()
+
+
+class AsyncIncidentProcessor(IncidentProcessor):
+    """
+    Asyncio variant of IncidentProcessor. Document building and JSON formatting are
+    shared with the synchronous class; MySQL and HTTP calls go through aiomysql and aiohttp.
+    """
+
+    def __init__(self, account_num, incident_id, mongo_collection, mysql_pool, http_session,
+                 api_url, customer_rows=None, customer_snapshot=None, payment_rows=None,
+                 customer_row_limit=0, stream_customer_rows=False, customer_cache=None):
+        """
+        Initialize the processor with account details and the shared async clients.
+
+        Args:
+            account_num (str): The account number to process
+            incident_id (int): The incident ID associated with this account
+            mongo_collection: Async MongoDB collection where data will be stored
+            mysql_pool (aiomysql.Pool): Pool used for customer and payment queries
+            http_session (aiohttp.ClientSession): Session used to call the incident API
+            api_url (str): Incident API endpoint
+            customer_rows (list, optional): Pre-fetched debt_cust_detail rows for this account
+            customer_snapshot (dict, optional): Pre-built customer sections for this account
+            payment_rows (list, optional): Pre-fetched latest debt_payment row for this account
+            customer_row_limit (int): Accounts with more rows than this are streamed (0 = never)
+            stream_customer_rows (bool): The account is already known to exceed the limit
+            customer_cache (CustomerSnapshotCache, optional): Read-through cache of customer sections
+        """
+        super().__init__(account_num, incident_id, mongo_collection, customer_rows=customer_rows,
+                         customer_snapshot=customer_snapshot, payment_rows=payment_rows,
+                         customer_row_limit=customer_row_limit, stream_customer_rows=stream_customer_rows,
+                         customer_cache=customer_cache)
+        self.mysql_pool = mysql_pool
+        self.http_session = http_session
+        self.api_url = api_url
+
+    async def load_case_data_async(self):
+        """
+        Async counterpart of IncidentProcessor.load_case_data: the rows that were not
+        pre-fetched are read over one pooled connection with run_statements_async.
+        A failed read is not fatal, as in the sync engine.
+
+        Returns:
+            str: "success" if the rows are available, "error" otherwise
+        """
+        customer, payment = self.case_data_requests()
+        if not customer and not payment:
+            return "success"
+        calls = build_case_statements(self.account_num, customer, payment, self.customer_row_limit)
+        try:
+            async with acquire_mysql_connection(self.mysql_pool) as mysql_conn:
+                async with mysql_conn.cursor(aiomysql.DictCursor) as cursor:
+                    results = await run_statements_async(cursor, calls)
+            case_data = build_case_data(self.account_num, customer, payment, results, self.customer_row_limit)
+        except Exception as e:
+            self.logger.error(f"Error reading case data for account {self.account_num}: {e}")
+            case_data = None
+        return self.apply_case_data(case_data)
+
+    async def read_customer_details_async(self):
+        """
+        Async counterpart of IncidentProcessor.read_customer_details.
+
+        Returns:
+            str: "success" if operation completed successfully, "error" otherwise
+        """
+        try:
+            if self.use_prefetched_customer_details():
+                return "success"
+
+            self.logger.info(f"Reading customer details for account number: {self.account_num}")
+            async with acquire_mysql_connection(self.mysql_pool) as mysql_conn:
+                if self.stream_customer_rows:
+                    # Very large account: fold tuple rows into the document as they arrive
+                    self.logger.info(f"Streaming customer details for account number: {self.account_num}")
+                    fold = self.customer_row_folder()
+                    async with mysql_conn.cursor(aiomysql.SSCursor) as cursor:
+                        async for row in stream_rows_async(cursor, CUSTOMER_DETAILS_STATEMENT, (self.account_num,)):
+                            fold(row)
+                else:
+                    async with mysql_conn.cursor(aiomysql.DictCursor) as cursor:
+                        rows = (await run_statements_async(
+                            cursor, [(CUSTOMER_DETAILS_STATEMENT, (self.account_num,))]))[0]
+                    self.apply_customer_rows(rows)
+                    self.cache_customer_details()
+            self.logger.info("Successfully read customer details.")
+            return "success"
+
+        except Exception as e:
+            self.logger.error(f"Error reading customer details: {e}")
+            return "error"
+
+    async def get_payment_data_async(self):
+        """
+        Async counterpart of IncidentProcessor.get_payment_data.
+
+        Returns:
+            str: "success" if payment found, "failure" otherwise
+        """
+        try:
+            if self.payment_rows is not None:
+                return self.apply_prefetched_payment()
+
+            self.logger.info(f"Getting payment data for account number: {self.account_num}")
+            async with acquire_mysql_connection(self.mysql_pool) as mysql_conn:
+                async with mysql_conn.cursor(aiomysql.DictCursor) as cursor:
+                    payment_rows = (await run_statements_async(
+                        cursor, [(LATEST_PAYMENT_STATEMENT, (self.account_num,))]))[0]
+            return self.apply_payment_rows(payment_rows)
+
+        except Exception as e:
+            self.logger.error(f"Error retrieving payment data: {e}")
+            return "failure"
+
+    async def send_to_api_async(self, json_output):
+        """
+        Sends the formatted JSON data to the incident API.
+
+        Args:
+            json_output (bytes): The JSON data to send
+
+        Returns:
+            dict: The API response if successful, None otherwise
+        """
+        self.logger.info(f"Sending data to API: {self.api_url}")
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        http_config = get_http_config()
+        breaker = get_api_circuit_breaker()
+        try:
+            breaker.before_call()
+        except CircuitOpenError as e:
+            self.logger.warning(f"Skipped API call: {e}")
+            return None
+
+        try:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(max(1, http_config['retry_attempts'])),
+                wait=api_retry_wait(http_config),
+                retry=retry_if_exception(_is_retryable),
+                before_sleep=self._log_retry,
+                reraise=True
+            ):
+                with attempt:
+                    result = await self._post_once(json_output, headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            if _is_server_failure(e):
+                breaker.record_failure()
+            elif isinstance(e, aiohttp.ClientResponseError) or not isinstance(e, aiohttp.ClientError):
+                breaker.record_success()  # The API answered; its status or body was rejected
+            else:
+                breaker.release()  # Rejected before reaching the API (e.g. an invalid URL), as in post_json
+            self.logger.error(f"Error sending data to API: {e}")
+            return None
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
+        self.logger.info("Successfully sent data to API.")
+        return result
+
+    async def _post_once(self, json_output, headers):
+        started = time.perf_counter()
+        try:
+            async with self.http_session.post(self.api_url, data=json_output, headers=headers) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        finally:
+            record_api_latency(time.perf_counter() - started)
+
+    def _log_retry(self, retry_state):
+        increment(API_RETRIES)
+        self.logger.warning(f"API attempt {retry_state.attempt_number} failed: "
+                            f"{retry_state.outcome.exception()}; retrying")
+
+    async def process_incident_async(self):
+        """
+        Async counterpart of IncidentProcessor.process_incident with the same steps and results.
+
+        Returns:
+            tuple: (success_flag, message) where success_flag is boolean and message is str
+        """
+        try:
+            self.logger.info(f"Processing incident for account: {self.account_num}, ID: {self.incident_id}")
+
+            # Step 1: Read customer details
+            with timed("case_data_read"):
+                await self.load_case_data_async()
+            with timed("customer_read"):
+                customer_status = await self.read_customer_details_async()
+            error_msg = self.check_customer_details(customer_status)
+            if error_msg:
+                return False, error_msg
+
+            # Step 2: Get payment data (optional)
+            with timed("payment_read"):
+                payment_status = await self.get_payment_data_async()
+            self.check_payment_data(payment_status)
+
+            # Step 3: Format as JSON
+            json_output = self.build_payload()
+
+            # Step 4: Send data to the API
+            if not self.api_url:
+                raise APIConfigError("Empty API URL in config")
+
+            with timed("api_post"):
+                api_response = await self.send_to_api_async(json_output)
+            return self.incident_created(api_response)
+
+        except Exception as e:
+            return self.incident_failed(e)
+
+
+class AsyncOrderProcessor:
+    """
+    Asyncio variant of OrderProcessor. Runs many case registrations concurrently on one
+    event loop, bounded by a semaphore, with the same MongoDB status transitions.
+    """
+
+    def __init__(self, collection, mysql_pool, http_session, api_url, concurrency=None,
+                 batch_size=None):
+        """
+        Initialize the processor with already-created async clients.
+
+        Args:
+            collection: Async MongoDB Request_Progress_Log collection
+            mysql_pool (aiomysql.Pool): Pool used for MySQL queries
+            http_session (aiohttp.ClientSession): Session used to call the incident API
+            api_url (str): Incident API endpoint
+            concurrency (int, optional): Incidents in flight at once (defaults to config)
+            batch_size (int, optional): Open orders per cursor batch (defaults to config)
+        """
+        self.collection = collection
+        self.mysql_pool = mysql_pool
+        self.http_session = http_session
+        self.api_url = api_url
+        processing_config = get_processing_config()
+        self.concurrency = concurrency or processing_config['async_concurrency']
+        self.vectorized_transform = processing_config['vectorized_transform']
+        self.latest_payment_query = processing_config['latest_payment_query']
+        self.stream_row_threshold = processing_config['stream_row_threshold']
+        self.customer_cache = get_customer_snapshot_cache()
+        mongo_config = get_mongo_config()
+        self.batch_size = batch_size or mongo_config['open_order_batch_size']
+        # Lease-based claims, shared with OrderProcessor workers (None = read the Open set directly)
+        self.claim_owner = new_worker_id() if mongo_config['work_claims'] else None
+        self.claim_lease_seconds = mongo_config['claim_lease_seconds']
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.api_breaker = get_api_circuit_breaker()
+        self._owned_resources = []
+
+    @classmethod
+    async def create(cls):
+        """
+        Build a processor whose Mongo, MySQL and HTTP clients come from the config files.
+        The clients are closed by close().
+
+        Returns:
+            AsyncOrderProcessor: A processor ready to run
+        """
+        mongo_config = get_mongo_config()
+        mysql_config = get_mysql_config()
+        concurrency = get_processing_config()['async_concurrency']
+        http_config = get_http_config()
+
+        mongo_client = AsyncMongoClient(mongo_config['mongo_uri'])
+        await mongo_client.admin.command('ping')
+        collection = mongo_client[mongo_config['db_name']][mongo_config['collection_name']]
+        if mongo_config['ensure_indexes']:
+            for keys, options in REQUEST_LOG_INDEXES:
+                try:
+                    await collection.create_index(keys, **options)
+                except Exception as e:
+                    logger.warning(f"Could not create index {options['name']}: {e}")
+
+        mysql_pool = await aiomysql.create_pool(
+            host=mysql_config['mysql_host'],
+            db=mysql_config['mysql_database'],
+            user=mysql_config['mysql_user'],
+            password=mysql_config['mysql_password'],
+            maxsize=int(mysql_config.get('mysql_pool_size', DEFAULT_POOL_SIZE)),
+            autocommit=False  # As in the sync pool; checkouts roll back on release
+        )
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=concurrency),
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=http_config['connect_timeout'],
+                sock_read=http_config['read_timeout']
+            )
+        )
+
+        processor = cls(collection, mysql_pool, http_session, read_api_config(), concurrency=concurrency)
+        processor._owned_resources = [mongo_client, mysql_pool, http_session]
+        logger.info("Async MongoDB, MySQL and HTTP clients established successfully")
+        return processor
+
+    async def close(self):
+        """Close the clients created by create()."""
+        for resource in self._owned_resources:
+            try:
+                if isinstance(resource, aiomysql.Pool):
+                    resource.close()
+                    await resource.wait_closed()
+                else:
+                    await resource.close()
+            except Exception as e:
+                logger.warning(f"Error closing async client: {e}")
+        self._owned_resources = []
+
+    def get_open_orders(self, order_id=None):
+        """
+        Stream open orders with the same server-side filter and projection as OrderProcessor.
+
+        Args:
+            order_id (int, optional): Only return orders of this type
+
+        Returns:
+            AsyncCursor: Async iterable of projected documents with request_status="Open", plus
+                In_Progress ones with an expired lease when work claims are enabled
+        """
+        return self.collection.find(self.build_open_orders_filter(order_id),
+                                    OPEN_ORDER_PROJECTION).batch_size(self.batch_size)
+
+    def build_open_orders_filter(self, order_id=None):
+        """
+        Returns:
+            dict: Filter matching requests this worker may pick up (see build_open_orders_query)
+        """
+        return build_open_orders_query(order_id, self.claim_owner is not None)
+
+    async def claim(self, documents):
+        """
+        Claim a batch of candidate requests, as RequestClaims.claim does for OrderProcessor.
+
+        Returns:
+            list: The documents this worker now holds
+        """
+        ids = [doc['_id'] for doc in documents if '_id' in doc]
+        if not ids:
+            return []
+        now = time.time()
+        claim_id = uuid.uuid4().hex
+        await self.collection.update_many(
+            build_claimable_filter(now, ids=ids),
+            build_claim_update(self.claim_owner, claim_id, now + self.claim_lease_seconds)
+        )
+        return await self.collection.find(
+            {"_id": {"$in": ids}, "claim_id": claim_id}, OPEN_ORDER_PROJECTION
+        ).to_list(None)
+
+    async def renew_claims(self, documents):
+        """
+        Extend the lease of the documents about to be processed, as RequestClaims.renew does.
+
+        Returns:
+            tuple: (documents this worker still holds, lease_expires_at of the renewed leases)
+        """
+        ids = [doc['_id'] for doc in documents]
+        lease_expires_at = time.time() + self.claim_lease_seconds
+        query, update = build_renew_update(self.claim_owner, ids, lease_expires_at)
+        await self.collection.update_many(query, update)
+        held = {doc['_id'] for doc in await self.collection.find(
+            {**query, "lease_expires_at": lease_expires_at}, {"_id": 1}
+        ).to_list(None)}
+        if len(held) < len(ids):
+            logger.warning(f"Lost the lease on {len(ids) - len(held)} of {len(ids)} requests; "
+                           f"another worker has reclaimed them")
+        return [doc for doc in documents if doc['_id'] in held], lease_expires_at
+
+    async def release_claims(self, documents):
+        """Hand the claimed documents of a batch that were not completed back to the Open set."""
+        try:
+            query, update = build_release_update(self.claim_owner, [doc['_id'] for doc in documents])
+            result = await self.collection.update_many(query, update)
+            if result.modified_count:
+                logger.info(f"Released {result.modified_count} unfinished requests back to Open")
+        except Exception as e:
+            logger.error(f"Could not release claimed requests; they will be reclaimed when their lease expires: {e}")
+
+    async def has_open_orders(self, order_id=None):
+        """
+        Returns:
+            bool: True if at least one matching open order exists
+        """
+        return await self.collection.find_one(self.build_open_orders_filter(order_id), {"_id": 1}) is not None
+
+    async def iter_batches(self, documents):
+        """
+        Split a sync or async document stream into lists of at most batch_size documents.
+
+        Yields:
+            list: Consecutive documents from the stream
+        """
+        batch = []
+        if hasattr(documents, "__aiter__"):
+            async for doc in documents:
+                batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        else:
+            for doc in documents:
+                batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def load_cached_snapshots(self, documents):
+        """
+        Returns:
+            dict: {account_number (str): sections} for the batch's accounts in the snapshot cache
+        """
+        if self.customer_cache is None:
+            return {}
+        return self.customer_cache.get_many(get_option_1_accounts(documents))
+
+    async def load_customer_rows(self, documents, skip_accounts=()):
+        """
+        Batch load debt_cust_detail rows for all option 1 documents in a batch,
+        except the accounts in skip_accounts.
+
+        Returns:
+            dict: {account_number (str): [rows], or None for accounts over the stream row
+                threshold}, or None if the batch load failed
+        """
+        return await self._load_by_account(CustomerDetailsBatchLoader(row_limit=self.stream_row_threshold),
+                                           get_option_1_accounts(documents, skip_accounts))
+
+    async def load_latest_payments(self, documents):
+        """
+        Batch load the latest debt_payment row of every option 1 account in a batch.
+
+        Returns:
+            dict: {account_number (str): [latest row] or []}, or None if the batch load failed
+        """
+        return await self._load_by_account(LatestPaymentBatchLoader(strategy=self.latest_payment_query),
+                                           get_option_1_accounts(documents))
+
+    async def _load_by_account(self, loader, account_numbers):
+        """Runs an AccountBatchLoader's chunked queries over one pooled aiomysql connection."""
+        accounts, grouped = loader.prepare(account_numbers)
+        if not accounts:
+            return grouped
+        try:
+            async with acquire_mysql_connection(self.mysql_pool) as mysql_conn:
+                cursor_class = aiomysql.SSDictCursor if loader.unbuffered else aiomysql.DictCursor
+                async with mysql_conn.cursor(cursor_class) as cursor:
+                    for query, chunk in loader.chunks(accounts):
+                        await cursor.execute(query, chunk)
+                        while True:
+                            rows = await cursor.fetchmany(STREAM_FETCH_SIZE)
+                            if not rows:
+                                break
+                            loader.group_rows(rows, grouped)
+            return grouped
+        except Exception as e:
+            logger.error(f"Error batch reading {loader.description}: {e}")
+            return None
+
+    async def load_customer_snapshots(self, customer_rows_by_account):
+        """
+        Transform a batch's pre-fetched rows into document sections off the event loop.
+
+        Returns:
+            dict: {account_number (str): sections}, empty when the transform is disabled;
+                the sections are also stored in the snapshot cache
+        """
+        if not self.vectorized_transform:
+            return {}
+        return await asyncio.to_thread(load_customer_snapshots, customer_rows_by_account, self.customer_cache)
+
+    async def process_case(self, account_number, incident_id, customer_rows=None, customer_snapshot=None,
+                           account_field=None, payment_rows=None, stream_customer_rows=False):
+        """
+        Process one case and mark its request Completed on success.
+
+        Returns:
+            bool: True if processing and update were successful, False otherwise
+        """
+        case_logger = get_incident_logger("task_status_logger", account_number, incident_id)
+        case_logger.info(f"Processing case for account: {account_number}, incident: {incident_id}")
+
+        processor = AsyncIncidentProcessor(
+            account_num=account_number,
+            incident_id=incident_id,
+            mongo_collection=self.collection,
+            mysql_pool=self.mysql_pool,
+            http_session=self.http_session,
+            api_url=self.api_url,
+            customer_rows=customer_rows,
+            customer_snapshot=customer_snapshot,
+            payment_rows=payment_rows,
+            customer_row_limit=self.stream_row_threshold,
+            stream_customer_rows=stream_customer_rows,
+            customer_cache=self.customer_cache
+        )
+        with timed("incident"):
+            success, response = await processor.process_incident_async()
+        increment(INCIDENTS, "success" if success else "failure")
+
+        if success:
+            with timed("status_update"):
+                update_result = await self.collection.update_one(
+                    *build_completion_update(account_number, incident_id, response, self.claim_owner, account_field)
+                )
+            modified = update_result.modified_count == 1
+            report_completion(case_logger, account_number, modified)
+            return modified
+        return False
+
+    async def process_option_1_document(self, doc, customer_rows_by_account, customer_snapshots=None,
+                                        payment_rows_by_account=None, lease_expires_at=None):
+        """
+        Validate and process a single Option 1 document while holding a concurrency slot.
+
+        Returns:
+            bool: True if processed, False on error, None if the document was skipped,
+                parked because the incident API circuit is open, or its lease ran out
+        """
+        doc_id = doc.get('_id', 'NO_ID')
+        try:
+            if doc.get('order_id') != 1:
+                return None
+            if self.api_breaker.is_open():
+                return None
+            if lease_expired(doc, lease_expires_at):
+                return None
+
+            case = build_option_1_case(doc, customer_rows_by_account, customer_snapshots, payment_rows_by_account)
+            if case is None:
+                return False
+            async with self.semaphore:
+                return await self.process_case(**case)
+
+        except Exception as e:
+            logger.error(f"Error processing document {doc_id}: {str(e)}")
+            return False
+
+    async def process_option_1(self, documents):
+        """
+        Process Option 1 documents concurrently, one cursor batch at a time.
+
+        Args:
+            documents: Sync or async iterable of MongoDB documents
+
+        Returns:
+            tuple: (processed_count, error_count)
+        """
+        processed_count = 0
+        error_count = 0
+
+        async for batch in self.iter_batches(documents):
+            if self.api_breaker.is_open():
+                logger.warning(f"Incident API circuit is open; parking open requests for "
+                               f"{self.api_breaker.retry_after():.1f}s")
+                break
+            if self.claim_owner is not None:
+                batch = await self.claim(batch)
+                if not batch:
+                    continue
+
+            try:
+                cached_snapshots = self.load_cached_snapshots(batch)
+                customer_rows_by_account = await self.load_customer_rows(batch, skip_accounts=cached_snapshots)
+                customer_snapshots = await self.load_customer_snapshots(customer_rows_by_account)
+                customer_snapshots.update(cached_snapshots)
+                payment_rows_by_account = await self.load_latest_payments(batch)
+                # Leases are renewed for each group of `concurrency` requests just before it runs
+                results = []
+                for start in range(0, len(batch), self.concurrency):
+                    group = batch[start:start + self.concurrency]
+                    lease_expires_at = None
+                    if self.claim_owner is not None:
+                        group, lease_expires_at = await self.renew_claims(group)
+                    results.extend(await asyncio.gather(*(
+                        self.process_option_1_document(doc, customer_rows_by_account, customer_snapshots,
+                                                       payment_rows_by_account, lease_expires_at=lease_expires_at)
+                        for doc in group
+                    )))
+            finally:
+                if self.claim_owner is not None:
+                    await self.release_claims(batch)
+            processed_count += sum(1 for result in results if result is True)
+            error_count += sum(1 for result in results if result is False)
+
+        logger.info(f"Processed {processed_count} documents, {error_count} errors")
+        return processed_count, error_count
+
+    async def run(self):
+        """
+        Async main loop: poll for open Option 1 orders and process them on the event loop.
+        """
+        logger.info("Starting Async Order Processor")
+        while True:
+            try:
+                if not await self.has_open_orders(order_id=1):
+                    logger.info("No open orders found. Waiting...")
+                    await asyncio.sleep(5)
+                    continue
+
+                await self.process_option_1(self.get_open_orders(order_id=1))
+                await asyncio.sleep(max(1, self.api_breaker.retry_after()))
+
+            except asyncio.CancelledError:
+                logger.info("Async Order Processor cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Unexpected error: {str(e)}")
+                await asyncio.sleep(5)
+
+
+async def main():
+    """Create the async processor from config and run it until cancelled."""
+    start_metrics_exporter()
+    processor = await AsyncOrderProcessor.create()
+    try:
+        await processor.run()
+    finally:
+        await processor.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Program terminated by user")
+    except Exception as e:
+        logger.critical(f"Failed to start AsyncOrderProcessor: {e}")
@@ -0,0 +1,130 @@
+import pymysql
+from utils.database.connectSQL import get_mysql_connection
+from utils.database.sqlStatements import register_statement, run_statements
+from utils.logger.logger import get_logger
+
+# Initialize logger for tracking task status
+logger = get_logger("task_status_logger")
+
+# Per-account statements of the case-registration flow
+CUSTOMER_DETAILS_STATEMENT = register_statement(
+    "case_customer_details",
+    "SELECT * FROM debt_cust_detail WHERE ACCOUNT_NUM = %s"
+)
+# Reads at most LIMIT rows, so a very large account is detected without buffering all of it
+CUSTOMER_DETAILS_PROBE_STATEMENT = register_statement(
+    "case_customer_details_probe",
+    "SELECT * FROM debt_cust_detail WHERE ACCOUNT_NUM = %s LIMIT %s"
+)
+LATEST_PAYMENT_STATEMENT = register_statement(
+    "case_latest_payment",
+    "SELECT * FROM debt_payment WHERE AP_ACCOUNT_NUMBER = %s ORDER BY ACCOUNT_PAYMENT_DAT DESC LIMIT 1"
+)
+
+
+class CaseData:
+    """
+    MySQL rows one incident needs, read in a single session by fetch_case_data.
+    A field is None when it was not requested, or for customer_rows, when the account
+    has more rows than the limit (customer_overflow) and has to be streamed instead.
+    """
+
+    __slots__ = ("account_num", "customer_rows", "payment_rows", "customer_overflow")
+
+    def __init__(self, account_num, customer_rows=None, payment_rows=None, customer_overflow=False):
+        """
+        Args:
+            account_num (str): Account the rows belong to
+            customer_rows (list, optional): debt_cust_detail rows of the account
+            payment_rows (list, optional): The latest debt_payment row ([] if it has none)
+            customer_overflow (bool): The account has more debt_cust_detail rows than the limit
+        """
+        self.account_num = account_num
+        self.customer_rows = customer_rows
+        self.payment_rows = payment_rows
+        self.customer_overflow = customer_overflow
+
+    def __repr__(self):
+        customers = None if self.customer_rows is None else len(self.customer_rows)
+        payments = None if self.payment_rows is None else len(self.payment_rows)
+        return (f"CaseData(account_num={self.account_num!r}, customer_rows={customers}, "
+                f"payment_rows={payments}, customer_overflow={self.customer_overflow})")
+
+
+def build_case_statements(account_num, customer=True, payment=True, customer_row_limit=0):
+    """
+    Returns the (SQLStatement, args) pairs to run for one account, in CaseData field order.
+
+    Args:
+        account_num (str): Account to read
+        customer (bool): Include the debt_cust_detail query
+        payment (bool): Include the latest debt_payment query
+        customer_row_limit (int): Read at most one row more than this (0 = all rows)
+    """
+    calls = []
+    if customer and customer_row_limit > 0:
+        calls.append((CUSTOMER_DETAILS_PROBE_STATEMENT, (account_num, customer_row_limit + 1)))
+    elif customer:
+        calls.append((CUSTOMER_DETAILS_STATEMENT, (account_num,)))
+    if payment:
+        calls.append((LATEST_PAYMENT_STATEMENT, (account_num,)))
+    return calls
+
+
+def build_case_data(account_num, customer, payment, results, customer_row_limit=0):
+    """
+    Returns:
+        CaseData: results (one row list per requested query) assigned to the requested
+            fields; customer rows past customer_row_limit are dropped and flagged
+    """
+    results = iter(results)
+    customer_rows = list(next(results)) if customer else None
+    payment_rows = list(next(results)) if payment else None
+    if customer_rows is not None and 0 < customer_row_limit < len(customer_rows):
+        return CaseData(account_num, payment_rows=payment_rows, customer_overflow=True)
+    return CaseData(account_num, customer_rows=customer_rows, payment_rows=payment_rows)
+
+
+def fetch_case_data(account_num, customer=True, payment=True, connection=None, customer_row_limit=0):
+    """
+    Reads the customer details and the latest payment of an account over one pooled
+    MySQL session. When the connection allows multi-statements both statements go to
+    the server in one round-trip (see run_statements); otherwise they run one after the
+    other on the same connection.
+
+    Args:
+        account_num (str): Account to read
+        customer (bool): Read debt_cust_detail rows
+        payment (bool): Read the latest debt_payment row
+        connection (optional): Connection to use instead of checking one out of the pool;
+            it is left open
+        customer_row_limit (int): Accounts with more debt_cust_detail rows than this are
+            not read here but flagged with customer_overflow (0 = no limit)
+
+    Returns:
+        CaseData: The rows read, or None if MySQL could not be reached or a query failed
+    """
+    account_num = str(account_num)
+    calls = build_case_statements(account_num, customer, payment, customer_row_limit)
+    if not calls:
+        return CaseData(account_num)
+
+    mysql_conn = connection or get_mysql_connection(multi_statements=True)
+    if not mysql_conn:
+        logger.error(f"MySQL connection failed. Skipping case data retrieval for account {account_num}.")
+        return None
+
+    cursor = None
+    try:
+        cursor = mysql_conn.cursor(pymysql.cursors.DictCursor)
+        results = run_statements(cursor, calls)
+        return build_case_data(account_num, customer, payment, results, customer_row_limit)
+
+    except Exception as e:
+        logger.error(f"Error reading case data for account {account_num}: {e}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        if connection is None:
+            mysql_conn.close()
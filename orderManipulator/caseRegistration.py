@@ -1,13 +1,17 @@
-import json
+import logging
 from datetime import datetime, date
-from decimal import Decimal
 import requests
 import pymysql
-from pymongo import MongoClient
 from utils.database.connectSQL import get_mysql_connection
-from utils.logger.logger import get_logger
-from utils.api.connectAPI import read_api_config
-from utils.custom_exceptions.customize_exceptions import APIConfigError, IncidentCreationError
+from utils.logger.logger import get_logger, get_incident_logger
+from utils.metrics.metrics import timed
+from utils.api.connectAPI import read_api_config, post_json
+from .incidentDocument import IncidentDocument
+from .incidentEncoder import encode_incident, serialize_value
+from .caseDataAccess import fetch_case_data, CUSTOMER_DETAILS_STATEMENT, LATEST_PAYMENT_STATEMENT
+from .customerSnapshotCache import snapshot_from_document
+from utils.database.sqlStatements import run_statements, stream_rows
+from utils.custom_exceptions.customize_exceptions import APIConfigError, IncidentCreationError, CircuitOpenError
 
 # Initialize logger for tracking task status
 logger = get_logger("task_status_logger")
@@ -18,7 +22,9 @@ class IncidentProcessor:
     formatting it into a standardized JSON structure, and sending it to an API endpoint.
     """
     
-    def __init__(self, account_num, incident_id, mongo_collection):
+    def __init__(self, account_num, incident_id, mongo_collection, customer_rows=None,
+                 customer_snapshot=None, payment_rows=None, customer_row_limit=0, stream_customer_rows=False,
+                 customer_cache=None):
         """
         Initialize the IncidentProcessor with account details and MongoDB collection.
         
@@ -26,77 +32,96 @@ class IncidentProcessor:
             account_num (str): The account number to process
             incident_id (int): The incident ID associated with this account
             mongo_collection: MongoDB collection where data will be stored
+            customer_rows (list, optional): Pre-fetched debt_cust_detail rows for this
+                account. When None, the rows are queried from MySQL.
+            customer_snapshot (dict, optional): The same rows already transformed into
+                document sections by build_customer_snapshots; used instead of customer_rows.
+            payment_rows (list, optional): Pre-fetched latest debt_payment row for this account
+                ([] if it has none). When None, the payment is queried from MySQL.
+            customer_row_limit (int): Accounts with more debt_cust_detail rows than this are
+                streamed through an unbuffered cursor instead of being read at once (0 = never)
+            stream_customer_rows (bool): The account is already known to exceed the limit
+            customer_cache (CustomerSnapshotCache, optional): Read-through cache of customer
+                sections; a cached account is not queried, and sections built from rows are stored
         """
         self.account_num = str(account_num)
         self.incident_id = int(incident_id)
         self.collection = mongo_collection
+        self.customer_rows = customer_rows
+        self.customer_snapshot = customer_snapshot
+        self.payment_rows = payment_rows
+        self.customer_row_limit = customer_row_limit
+        self.stream_customer_rows = stream_customer_rows
+        self.customer_cache = customer_cache
+        self.logger = get_incident_logger("task_status_logger", self.account_num, self.incident_id)
         self.mongo_data = self.initialize_mongo_doc()  # Initialize document structure
 
     def initialize_mongo_doc(self):
         """
-        Creates and returns a standardized MongoDB document structure with default values.
+        Creates the MongoDB document for this incident from the shared template.
+        Only the per-incident fields are allocated; see IncidentDocument.
         
         Returns:
-            dict: A dictionary representing the initial MongoDB document structure
-        """
-        now = datetime.now().replace(microsecond=0).isoformat() + ".000Z"
-        return {
-            "Doc_Version": 1,
-            "Incident_Id": self.incident_id,
-            "Account_Num": self.account_num,
-            "Arrears": 0,
-            "arrears_band": "",
-            "Created_By": "drs_admin",
-            "Created_Dtm": now,
-            "Incident_Status": "",
-            "Incident_Status_Dtm": now,
-            "Status_Description": "",
-            "File_Name_Dump": "",
-            "Batch_Id": "",
-            "Batch_Id_Tag_Dtm": now,
-            "External_Data_Update_On": now,
-            "Filtered_Reason": "",
-            "Export_On": now,
-            "File_Name_Rejected": "",
-            "Rejected_Reason": "",
-            "Incident_Forwarded_By": "",
-            "Incident_Forwarded_On": now,
-            "Contact_Details": [],
-            "Product_Details": [],
-            "Customer_Details": {},
-            "Account_Details": {},
-            "Last_Actions": [],
-            "Marketing_Details": [{
-                "ACCOUNT_MANAGER": "",
-                "CONSUMER_MARKET": "",
-                "Informed_To": "",
-                "Informed_On": "1900-01-01T00:00:00.100Z"
-            }],
-            "Action": "",
-            "Validity_period": "0",
-            "Remark": "",
-            "updatedAt": now,
-            "Rejected_By": "",
-            "Rejected_Dtm": now,
-            "Arrears_Band": "",
-            "Source_Type": "",
-            "DRC": [],
-            "RO": [],
-            "RO Requests": [],
-            "RO- Negotiation": [],
-            "RO - Customer details Edit": [],
-            "RO - CPE Collect": [],
-            "Mediation Board": [],
-            "Settlement": [],
-            "Money Transactions": [],
-            "Commission - Bill Payment": [],
-            "Bonus": [],
-            "FTL LOD": [],
-            "Litigation": [],
-            "LOD / Final Reminder": [],
-            "Dispute": [],
-            "Abnormal Stop": []
-        }
+            IncidentDocument: A dict-like document with the standard structure and default values
+        """
+        return IncidentDocument(self.incident_id, self.account_num)
+
+    def load_case_data(self):
+        """
+        Reads whichever of the customer rows and latest payment were not pre-fetched,
+        both over one MySQL session (see fetch_case_data), so the following steps
+        do not each open their own. A failed read is not fatal: read_customer_details and
+        get_payment_data then query their own rows, so a customer failure still fails the
+        incident while a payment failure is only a warning.
+        
+        Returns:
+            str: "success" if the rows are available, "error" otherwise
+        """
+        customer, payment = self.case_data_requests()
+        if not customer and not payment:
+            return "success"
+        case_data = fetch_case_data(self.account_num, customer=customer, payment=payment,
+                                    customer_row_limit=self.customer_row_limit)
+        return self.apply_case_data(case_data)
+
+    def case_data_requests(self):
+        """
+        Decides what load_case_data reads: the customer rows unless they were pre-fetched,
+        are cached (looked up here) or will be streamed, and the payment unless pre-fetched.
+        
+        Returns:
+            tuple: (customer, payment) flags
+        """
+        customer = self.customer_rows is None and self.customer_snapshot is None and not self.stream_customer_rows
+        if customer and self.customer_cache is not None:
+            self.customer_snapshot = self.customer_cache.get(self.account_num)
+            customer = self.customer_snapshot is None
+        payment = self.payment_rows is None
+        if customer or payment:
+            self.logger.info(f"Reading case data for account number: {self.account_num}")
+        return customer, payment
+
+    def apply_case_data(self, case_data):
+        """
+        Keeps the rows of a CaseData for read_customer_details and get_payment_data.
+        
+        Args:
+            case_data (CaseData): Rows read for this account, or None if the read failed
+            
+        Returns:
+            str: "success" if rows were kept, "error" otherwise
+        """
+        if case_data is None:
+            self.logger.warning(f"Combined case data read failed for account {self.account_num}; "
+                                f"reading customer details and payment separately")
+            return "error"
+        if case_data.customer_overflow:
+            self.stream_customer_rows = True
+        if case_data.customer_rows is not None:
+            self.customer_rows = case_data.customer_rows
+        if case_data.payment_rows is not None:
+            self.payment_rows = case_data.payment_rows
+        return "success"
 
     def read_customer_details(self):
         """
@@ -109,148 +134,32 @@ class IncidentProcessor:
         mysql_conn = None
         cursor = None
         try:
-            logger.info(f"Reading customer details for account number: {self.account_num}")
-            mysql_conn = get_mysql_connection()
+            if self.use_prefetched_customer_details():
+                return "success"
+
+            self.logger.info(f"Reading customer details for account number: {self.account_num}")
+            mysql_conn = get_mysql_connection(multi_statements=True)
             if not mysql_conn:
-                logger.error("MySQL connection failed. Skipping customer details retrieval.")
+                self.logger.error("MySQL connection failed. Skipping customer details retrieval.")
                 return "error"
             
-            # Execute query to fetch customer details
-            cursor = mysql_conn.cursor(pymysql.cursors.DictCursor)
-            cursor.execute(f"SELECT * FROM debt_cust_detail WHERE ACCOUNT_NUM = '{self.account_num}'")
-            rows = cursor.fetchall()
-
-            seen_products = set()  # Track unique products
-            seen_contacts = set()  # Track unique contacts
-
-            for row in rows:
-                # Normalize date formats for Contact_Details
-                load_date = row.get("LOAD_DATE")
-                if load_date:
-                    if isinstance(load_date, str):  # Handle string input
-                        load_date = datetime.strptime(load_date, "%Y-%m-%d %H:%M:%S")
-                    elif isinstance(load_date, date) and not isinstance(load_date, datetime):  # Handle date-only
-                        load_date = datetime.combine(load_date, datetime.min.time())
-                    load_date_str = load_date.replace(microsecond=0).isoformat() + ".000Z"
-                else:
-                    load_date_str = "1900-01-01T00:00:00.000Z"
-
-                # Process email contact if present and valid
-                if row.get("TECNICAL_CONTACT_EMAIL"):
-                    email = row["TECNICAL_CONTACT_EMAIL"] if "@" in row["TECNICAL_CONTACT_EMAIL"] else ""
-                    contact_key = ("email", email)
-                    if contact_key not in seen_contacts:
-                        seen_contacts.add(contact_key)
-                        self.mongo_data["Contact_Details"].append({
-                            "Contact_Type": "email",
-                            "Contact": email,
-                            "Create_Dtm": load_date_str,
-                            "Create_By": "drs_admin"
-                        })
-
-                # Process mobile contact if present
-                if row.get("MOBILE_CONTACT"):
-                    mobile = row["MOBILE_CONTACT"]
-                    contact_key = ("mobile", mobile)
-                    if contact_key not in seen_contacts:
-                        seen_contacts.add(contact_key)
-                        self.mongo_data["Contact_Details"].append({
-                            "Contact_Type": "mobile",
-                            "Contact": mobile,
-                            "Create_Dtm": load_date_str,
-                            "Create_By": "drs_admin"
-                        })
-
-                # Process work contact if present
-                if row.get("WORK_CONTACT"):
-                    work = row["WORK_CONTACT"]
-                    contact_key = ("fix", work)
-                    if contact_key not in seen_contacts:
-                        seen_contacts.add(contact_key)
-                        self.mongo_data["Contact_Details"].append({
-                            "Contact_Type": "fix",
-                            "Contact": work,
-                            "Create_Dtm": load_date_str,
-                            "Create_By": "drs_admin"
-                        })
-
-                # Populate Customer_Details if empty (only need to do this once)
-                if not self.mongo_data["Customer_Details"]:
-                    self.mongo_data["Customer_Details"] = {
-                        "Customer_Name": row.get("CONTACT_PERSON", ""),
-                        "Company_Name": "",
-                        "Company_Registry_Number": "",
-                        "Full_Address": row.get("ASSET_ADDRESS", ""),
-                        "Zip_Code": row.get("ZIP_CODE", ""),
-                        "Customer_Type_Name": "",
-                        "Nic": str(row.get("NIC", "")),
-                        "Customer_Type_Id": int(row.get("CUSTOMER_TYPE_ID", 0)),
-                        "Customer_Type": row.get("CUSTOMER_TYPE", "")
-                    }
-
-                    # Process account effective date for Account_Details
-                    acc_eff_dtm = row.get("ACCOUNT_EFFECTIVE_DTM_BSS")
-                    if acc_eff_dtm:
-                        if isinstance(acc_eff_dtm, str):
-                            acc_eff_dtm = datetime.strptime(acc_eff_dtm, "%Y-%m-%d %H:%M:%S")
-                        elif isinstance(acc_eff_dtm, date) and not isinstance(acc_eff_dtm, datetime):
-                            acc_eff_dtm = datetime.combine(acc_eff_dtm, datetime.min.time())
-                        acc_eff_dtm_str = acc_eff_dtm.replace(microsecond=0).isoformat() + ".000Z"
-                    else:
-                        acc_eff_dtm_str = "1900-01-01T00:00:00.000Z"
-
-                    self.mongo_data["Account_Details"] = {
-                        "Account_Status": row.get("ACCOUNT_STATUS_BSS", ""),
-                        "Acc_Effective_Dtm": acc_eff_dtm_str,
-                        "Acc_Activate_Date": "1900-01-01T00:00:00.000Z",
-                        "Credit_Class_Id": int(row.get("CREDIT_CLASS_ID", 0)),
-                        "Credit_Class_Name": row.get("CREDIT_CLASS_NAME", ""),
-                        "Billing_Centre": row.get("BILLING_CENTER_NAME", ""),
-                        "Customer_Segment": row.get("CUSTOMER_SEGMENT_ID", ""),
-                        "Mobile_Contact_Tel": "",
-                        "Daytime_Contact_Tel": "",
-                        "Email_Address": str(row.get("EMAIL", "")),
-                        "Last_Rated_Dtm": "1900-01-01T00:00:00.000Z"
-                    }
-
-                # Process product effective date
-                eff_dtm = row.get("ACCOUNT_EFFECTIVE_DTM_BSS")
-                if eff_dtm:
-                    if isinstance(eff_dtm, str):
-                        eff_dtm = datetime.strptime(eff_dtm, "%Y-%m-%d %H:%M:%S")
-                    elif isinstance(eff_dtm, date) and not isinstance(eff_dtm, datetime):
-                        eff_dtm = datetime.combine(eff_dtm, datetime.min.time())
-                    eff_dtm_str = eff_dtm.replace(microsecond=0).isoformat() + ".000Z"
-                else:
-                    eff_dtm_str = "1900-01-01T00:00:00.000Z"
-
-                # Add product details if not already seen
-                product_id = row.get("ASSET_ID")
-                if product_id and product_id not in seen_products:
-                    seen_products.add(product_id)
-                    self.mongo_data["Product_Details"].append({
-                        "Product_Label": row.get("PROMOTION_INTEG_ID", ""),
-                        "Customer_Ref": row.get("CUSTOMER_REF", ""),
-                        "Product_Seq": int(row.get("BSS_PRODUCT_SEQ", 0)),
-                        "Equipment_Ownership": "",
-                        "Product_Id": product_id,
-                        "Product_Name": row.get("PRODUCT_NAME", ""),
-                        "Product_Status": row.get("ASSET_STATUS", ""),
-                        "Effective_Dtm": eff_dtm_str,
-                        "Service_Address": row.get("ASSET_ADDRESS", ""),
-                        "Cat": row.get("CUSTOMER_TYPE_CAT", ""),
-                        "Db_Cpe_Status": "",
-                        "Received_List_Cpe_Status": "",
-                        "Service_Type": row.get("OSS_SERVICE_ABBREVIATION", ""),
-                        "Region": row.get("CITY", ""),
-                        "Province": row.get("PROVINCE", "")
-                    })
+            if self.stream_customer_rows:
+                # Very large account: fold tuple rows into the document as they arrive
+                self.logger.info(f"Streaming customer details for account number: {self.account_num}")
+                cursor = mysql_conn.cursor(pymysql.cursors.SSCursor)
+                self.apply_customer_rows(stream_rows(cursor, CUSTOMER_DETAILS_STATEMENT, (self.account_num,)))
+            else:
+                # Execute query to fetch customer details
+                cursor = mysql_conn.cursor(pymysql.cursors.DictCursor)
+                rows = run_statements(cursor, [(CUSTOMER_DETAILS_STATEMENT, (self.account_num,))])[0]
+                self.apply_customer_rows(rows)
+                self.cache_customer_details()
 
-            logger.info("Successfully read customer details.")
+            self.logger.info("Successfully read customer details.")
             return "success"
 
         except Exception as e:
-            logger.error(f"Error reading customer details: {e}")
+            self.logger.error(f"Error reading customer details: {e}")
             return "error"
         finally:
             if cursor:
@@ -258,6 +167,208 @@ class IncidentProcessor:
             if mysql_conn:
                 mysql_conn.close()
 
+    def use_prefetched_customer_details(self):
+        """
+        Fills the customer sections without a query when the batch loader pre-fetched the
+        rows for this poll cycle or the sections were cached.
+        
+        Returns:
+            bool: True if the sections were filled, False if they must be read
+        """
+        if self.customer_rows is None and self.customer_snapshot is None:
+            return False
+        self.logger.info(f"Using pre-fetched customer details for account number: {self.account_num}")
+        self.apply_prefetched_customer_details()
+        self.cache_customer_details()
+        self.logger.info("Successfully read customer details.")
+        return True
+
+    def apply_prefetched_customer_details(self):
+        """
+        Fills the customer sections from the pre-fetched snapshot if there is one,
+        otherwise from the pre-fetched rows.
+        """
+        if self.customer_snapshot is not None:
+            self.apply_customer_snapshot(self.customer_snapshot)
+        else:
+            self.apply_customer_rows(self.customer_rows)
+
+    def cache_customer_details(self):
+        """
+        Stores the customer sections built from rows in the snapshot cache, so later
+        incidents of the account skip the debt_cust_detail query. Sections that came from
+        a snapshot are not stored again (the batch stores those), and streamed accounts
+        are never cached so one very large account cannot fill the cache.
+        """
+        if self.customer_cache is None or self.customer_snapshot is not None or self.stream_customer_rows:
+            return
+        self.customer_cache.put(self.account_num, snapshot_from_document(self.mongo_data))
+
+    def apply_customer_snapshot(self, snapshot):
+        """
+        Copies sections built by build_customer_snapshots into the document.
+        Snapshots may be shared by several incidents of one account (and by the
+        snapshot cache), so every section and record is copied rather than reused.
+        
+        Args:
+            snapshot (dict): Contact_Details, Product_Details, Customer_Details and Account_Details
+        """
+        self.mongo_data["Contact_Details"].extend(dict(contact) for contact in snapshot["Contact_Details"])
+        self.mongo_data["Product_Details"].extend(dict(product) for product in snapshot["Product_Details"])
+        if not self.mongo_data["Customer_Details"]:
+            self.mongo_data["Customer_Details"] = dict(snapshot["Customer_Details"])
+            self.mongo_data["Account_Details"] = dict(snapshot["Account_Details"])
+
+    def apply_customer_rows(self, rows):
+        """
+        Folds debt_cust_detail rows into the contact, customer, account and product
+        sections of the document.
+        
+        Args:
+            rows (iterable): debt_cust_detail rows (dicts or ColumnRow views) belonging
+                to this account
+        """
+        fold = self.customer_row_folder()
+        for row in rows:
+            fold(row)
+
+    def customer_row_folder(self):
+        """
+        Returns a function that folds one debt_cust_detail row at a time into the
+        document, so rows can be applied while they are still being read. Duplicate
+        contacts and products are skipped across every row passed to it.
+        
+        Returns:
+            function: fold(row) taking a dict or ColumnRow
+        """
+        seen_products = set()  # Track unique products
+        seen_contacts = set()  # Track unique contacts
+
+        def fold(row):
+            # Normalize date formats for Contact_Details
+            load_date = row.get("LOAD_DATE")
+            if load_date:
+                if isinstance(load_date, str):  # Handle string input
+                    load_date = datetime.strptime(load_date, "%Y-%m-%d %H:%M:%S")
+                elif isinstance(load_date, date) and not isinstance(load_date, datetime):  # Handle date-only
+                    load_date = datetime.combine(load_date, datetime.min.time())
+                load_date_str = load_date.replace(microsecond=0).isoformat() + ".000Z"
+            else:
+                load_date_str = "1900-01-01T00:00:00.000Z"
+
+            # Process email contact if present and valid
+            if row.get("TECNICAL_CONTACT_EMAIL"):
+                email = row["TECNICAL_CONTACT_EMAIL"] if "@" in row["TECNICAL_CONTACT_EMAIL"] else ""
+                contact_key = ("email", email)
+                if contact_key not in seen_contacts:
+                    seen_contacts.add(contact_key)
+                    self.mongo_data["Contact_Details"].append({
+                        "Contact_Type": "email",
+                        "Contact": email,
+                        "Create_Dtm": load_date_str,
+                        "Create_By": "drs_admin"
+                    })
+
+            # Process mobile contact if present
+            if row.get("MOBILE_CONTACT"):
+                mobile = row["MOBILE_CONTACT"]
+                contact_key = ("mobile", mobile)
+                if contact_key not in seen_contacts:
+                    seen_contacts.add(contact_key)
+                    self.mongo_data["Contact_Details"].append({
+                        "Contact_Type": "mobile",
+                        "Contact": mobile,
+                        "Create_Dtm": load_date_str,
+                        "Create_By": "drs_admin"
+                    })
+
+            # Process work contact if present
+            if row.get("WORK_CONTACT"):
+                work = row["WORK_CONTACT"]
+                contact_key = ("fix", work)
+                if contact_key not in seen_contacts:
+                    seen_contacts.add(contact_key)
+                    self.mongo_data["Contact_Details"].append({
+                        "Contact_Type": "fix",
+                        "Contact": work,
+                        "Create_Dtm": load_date_str,
+                        "Create_By": "drs_admin"
+                    })
+
+            # Populate Customer_Details if empty (only need to do this once)
+            if not self.mongo_data["Customer_Details"]:
+                self.mongo_data["Customer_Details"] = {
+                    "Customer_Name": row.get("CONTACT_PERSON", ""),
+                    "Company_Name": "",
+                    "Company_Registry_Number": "",
+                    "Full_Address": row.get("ASSET_ADDRESS", ""),
+                    "Zip_Code": row.get("ZIP_CODE", ""),
+                    "Customer_Type_Name": "",
+                    "Nic": str(row.get("NIC", "")),
+                    "Customer_Type_Id": int(row.get("CUSTOMER_TYPE_ID", 0)),
+                    "Customer_Type": row.get("CUSTOMER_TYPE", "")
+                }
+
+                # Process account effective date for Account_Details
+                acc_eff_dtm = row.get("ACCOUNT_EFFECTIVE_DTM_BSS")
+                if acc_eff_dtm:
+                    if isinstance(acc_eff_dtm, str):
+                        acc_eff_dtm = datetime.strptime(acc_eff_dtm, "%Y-%m-%d %H:%M:%S")
+                    elif isinstance(acc_eff_dtm, date) and not isinstance(acc_eff_dtm, datetime):
+                        acc_eff_dtm = datetime.combine(acc_eff_dtm, datetime.min.time())
+                    acc_eff_dtm_str = acc_eff_dtm.replace(microsecond=0).isoformat() + ".000Z"
+                else:
+                    acc_eff_dtm_str = "1900-01-01T00:00:00.000Z"
+
+                self.mongo_data["Account_Details"] = {
+                    "Account_Status": row.get("ACCOUNT_STATUS_BSS", ""),
+                    "Acc_Effective_Dtm": acc_eff_dtm_str,
+                    "Acc_Activate_Date": "1900-01-01T00:00:00.000Z",
+                    "Credit_Class_Id": int(row.get("CREDIT_CLASS_ID", 0)),
+                    "Credit_Class_Name": row.get("CREDIT_CLASS_NAME", ""),
+                    "Billing_Centre": row.get("BILLING_CENTER_NAME", ""),
+                    "Customer_Segment": row.get("CUSTOMER_SEGMENT_ID", ""),
+                    "Mobile_Contact_Tel": "",
+                    "Daytime_Contact_Tel": "",
+                    "Email_Address": str(row.get("EMAIL", "")),
+                    "Last_Rated_Dtm": "1900-01-01T00:00:00.000Z"
+                }
+
+            # Process product effective date
+            eff_dtm = row.get("ACCOUNT_EFFECTIVE_DTM_BSS")
+            if eff_dtm:
+                if isinstance(eff_dtm, str):
+                    eff_dtm = datetime.strptime(eff_dtm, "%Y-%m-%d %H:%M:%S")
+                elif isinstance(eff_dtm, date) and not isinstance(eff_dtm, datetime):
+                    eff_dtm = datetime.combine(eff_dtm, datetime.min.time())
+                eff_dtm_str = eff_dtm.replace(microsecond=0).isoformat() + ".000Z"
+            else:
+                eff_dtm_str = "1900-01-01T00:00:00.000Z"
+
+            # Add product details if not already seen
+            product_id = row.get("ASSET_ID")
+            if product_id and product_id not in seen_products:
+                seen_products.add(product_id)
+                self.mongo_data["Product_Details"].append({
+                    "Product_Label": row.get("PROMOTION_INTEG_ID", ""),
+                    "Customer_Ref": row.get("CUSTOMER_REF", ""),
+                    "Product_Seq": int(row.get("BSS_PRODUCT_SEQ", 0)),
+                    "Equipment_Ownership": "",
+                    "Product_Id": product_id,
+                    "Product_Name": row.get("PRODUCT_NAME", ""),
+                    "Product_Status": row.get("ASSET_STATUS", ""),
+                    "Effective_Dtm": eff_dtm_str,
+                    "Service_Address": row.get("ASSET_ADDRESS", ""),
+                    "Cat": row.get("CUSTOMER_TYPE_CAT", ""),
+                    "Db_Cpe_Status": "",
+                    "Received_List_Cpe_Status": "",
+                    "Service_Type": row.get("OSS_SERVICE_ABBREVIATION", ""),
+                    "Region": row.get("CITY", ""),
+                    "Province": row.get("PROVINCE", "")
+                })
+
+        return fold
+
     def get_payment_data(self):
         """
         Retrieves the most recent payment record for the account from MySQL.
@@ -269,47 +380,23 @@ class IncidentProcessor:
         mysql_conn = None
         cursor = None
         try:
-            logger.info(f"Getting payment data for account number: {self.account_num}")
-            mysql_conn = get_mysql_connection()
+            if self.payment_rows is not None:
+                # The latest payment was pre-fetched by the batch loader for this poll cycle
+                return self.apply_prefetched_payment()
+
+            self.logger.info(f"Getting payment data for account number: {self.account_num}")
+            mysql_conn = get_mysql_connection(multi_statements=True)
             if not mysql_conn:
-                logger.error("MySQL connection failed. Skipping payment data retrieval.")
+                self.logger.error("MySQL connection failed. Skipping payment data retrieval.")
                 return "failure"
             
             # Query for most recent payment record
             cursor = mysql_conn.cursor(pymysql.cursors.DictCursor)
-            cursor.execute(
-                f"SELECT * FROM debt_payment WHERE AP_ACCOUNT_NUMBER = '{self.account_num}' "
-                "ORDER BY ACCOUNT_PAYMENT_DAT DESC LIMIT 1"
-            )
-            payment_rows = cursor.fetchall()
-
-            if payment_rows:
-                payment = payment_rows[0]
-                payment_date = payment.get("ACCOUNT_PAYMENT_DAT")
-                if payment_date:
-                    if isinstance(payment_date, str):
-                        payment_date = datetime.strptime(payment_date, "%Y-%m-%d %H:%M:%S")
-                    elif isinstance(payment_date, date) and not isinstance(payment_date, datetime):
-                        payment_date = datetime.combine(payment_date, datetime.min.time())
-                    payment_date_str = payment_date.replace(microsecond=0).isoformat() + ".000Z"
-                else:
-                    payment_date_str = "1900-01-01T00:00:00.000Z"
-
-                # Add payment information to Last_Actions
-                self.mongo_data["Last_Actions"].append({
-                    "Billed_Seq": int(payment.get("ACCOUNT_PAYMENT_SEQ", 0)),
-                    "Billed_Created": payment_date_str,
-                    "Payment_Seq": int(payment.get("ACCOUNT_PAYMENT_SEQ", 0)),
-                    "Payment_Created": payment_date_str,
-                    "Payment_Money": float(payment.get("AP_ACCOUNT_PAYMENT_MNY", 0)),
-                    "Billed_Amount": float(payment.get("AP_ACCOUNT_PAYMENT_MNY", 0))
-                })
-                logger.info("Successfully retrieved payment data.")
-                return "success"
-            return "failure"
+            payment_rows = run_statements(cursor, [(LATEST_PAYMENT_STATEMENT, (self.account_num,))])[0]
+            return self.apply_payment_rows(payment_rows)
 
         except Exception as e:
-            logger.error(f"Error retrieving payment data: {e}")
+            self.logger.error(f"Error retrieving payment data: {e}")
             return "failure"
         finally:
             if cursor:
@@ -317,19 +404,76 @@ class IncidentProcessor:
             if mysql_conn:
                 mysql_conn.close()
 
-    def format_json_object(self):
+    def apply_prefetched_payment(self):
+        """
+        Adds the pre-fetched latest payment, if the account has one, to Last_Actions.
+        
+        Returns:
+            str: "success" if a payment was applied, "failure" otherwise
+        """
+        if not self.payment_rows:
+            return "failure"
+        self.apply_payment_row(self.payment_rows[0])
+        self.logger.info("Successfully applied pre-fetched payment data.")
+        return "success"
+
+    def apply_payment_rows(self, payment_rows):
+        """
+        Adds the latest payment read by get_payment_data, if the account has one, to Last_Actions.
+        
+        Args:
+            payment_rows (list): Result of LATEST_PAYMENT_STATEMENT
+            
+        Returns:
+            str: "success" if a payment was applied, "failure" otherwise
+        """
+        if not payment_rows:
+            return "failure"
+        self.apply_payment_row(payment_rows[0])
+        self.logger.info("Successfully retrieved payment data.")
+        return "success"
+
+    def apply_payment_row(self, payment):
+        """
+        Adds the most recent debt_payment row to the Last_Actions array in the document.
+        
+        Args:
+            payment (dict): debt_payment row for this account
         """
-        Converts the MongoDB document structure to properly formatted JSON.
+        payment_date = payment.get("ACCOUNT_PAYMENT_DAT")
+        if payment_date:
+            if isinstance(payment_date, str):
+                payment_date = datetime.strptime(payment_date, "%Y-%m-%d %H:%M:%S")
+            elif isinstance(payment_date, date) and not isinstance(payment_date, datetime):
+                payment_date = datetime.combine(payment_date, datetime.min.time())
+            payment_date_str = payment_date.replace(microsecond=0).isoformat() + ".000Z"
+        else:
+            payment_date_str = "1900-01-01T00:00:00.000Z"
+
+        # Add payment information to Last_Actions
+        self.mongo_data["Last_Actions"].append({
+            "Billed_Seq": int(payment.get("ACCOUNT_PAYMENT_SEQ", 0)),
+            "Billed_Created": payment_date_str,
+            "Payment_Seq": int(payment.get("ACCOUNT_PAYMENT_SEQ", 0)),
+            "Payment_Created": payment_date_str,
+            "Payment_Money": float(payment.get("AP_ACCOUNT_PAYMENT_MNY", 0)),
+            "Billed_Amount": float(payment.get("AP_ACCOUNT_PAYMENT_MNY", 0))
+        })
+
+    def format_json_object(self, pretty=False):
+        """
+        Converts the MongoDB document structure to JSON in a single pass.
         Handles special data types like datetime and Decimal.
         
+        Args:
+            pretty (bool): Indent the output; meant for debug logging only
+            
         Returns:
-            str: A pretty-printed JSON string of the document data
+            bytes: The UTF-8 encoded JSON payload (compact unless pretty is set)
         """
-        json_data = json.loads(json.dumps(self.mongo_data, default=self.json_serializer()))
-        # Ensure string types for specific fields
-        json_data["Customer_Details"]["Nic"] = str(json_data["Customer_Details"].get("Nic", ""))
-        json_data["Account_Details"]["Email_Address"] = str(json_data["Account_Details"].get("Email_Address", ""))
-        return json.dumps(json_data, indent=4)
+        if pretty:
+            return encode_incident(self.mongo_data.as_dict(), pretty=True)
+        return self.mongo_data.to_json()
 
     def json_serializer(self):
         """
@@ -338,47 +482,40 @@ class IncidentProcessor:
         Returns:
             function: A function that handles serialization of specific types
         """
-        def _serialize(obj):
-            if isinstance(obj, (datetime, date)):
-                if isinstance(obj, date) and not isinstance(obj, datetime):
-                    obj = datetime.combine(obj, datetime.min.time())
-                return obj.replace(microsecond=0).isoformat() + ".000Z"
-            if isinstance(obj, Decimal):
-                return float(obj)
-            if obj is None:
-                return ""
-            raise TypeError(f"Type {type(obj)} not serializable")
-        return _serialize
+        return serialize_value
 
     def send_to_api(self, json_output, api_url):
         """
         Sends the formatted JSON data to the specified API endpoint.
         
         Args:
-            json_output (str): The JSON data to send
+            json_output (bytes): The JSON data to send
             api_url (str): The API URL
             
         Returns:
             dict: The API response if successful, None otherwise
         """
-        logger.info(f"Sending data to API: {api_url}")
+        self.logger.info(f"Sending data to API: {api_url}")
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
         try:
-            response = requests.post(api_url, data=json_output, headers=headers)
+            response = post_json(api_url, json_output, headers=headers)
             response.raise_for_status()
-            logger.info("Successfully sent data to API.")
+            self.logger.info("Successfully sent data to API.")
             return response.json()
+        except CircuitOpenError as e:
+            self.logger.warning(f"Skipped API call: {e}")
+            return None
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error sending data to API: {e}")
+            self.logger.error(f"Error sending data to API: {e}")
             return None
 
     def process_incident(self):
         """
         Main method to coordinate the entire incident processing workflow:
-        1. Reads customer details from MySQL
+        1. Reads customer details from MySQL (together with the payment, in one session)
         2. Retrieves payment data
         3. Formats the data as JSON
         4. Sends to the API endpoint
@@ -387,42 +524,88 @@ class IncidentProcessor:
             tuple: (success_flag, message) where success_flag is boolean and message is str
         """
         try:
-            logger.info(f"Processing incident for account: {self.account_num}, ID: {self.incident_id}")
+            self.logger.info(f"Processing incident for account: {self.account_num}, ID: {self.incident_id}")
             
             # Step 1: Read customer details
-            customer_status = self.read_customer_details()
-            if customer_status != "success" or not self.mongo_data["Customer_Details"]:
-                error_msg = f"No customer details found for account {self.account_num}"
-                logger.error(error_msg)
+            with timed("case_data_read"):
+                self.load_case_data()
+            with timed("customer_read"):
+                customer_status = self.read_customer_details()
+            error_msg = self.check_customer_details(customer_status)
+            if error_msg:
                 return False, error_msg
             
             # Step 2: Get payment data (optional)
-            payment_status = self.get_payment_data()
-            if payment_status != "success":
-                logger.warning(f"Failed to retrieve payment data for account {self.account_num}")
+            with timed("payment_read"):
+                payment_status = self.get_payment_data()
+            self.check_payment_data(payment_status)
                 
             # Step 3: Format as JSON
-            json_output = self.format_json_object()
-            print(json_output)  # For debugging
+            json_output = self.build_payload()
             
             # Step 4: Get API URL and send data
             api_url = read_api_config()
             if not api_url:
                 raise APIConfigError("Empty API URL in config")
                     
-            api_response = self.send_to_api(json_output, api_url)
-            if not api_response:
-                raise IncidentCreationError("Empty API response")
-                    
-            logger.info(f"API Success: {api_response}")
-            return True, api_response
+            with timed("api_post"):
+                api_response = self.send_to_api(json_output, api_url)
+            return self.incident_created(api_response)
                 
-        except IncidentCreationError as e:
-            logger.error(f"Incident processing failed: {e}")
-            return False, str(e)
-        except APIConfigError as e:
-            logger.error(f"Configuration error: {e}")
-            return False, str(e)
         except Exception as e:
-            logger.error(f"Unexpected error: {e}", exc_info=True)
-            return False, str(e)
\ No newline at end of file
+            return self.incident_failed(e)
+
+    def check_customer_details(self, customer_status):
+        """
+        Returns:
+            str: Error message (logged) if the customer sections could not be filled, else None
+        """
+        if customer_status == "success" and self.mongo_data["Customer_Details"]:
+            return None
+        error_msg = f"No customer details found for account {self.account_num}"
+        self.logger.error(error_msg)
+        return error_msg
+
+    def check_payment_data(self, payment_status):
+        """Logs a warning if no payment was added; the incident is still sent without one."""
+        if payment_status != "success":
+            self.logger.warning(f"Failed to retrieve payment data for account {self.account_num}")
+
+    def build_payload(self):
+        """
+        Returns:
+            bytes: The compact JSON payload; the pretty form is logged at DEBUG level
+        """
+        with timed("format"):
+            json_output = self.format_json_object()
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(self.format_json_object(pretty=True).decode("utf-8"))
+        return json_output
+
+    def incident_created(self, api_response):
+        """
+        Returns:
+            tuple: (True, api_response)
+            
+        Raises:
+            IncidentCreationError: If the API gave no response
+        """
+        if not api_response:
+            raise IncidentCreationError("Empty API response")
+        self.logger.info(f"API Success: {api_response}")
+        return True, api_response
+
+    def incident_failed(self, error):
+        """
+        Logs why process_incident failed.
+        
+        Returns:
+            tuple: (False, message)
+        """
+        if isinstance(error, IncidentCreationError):
+            self.logger.error(f"Incident processing failed: {error}")
+        elif isinstance(error, APIConfigError):
+            self.logger.error(f"Configuration error: {error}")
+        else:
+            self.logger.error(f"Unexpected error: {error}", exc_info=error)
+        return False, str(error)
\ No newline at end of file
@@ -0,0 +1,228 @@
+import pymysql
+from utils.database.connectSQL import get_mysql_connection
+from utils.database.sqlStatements import STREAM_FETCH_SIZE
+from utils.logger.logger import get_logger
+
+# Initialize logger for tracking task status
+logger = get_logger("task_status_logger")
+
+# Number of account numbers sent in a single IN (...) query
+DEFAULT_CHUNK_SIZE = 500
+
+# Latest-payment query shapes: "grouped" (the default) joins each account's MAX(ACCOUNT_PAYMENT_DAT)
+# back to debt_payment (any version), "window" ranks rows with ROW_NUMBER() (MySQL 8.0+).
+# Both pick the same row as the per-account ORDER BY ACCOUNT_PAYMENT_DAT DESC LIMIT 1 query,
+# which sorts NULL dates last: an account whose payments are all undated still gets one.
+LATEST_PAYMENT_STRATEGIES = ("grouped", "window")
+
+
+def build_customer_details_query(account_count):
+    """
+    Returns the parameterized multi-account debt_cust_detail query for account_count accounts.
+    """
+    placeholders = ", ".join(["%s"] * account_count)
+    return f"SELECT * FROM debt_cust_detail WHERE ACCOUNT_NUM IN ({placeholders})"
+
+
+def build_latest_payments_query(account_count, strategy="grouped"):
+    """
+    Returns the parameterized query for the most recent debt_payment row of each of
+    account_count accounts, in one round-trip. MAX() ignores NULL dates, so the
+    grouped join also matches NULL to NULL for accounts with no dated payment.
+
+    Args:
+        account_count (int): Number of account placeholders
+        strategy (str): One of LATEST_PAYMENT_STRATEGIES
+    """
+    placeholders = ", ".join(["%s"] * account_count)
+    if strategy == "grouped":
+        return (
+            "SELECT p.* FROM debt_payment p JOIN ("
+            "SELECT AP_ACCOUNT_NUMBER, MAX(ACCOUNT_PAYMENT_DAT) AS LATEST_PAYMENT_DAT FROM debt_payment "
+            f"WHERE AP_ACCOUNT_NUMBER IN ({placeholders}) GROUP BY AP_ACCOUNT_NUMBER) latest "
+            "ON p.AP_ACCOUNT_NUMBER = latest.AP_ACCOUNT_NUMBER "
+            "AND (p.ACCOUNT_PAYMENT_DAT = latest.LATEST_PAYMENT_DAT "
+            "OR (p.ACCOUNT_PAYMENT_DAT IS NULL AND latest.LATEST_PAYMENT_DAT IS NULL))"
+        )
+    return (
+        "SELECT * FROM (SELECT p.*, ROW_NUMBER() OVER "
+        "(PARTITION BY AP_ACCOUNT_NUMBER ORDER BY ACCOUNT_PAYMENT_DAT DESC) AS PAYMENT_RANK "
+        f"FROM debt_payment p WHERE AP_ACCOUNT_NUMBER IN ({placeholders})) ranked "
+        "WHERE PAYMENT_RANK = 1"
+    )
+
+
+def group_latest_payments(rows, grouped):
+    """
+    Stores each account's latest debt_payment row in grouped as a one-row list.
+    Only the first row per account is kept, since the grouped query returns every
+    row that ties on the latest payment date.
+    """
+    for row in rows:
+        payments = grouped.setdefault(str(row.get("AP_ACCOUNT_NUMBER")), [])
+        if not payments:
+            row.pop("PAYMENT_RANK", None)
+            payments.append(row)
+    return grouped
+
+
+def group_rows_by_account(rows, grouped, row_limit=0):
+    """
+    Appends each debt_cust_detail row to its account's list in grouped. With a
+    row_limit, an account that passes it is set to None and its rows are dropped,
+    so one very large account cannot fill memory; its incident streams it instead.
+    """
+    for row in rows:
+        account = str(row.get("ACCOUNT_NUM"))
+        account_rows = grouped.setdefault(account, [])
+        if account_rows is None:
+            continue
+        account_rows.append(row)
+        if row_limit and len(account_rows) > row_limit:
+            grouped[account] = None
+    return grouped
+
+
+class AccountBatchLoader:
+    """
+    Base for the poll-cycle loaders: fetches rows for many accounts with chunked
+    multi-account IN (...) queries, instead of one query per incident. Subclasses
+    supply the query (build_query) and how rows are grouped by account (group_rows);
+    prepare and chunks are also used by the asyncio engine's aiomysql loads.
+    """
+
+    description = "rows"
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Initialize the loader.
+
+        Args:
+            chunk_size (int): Maximum number of account numbers per query
+        """
+        self.chunk_size = max(1, int(chunk_size))
+        self.unbuffered = False  # Read each chunk through an unbuffered (SS) cursor
+
+    def build_query(self, account_count):
+        raise NotImplementedError
+
+    def group_rows(self, rows, grouped):
+        raise NotImplementedError
+
+    def prepare(self, account_numbers):
+        """
+        Returns:
+            tuple: (distinct account numbers as str, in order; the result dict with an
+                empty list for each of them)
+        """
+        accounts = list(dict.fromkeys(str(account) for account in account_numbers))
+        return accounts, {account: [] for account in accounts}
+
+    def chunks(self, accounts):
+        """Yields the (query, accounts) pair of each chunk of at most chunk_size accounts."""
+        for start in range(0, len(accounts), self.chunk_size):
+            chunk = accounts[start:start + self.chunk_size]
+            yield self.build_query(len(chunk)), chunk
+
+    def load(self, account_numbers):
+        """
+        Retrieves rows for the given accounts and groups them by account.
+
+        Args:
+            account_numbers (iterable): Account numbers to fetch
+
+        Returns:
+            dict: {account_number (str): [rows]} with an empty list for accounts that
+                have no rows (see group_rows), or None if the rows could not be fetched
+        """
+        accounts, grouped = self.prepare(account_numbers)
+        if not accounts:
+            return grouped
+
+        mysql_conn = None
+        cursor = None
+        try:
+            logger.info(f"Batch reading {self.description} for {len(accounts)} accounts")
+            mysql_conn = get_mysql_connection()
+            if not mysql_conn:
+                logger.error(f"MySQL connection failed. Skipping batch {self.description} retrieval.")
+                return None
+
+            cursor_class = pymysql.cursors.SSDictCursor if self.unbuffered else pymysql.cursors.DictCursor
+            cursor = mysql_conn.cursor(cursor_class)
+            for query, chunk in self.chunks(accounts):
+                cursor.execute(query, chunk)
+                while True:
+                    rows = cursor.fetchmany(STREAM_FETCH_SIZE)
+                    if not rows:
+                        break
+                    self.group_rows(rows, grouped)
+
+            logger.info(f"Successfully batch read {self.description}.")
+            return grouped
+
+        except Exception as e:
+            logger.error(f"Error batch reading {self.description}: {e}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            if mysql_conn:
+                mysql_conn.close()
+
+
+class CustomerDetailsBatchLoader(AccountBatchLoader):
+    """
+    Fetches debt_cust_detail rows for every account in a poll cycle. load() returns
+    None for accounts over the row limit.
+    """
+
+    description = "customer details"
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, row_limit=0):
+        """
+        Initialize the loader.
+
+        Args:
+            chunk_size (int): Maximum number of account numbers per query
+            row_limit (int): Accounts with more rows than this are left out (set to None)
+                and the rows are read through an unbuffered cursor (0 = no limit)
+        """
+        super().__init__(chunk_size)
+        self.row_limit = max(0, int(row_limit))
+        # Unbuffered with a row limit, so a chunk's result is never held in full
+        self.unbuffered = bool(self.row_limit)
+
+    def build_query(self, account_count):
+        return build_customer_details_query(account_count)
+
+    def group_rows(self, rows, grouped):
+        return group_rows_by_account(rows, grouped, self.row_limit)
+
+
+class LatestPaymentBatchLoader(AccountBatchLoader):
+    """
+    Fetches the most recent debt_payment row of every account in a poll cycle,
+    instead of one ORDER BY ... LIMIT 1 query per incident.
+    """
+
+    description = "latest payments"
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, strategy="grouped"):
+        """
+        Initialize the loader.
+
+        Args:
+            chunk_size (int): Maximum number of account numbers per query
+            strategy (str): One of LATEST_PAYMENT_STRATEGIES
+        """
+        super().__init__(chunk_size)
+        if strategy not in LATEST_PAYMENT_STRATEGIES:
+            raise ValueError(f"Unknown latest payment strategy: {strategy}")
+        self.strategy = strategy
+
+    def build_query(self, account_count):
+        return build_latest_payments_query(account_count, self.strategy)
+
+    def group_rows(self, rows, grouped):
+        return group_latest_payments(rows, grouped)
@@ -0,0 +1,247 @@
+from datetime import datetime, date
+import pandas as pd
+from utils.logger.logger import get_logger
+
+# Initialize logger for tracking task status
+logger = get_logger("task_status_logger")
+
+DEFAULT_DTM = "1900-01-01T00:00:00.000Z"
+
+# (column, Contact_Type) in the order IncidentProcessor.apply_customer_rows emits contacts
+CONTACT_COLUMNS = (
+    ("TECNICAL_CONTACT_EMAIL", "email"),
+    ("MOBILE_CONTACT", "mobile"),
+    ("WORK_CONTACT", "fix")
+)
+
+
+def format_dtm(value):
+    """
+    Formats a debt_cust_detail date value the way apply_customer_rows does.
+
+    Args:
+        value: datetime, date, "%Y-%m-%d %H:%M:%S" string, or a falsy value
+
+    Returns:
+        str: ISO timestamp with a ".000Z" suffix, or the 1900 default for falsy values
+    """
+    if not value:
+        return DEFAULT_DTM
+    if isinstance(value, str):
+        value = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    return value.replace(microsecond=0).isoformat() + ".000Z"
+
+
+def _format_dtm_column(series):
+    """Formats a column of dates, converting each distinct value only once."""
+    formatted = {}
+
+    def convert(value):
+        try:
+            return formatted[value]
+        except KeyError:
+            formatted[value] = result = format_dtm(value)
+            return result
+        except TypeError:  # Unhashable value
+            return format_dtm(value)
+
+    return series.map(convert)
+
+
+def _column(frame, name, default):
+    """Returns a column, or a column of defaults when the rows do not have it (row.get semantics)."""
+    if name in frame.columns:
+        return frame[name]
+    return pd.Series([default] * len(frame), index=frame.index, dtype=object)
+
+
+def _build_frame(rows_by_account):
+    """
+    Builds one object-dtype frame from every account's rows, so MySQL values keep their
+    Python types (no NaN for NULL, no int/float coercion) and match the per-row path.
+    """
+    accounts = []
+    rows = []
+    for account, account_rows in rows_by_account.items():
+        if account_rows is None:
+            continue  # Over the batch row limit; streamed by its incident
+        accounts.extend([account] * len(account_rows))
+        rows.extend(account_rows)
+    if not rows:
+        return None
+
+    columns = list(rows[0].keys())
+    data = {name: pd.Series([row[name] for row in rows], dtype=object) for name in columns}
+    frame = pd.DataFrame(data)
+    frame["_account"] = accounts
+    frame["_row"] = range(len(rows))
+    return frame
+
+
+def _contact_details(frame, load_dtm):
+    """Deduplicated Contact_Details records per account, in per-row emission order."""
+    parts = []
+    for order, (column, contact_type) in enumerate(CONTACT_COLUMNS):
+        values = _column(frame, column, None)
+        present = values.map(bool).astype(bool)
+        if not present.any():
+            continue
+        contacts = values[present]
+        if contact_type == "email":
+            contacts = contacts.map(lambda email: email if "@" in email else "")
+        parts.append(pd.DataFrame({
+            "_account": frame["_account"][present],
+            "_row": frame["_row"][present],
+            "_order": order,
+            "Contact_Type": contact_type,
+            "Contact": contacts,
+            "Create_Dtm": load_dtm[present]
+        }))
+    if not parts:
+        return {}
+
+    contacts = pd.concat(parts, ignore_index=True)
+    contacts = contacts.sort_values(["_row", "_order"], kind="stable")
+    contacts = contacts.drop_duplicates(["_account", "Contact_Type", "Contact"], keep="first")
+
+    details = {}
+    for account, contact_type, contact, create_dtm in zip(
+            contacts["_account"].tolist(), contacts["Contact_Type"].tolist(),
+            contacts["Contact"].tolist(), contacts["Create_Dtm"].tolist()):
+        details.setdefault(account, []).append({
+            "Contact_Type": contact_type,
+            "Contact": contact,
+            "Create_Dtm": create_dtm,
+            "Create_By": "drs_admin"
+        })
+    return details
+
+
+def _product_details(frame, effective_dtm):
+    """Product_Details records per account, keeping the first row of each ASSET_ID."""
+    product_ids = _column(frame, "ASSET_ID", None)
+    present = product_ids.map(bool).astype(bool)
+    products = frame[present].assign(_product_id=product_ids[present], _effective_dtm=effective_dtm[present])
+    products = products.drop_duplicates(["_account", "_product_id"], keep="first")
+
+    columns = {
+        name: _column(products, name, default).tolist()
+        for name, default in (
+            ("PROMOTION_INTEG_ID", ""), ("CUSTOMER_REF", ""), ("BSS_PRODUCT_SEQ", 0),
+            ("PRODUCT_NAME", ""), ("ASSET_STATUS", ""), ("ASSET_ADDRESS", ""),
+            ("CUSTOMER_TYPE_CAT", ""), ("OSS_SERVICE_ABBREVIATION", ""), ("CITY", ""), ("PROVINCE", "")
+        )
+    }
+    details = {}
+    for index, (account, product_id, effective) in enumerate(zip(
+            products["_account"].tolist(), products["_product_id"].tolist(),
+            products["_effective_dtm"].tolist())):
+        details.setdefault(account, []).append({
+            "Product_Label": columns["PROMOTION_INTEG_ID"][index],
+            "Customer_Ref": columns["CUSTOMER_REF"][index],
+            "Product_Seq": int(columns["BSS_PRODUCT_SEQ"][index]),
+            "Equipment_Ownership": "",
+            "Product_Id": product_id,
+            "Product_Name": columns["PRODUCT_NAME"][index],
+            "Product_Status": columns["ASSET_STATUS"][index],
+            "Effective_Dtm": effective,
+            "Service_Address": columns["ASSET_ADDRESS"][index],
+            "Cat": columns["CUSTOMER_TYPE_CAT"][index],
+            "Db_Cpe_Status": "",
+            "Received_List_Cpe_Status": "",
+            "Service_Type": columns["OSS_SERVICE_ABBREVIATION"][index],
+            "Region": columns["CITY"][index],
+            "Province": columns["PROVINCE"][index]
+        })
+    return details
+
+
+def _customer_and_account_details(frame, effective_dtm):
+    """Customer_Details and Account_Details per account, taken from its first row."""
+    first_rows = frame.assign(_effective_dtm=effective_dtm).drop_duplicates("_account", keep="first")
+    sections = {}
+    for row in first_rows.to_dict("records"):
+        sections[row["_account"]] = (
+            {
+                "Customer_Name": row.get("CONTACT_PERSON", ""),
+                "Company_Name": "",
+                "Company_Registry_Number": "",
+                "Full_Address": row.get("ASSET_ADDRESS", ""),
+                "Zip_Code": row.get("ZIP_CODE", ""),
+                "Customer_Type_Name": "",
+                "Nic": str(row.get("NIC", "")),
+                "Customer_Type_Id": int(row.get("CUSTOMER_TYPE_ID", 0)),
+                "Customer_Type": row.get("CUSTOMER_TYPE", "")
+            },
+            {
+                "Account_Status": row.get("ACCOUNT_STATUS_BSS", ""),
+                "Acc_Effective_Dtm": row["_effective_dtm"],
+                "Acc_Activate_Date": DEFAULT_DTM,
+                "Credit_Class_Id": int(row.get("CREDIT_CLASS_ID", 0)),
+                "Credit_Class_Name": row.get("CREDIT_CLASS_NAME", ""),
+                "Billing_Centre": row.get("BILLING_CENTER_NAME", ""),
+                "Customer_Segment": row.get("CUSTOMER_SEGMENT_ID", ""),
+                "Mobile_Contact_Tel": "",
+                "Daytime_Contact_Tel": "",
+                "Email_Address": str(row.get("EMAIL", "")),
+                "Last_Rated_Dtm": DEFAULT_DTM
+            }
+        )
+    return sections
+
+
+def _transform(rows_by_account):
+    frame = _build_frame(rows_by_account)
+    if frame is None:
+        return {}
+
+    # Every row's dates are normalized, as the per-row path does, so bad values fail the same way
+    load_dtm = _format_dtm_column(_column(frame, "LOAD_DATE", None))
+    effective_dtm = _format_dtm_column(_column(frame, "ACCOUNT_EFFECTIVE_DTM_BSS", None))
+
+    contacts = _contact_details(frame, load_dtm)
+    products = _product_details(frame, effective_dtm)
+    snapshots = {}
+    for account, (customer, account_details) in _customer_and_account_details(frame, effective_dtm).items():
+        snapshots[account] = {
+            "Contact_Details": contacts.get(account, []),
+            "Product_Details": products.get(account, []),
+            "Customer_Details": customer,
+            "Account_Details": account_details
+        }
+    return snapshots
+
+
+def build_customer_snapshots(rows_by_account):
+    """
+    Transforms the debt_cust_detail rows of many accounts into the Contact_Details,
+    Product_Details, Customer_Details and Account_Details sections in one columnar pass.
+    The sections are identical to what IncidentProcessor.apply_customer_rows builds.
+
+    If the batch cannot be transformed as a whole, it is split in halves until the failing
+    accounts are isolated; those are left out so their incidents use the per-row path
+    (and report the error there).
+
+    Args:
+        rows_by_account (dict): {account_number (str): [rows]} from CustomerDetailsBatchLoader
+
+    Returns:
+        dict: {account_number (str): sections} for every account with at least one row
+    """
+    if not rows_by_account:
+        return {}
+    try:
+        return _transform(rows_by_account)
+    except Exception as e:
+        if len(rows_by_account) == 1:
+            logger.warning(f"Customer transform failed for account {next(iter(rows_by_account))}: {e}")
+            return {}
+        logger.debug(f"Batch customer transform failed, splitting batch: {e}")
+
+    accounts = list(rows_by_account)
+    middle = len(accounts) // 2
+    snapshots = build_customer_snapshots({account: rows_by_account[account] for account in accounts[:middle]})
+    snapshots.update(build_customer_snapshots({account: rows_by_account[account] for account in accounts[middle:]}))
+    return snapshots
@@ -0,0 +1,173 @@
+import threading
+import time
+from cachetools import TTLCache
+from utils.config.processingConfig import get_processing_config
+from utils.logger.logger import get_logger
+from utils.metrics.metrics import Counter, register_metric, increment
+
+# Initialize logger for tracking task status
+logger = get_logger("task_status_logger")
+
+CUSTOMER_CACHE_LOOKUPS = register_metric(Counter(
+    "request_log_customer_cache_lookups_total",
+    "Customer snapshot cache lookups, by result",
+    ("result",)
+))
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def snapshot_from_document(document):
+    """
+    Copies the customer sections out of an incident document, in the form
+    build_customer_snapshots produces.
+
+    Args:
+        document: IncidentDocument whose customer sections are filled
+
+    Returns:
+        dict: Contact_Details, Product_Details, Customer_Details and Account_Details
+    """
+    return {
+        "Contact_Details": [dict(contact) for contact in document["Contact_Details"]],
+        "Product_Details": [dict(product) for product in document["Product_Details"]],
+        "Customer_Details": dict(document["Customer_Details"]),
+        "Account_Details": dict(document["Account_Details"])
+    }
+
+
+class CustomerSnapshotCache:
+    """
+    Bounded, thread-safe read-through cache of customer snapshots keyed by account
+    number. Entries expire ttl seconds after they were stored, and the least recently
+    used entry is evicted when the cache is full. Snapshots are shared by every
+    incident that reads them, so callers copy before changing them (as
+    IncidentProcessor.apply_customer_snapshot does).
+    """
+
+    def __init__(self, maxsize=10000, ttl=300.0, timer=time.monotonic):
+        """
+        Args:
+            maxsize (int): Maximum number of accounts held
+            ttl (float): Seconds an entry stays valid
+            timer (callable): Clock used for expiry
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl, timer=timer)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, account_number):
+        """
+        Returns:
+            dict: The cached snapshot of the account, or None
+        """
+        return self.get_many([account_number]).get(str(account_number))
+
+    def get_many(self, account_numbers):
+        """
+        Look up several accounts at once, counting a hit or miss for each.
+
+        Args:
+            account_numbers (iterable): Account numbers to look up
+
+        Returns:
+            dict: {account_number (str): snapshot} for the accounts that are cached
+        """
+        found = {}
+        misses = 0
+        with self._lock:
+            for account in dict.fromkeys(str(account) for account in account_numbers):
+                snapshot = self._entries.get(account)
+                if snapshot is None:
+                    misses += 1
+                else:
+                    found[account] = snapshot
+            self.hits += len(found)
+            self.misses += misses
+        increment(CUSTOMER_CACHE_LOOKUPS, "hit", amount=len(found))
+        increment(CUSTOMER_CACHE_LOOKUPS, "miss", amount=misses)
+        return found
+
+    def put(self, account_number, snapshot):
+        """
+        Store the snapshot of an account. Snapshots without Customer_Details (accounts
+        with no rows) are not cached, so rows that appear later are picked up at once.
+        """
+        if not snapshot or not snapshot.get("Customer_Details"):
+            return
+        with self._lock:
+            self._entries[str(account_number)] = snapshot
+
+    def put_many(self, snapshots):
+        """
+        Args:
+            snapshots (dict): {account_number: snapshot} from build_customer_snapshots
+        """
+        for account, snapshot in snapshots.items():
+            self.put(account, snapshot)
+
+    def invalidate(self, account_number):
+        """
+        Drop an account's snapshot so the next incident reads it from MySQL again.
+
+        Returns:
+            bool: True if the account was cached
+        """
+        with self._lock:
+            removed = self._entries.pop(str(account_number), None) is not None
+            if removed:
+                self.invalidations += 1
+        return removed
+
+    def clear(self):
+        """Drop every cached snapshot."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: {'hits', 'misses', 'invalidations', 'size', 'maxsize', 'ttl'}
+        """
+        with self._lock:
+            self._entries.expire()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl
+            }
+
+
+def get_customer_snapshot_cache():
+    """
+    Returns the process-wide customer snapshot cache, or None when CUSTOMER_CACHE_SIZE
+    or CUSTOMER_CACHE_TTL in the PROCESSING section is 0.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            processing_config = get_processing_config()
+            if processing_config['customer_cache_size'] <= 0 or processing_config['customer_cache_ttl'] <= 0:
+                return None
+            _cache = CustomerSnapshotCache(
+                maxsize=processing_config['customer_cache_size'],
+                ttl=processing_config['customer_cache_ttl']
+            )
+            logger.info(f"Customer snapshot cache enabled: {_cache.maxsize} accounts, {_cache.ttl:.0f}s TTL")
+        return _cache
+
+
+def reset_customer_snapshot_cache():
+    """Drop the shared cache so the next call rebuilds it from the current config."""
+    global _cache
+    with _cache_lock:
+        _cache = None
@@ -0,0 +1,230 @@
+import copy
+import json
+import time
+from collections.abc import MutableMapping
+from datetime import datetime
+from types import MappingProxyType
+from .incidentEncoder import encode_incident
+
+# Default document, in wire order. Per-incident fields are placeholders (None) here.
+INCIDENT_TEMPLATE = MappingProxyType({
+    "Doc_Version": 1,
+    "Incident_Id": None,
+    "Account_Num": None,
+    "Arrears": 0,
+    "arrears_band": "",
+    "Created_By": "drs_admin",
+    "Created_Dtm": None,
+    "Incident_Status": "",
+    "Incident_Status_Dtm": None,
+    "Status_Description": "",
+    "File_Name_Dump": "",
+    "Batch_Id": "",
+    "Batch_Id_Tag_Dtm": None,
+    "External_Data_Update_On": None,
+    "Filtered_Reason": "",
+    "Export_On": None,
+    "File_Name_Rejected": "",
+    "Rejected_Reason": "",
+    "Incident_Forwarded_By": "",
+    "Incident_Forwarded_On": None,
+    "Contact_Details": None,
+    "Product_Details": None,
+    "Customer_Details": None,
+    "Account_Details": None,
+    "Last_Actions": None,
+    "Marketing_Details": [{
+        "ACCOUNT_MANAGER": "",
+        "CONSUMER_MARKET": "",
+        "Informed_To": "",
+        "Informed_On": "1900-01-01T00:00:00.100Z"
+    }],
+    "Action": "",
+    "Validity_period": "0",
+    "Remark": "",
+    "updatedAt": None,
+    "Rejected_By": "",
+    "Rejected_Dtm": None,
+    "Arrears_Band": "",
+    "Source_Type": "",
+    "DRC": [],
+    "RO": [],
+    "RO Requests": [],
+    "RO- Negotiation": [],
+    "RO - Customer details Edit": [],
+    "RO - CPE Collect": [],
+    "Mediation Board": [],
+    "Settlement": [],
+    "Money Transactions": [],
+    "Commission - Bill Payment": [],
+    "Bonus": [],
+    "FTL LOD": [],
+    "Litigation": [],
+    "LOD / Final Reminder": [],
+    "Dispute": [],
+    "Abnormal Stop": []
+})
+
+# Document keys stored in slots, and the slot that holds each
+SLOT_FIELDS = MappingProxyType({
+    "Incident_Id": "incident_id",
+    "Account_Num": "account_num",
+    "Contact_Details": "contact_details",
+    "Product_Details": "product_details",
+    "Customer_Details": "customer_details",
+    "Account_Details": "account_details",
+    "Last_Actions": "last_actions"
+})
+
+# Document keys that all carry the document's creation time
+TIMESTAMP_FIELDS = frozenset((
+    "Created_Dtm", "Incident_Status_Dtm", "Batch_Id_Tag_Dtm", "External_Data_Update_On",
+    "Export_On", "Incident_Forwarded_On", "updatedAt", "Rejected_Dtm"
+))
+
+
+def _wire_layout():
+    """
+    Splits the template, in wire order, into pre-encoded runs of the keys that are the same
+    for every incident ("key":value pairs as bytes) and tuples of the per-incident keys between them.
+    """
+    layout = []
+    static = {}
+    dynamic = []
+    for key, value in INCIDENT_TEMPLATE.items():
+        if key in SLOT_FIELDS or key in TIMESTAMP_FIELDS:
+            if static:
+                layout.append(json.dumps(static, separators=(",", ":"))[1:-1].encode("utf-8"))
+                static = {}
+            dynamic.append(key)
+        else:
+            if dynamic:
+                layout.append(tuple(dynamic))
+                dynamic = []
+            static[key] = value
+    if static:
+        layout.append(json.dumps(static, separators=(",", ":"))[1:-1].encode("utf-8"))
+    if dynamic:
+        layout.append(tuple(dynamic))
+    return tuple(layout)
+
+
+WIRE_LAYOUT = _wire_layout()
+
+# '"key":' prefix of every timestamp field, for runs that hold only timestamps
+TIMESTAMP_PREFIXES = MappingProxyType({key: json.dumps(key).encode("utf-8") + b":" for key in TIMESTAMP_FIELDS})
+
+_timestamp_cache = (None, None)
+
+
+def current_timestamp():
+    """
+    Returns the current local time as "YYYY-MM-DDTHH:MM:SS.000Z", formatted at most once per second.
+    """
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, formatted = _timestamp_cache
+    if cached_second != second:
+        formatted = datetime.fromtimestamp(second).isoformat() + ".000Z"
+        _timestamp_cache = (second, formatted)
+    return formatted
+
+
+class IncidentDocument(MutableMapping):
+    """
+    Compact incident document. Only per-incident fields are stored on the instance;
+    everything else is read from INCIDENT_TEMPLATE and copied into the instance only
+    when it is accessed (and may therefore be modified) or assigned.
+    Supports dict-style access, so existing mongo_data["..."] code keeps working.
+    """
+
+    __slots__ = ("incident_id", "account_num", "created", "contact_details", "product_details",
+                 "customer_details", "account_details", "last_actions", "_overrides")
+
+    def __init__(self, incident_id, account_num, created=None):
+        """
+        Args:
+            incident_id (int): Incident ID
+            account_num (str): Account number
+            created (str, optional): Creation timestamp; defaults to the current time
+        """
+        self.incident_id = incident_id
+        self.account_num = account_num
+        self.created = created or current_timestamp()
+        self.contact_details = []
+        self.product_details = []
+        self.customer_details = {}
+        self.account_details = {}
+        self.last_actions = []
+        self._overrides = None  # Template keys copied or assigned for this incident, plus extra keys
+
+    def __getitem__(self, key):
+        return self._get(key, keep_copy=True)
+
+    def __setitem__(self, key, value):
+        slot = SLOT_FIELDS.get(key)
+        if slot is not None:
+            setattr(self, slot, value)
+        else:
+            self._override(key, value)
+
+    def __delitem__(self, key):
+        raise TypeError("Incident document fields cannot be deleted")
+
+    def __iter__(self):
+        yield from INCIDENT_TEMPLATE
+        if self._overrides is not None:
+            yield from (key for key in self._overrides if key not in INCIDENT_TEMPLATE)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def _get(self, key, keep_copy):
+        if self._overrides is not None and key in self._overrides:
+            return self._overrides[key]
+        slot = SLOT_FIELDS.get(key)
+        if slot is not None:
+            return getattr(self, slot)
+        if key in TIMESTAMP_FIELDS:
+            return self.created
+        value = INCIDENT_TEMPLATE[key]
+        if isinstance(value, (list, dict)):
+            # The caller may modify it, so hand out a copy; keep it if the caller holds the document
+            value = copy.deepcopy(value)
+            if keep_copy:
+                self._override(key, value)
+        return value
+
+    def _override(self, key, value):
+        if self._overrides is None:
+            self._overrides = {}
+        self._overrides[key] = value
+
+    def as_dict(self):
+        """Returns the full document as a plain dict (template values are copied)."""
+        return {key: self._get(key, keep_copy=False) for key in self}
+
+    def to_json(self):
+        """
+        Serializes the document to the compact wire format, keys in template order.
+        Untouched template fields are emitted from the pre-encoded runs of WIRE_LAYOUT,
+        so only the per-incident fields are encoded.
+
+        Returns:
+            bytes: UTF-8 encoded JSON
+        """
+        if self._overrides:
+            return encode_incident(self.as_dict())
+        created = json.dumps(self.created).encode("utf-8")
+        parts = []
+        for run in WIRE_LAYOUT:
+            if isinstance(run, bytes):
+                parts.append(run)
+            elif all(key in TIMESTAMP_FIELDS for key in run):
+                parts.extend(TIMESTAMP_PREFIXES[key] + created for key in run)
+            else:
+                parts.append(encode_incident({
+                    key: self.created if key in TIMESTAMP_FIELDS else getattr(self, SLOT_FIELDS[key])
+                    for key in run
+                })[1:-1])
+        return b"{" + b",".join(parts) + b"}"
@@ -0,0 +1,68 @@
+import json
+from datetime import datetime, date
+from decimal import Decimal
+
+try:
+    import orjson  # Optional faster backend
+except ImportError:
+    orjson = None
+
+# Fields the incident API expects as strings whatever type MySQL returned
+STRING_FIELDS = (("Customer_Details", "Nic"), ("Account_Details", "Email_Address"))
+
+
+def serialize_value(obj):
+    """
+    Converts values JSON cannot encode natively: datetimes and dates to
+    "YYYY-MM-DDTHH:MM:SS.000Z" and Decimals to float.
+
+    Raises:
+        TypeError: For any other unsupported type
+    """
+    if isinstance(obj, (datetime, date)):
+        if isinstance(obj, date) and not isinstance(obj, datetime):
+            obj = datetime.combine(obj, datetime.min.time())
+        return obj.replace(microsecond=0).isoformat() + ".000Z"
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type {type(obj)} not serializable")
+
+
+def get_json_backend():
+    """Returns the name of the backend used for compact encoding: 'orjson' or 'json'."""
+    return "orjson" if orjson is not None else "json"
+
+
+def _with_string_fields(document):
+    """Returns the document with STRING_FIELDS coerced to str, copying only what changes."""
+    for section, field in STRING_FIELDS:
+        value = document.get(section, {}).get(field, "")
+        if not isinstance(value, str):
+            if isinstance(value, (datetime, date, Decimal)):
+                value = serialize_value(value)
+            document = dict(document)
+            document[section] = dict(document[section])
+            document[section][field] = str(value)
+    return document
+
+
+def encode_incident(document, pretty=False):
+    """
+    Encodes an incident document for the API in a single pass.
+
+    Args:
+        document (dict): Incident document (IncidentProcessor.mongo_data)
+        pretty (bool): Indent the output for debugging; always uses the json module
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    document = _with_string_fields(document)
+    if pretty:
+        return json.dumps(document, default=serialize_value, indent=4).encode("utf-8")
+    if orjson is not None:
+        try:
+            return orjson.dumps(document, default=serialize_value, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits; the json module handles them
+    return json.dumps(document, default=serialize_value, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,201 @@
+import os
+import socket
+import time
+import uuid
+from utils.logger.logger import get_logger
+
+# Initialize logger for order processing tasks
+logger = get_logger("task_status_logger")
+
+IN_PROGRESS = "In_Progress"
+
+# Fields that record who holds a request and until when
+CLAIM_FIELDS = ("claimed_by", "claim_id", "lease_expires_at")
+
+
+def new_worker_id():
+    """
+    Returns:
+        str: Owner id unique to this process, e.g. "host:1234:9f2c01ab"
+    """
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def build_claimable_filter(now, order_id=None, ids=None):
+    """
+    Build a filter for requests a worker may claim: Open ones, and In_Progress ones
+    whose lease has expired because their owner stopped or crashed.
+
+    Args:
+        now (float): Current time.time()
+        order_id (int, optional): Only match requests of this type
+        ids (list, optional): Only match these _id values
+
+    Returns:
+        dict: Filter for find/update_many
+    """
+    query = {
+        "$or": [
+            {"request_status": "Open"},
+            {"request_status": IN_PROGRESS, "lease_expires_at": {"$lt": now}}
+        ]
+    }
+    if order_id is not None:
+        query["order_id"] = order_id
+    if ids is not None:
+        query["_id"] = {"$in": list(ids)}
+    return query
+
+
+def build_claim_update(owner, claim_id, lease_expires_at):
+    """
+    Build the update that moves a claimable request to In_Progress under owner.
+
+    Args:
+        owner (str): Worker id from new_worker_id
+        claim_id (str): Id shared by the requests claimed in one round
+        lease_expires_at (float): time.time() after which others may reclaim the request
+
+    Returns:
+        dict: Update for update_many
+    """
+    return {
+        "$set": {
+            "request_status": IN_PROGRESS,
+            "claimed_by": owner,
+            "claim_id": claim_id,
+            "lease_expires_at": lease_expires_at
+        }
+    }
+
+
+def build_renew_update(owner, ids, lease_expires_at):
+    """
+    Build the filter and update that extend this worker's lease on requests it still holds.
+    A request whose lease expired and was reclaimed by another worker does not match.
+
+    Args:
+        owner (str): Worker id that holds the claims
+        ids (list): _id values of the requests about to be processed
+        lease_expires_at (float): New time.time() after which others may reclaim them
+
+    Returns:
+        tuple: (filter, update) for update_many
+    """
+    return (
+        {"_id": {"$in": list(ids)}, "request_status": IN_PROGRESS, "claimed_by": owner},
+        {"$set": {"lease_expires_at": lease_expires_at}}
+    )
+
+
+def build_release_update(owner, ids):
+    """
+    Build the filter and update that hand unfinished requests back to the Open set.
+    released_at marks the change so the change stream does not redeliver it at once.
+
+    Args:
+        owner (str): Worker id that holds the claims
+        ids (list): _id values of the requests to release
+
+    Returns:
+        tuple: (filter, update) for update_many
+    """
+    return (
+        {"_id": {"$in": list(ids)}, "request_status": IN_PROGRESS, "claimed_by": owner},
+        {
+            "$set": {"request_status": "Open", "released_at": time.time()},
+            "$unset": {field: "" for field in CLAIM_FIELDS}
+        }
+    )
+
+
+class RequestClaims:
+    """
+    Lease-based claiming of Request_Progress_Log documents, so several OrderProcessor
+    processes can share one Open set without sending the same incident twice.
+
+    A batch claim is one update_many over candidate _ids whose filter re-checks that each
+    request is still claimable, followed by a read of the _ids that now carry this round's
+    claim_id. MongoDB applies each document's update atomically, so exactly one worker
+    wins every request.
+
+    A batch can take longer than one lease, so the lease of each group of requests is
+    renewed just before they are processed (renew); requests whose lease was lost to
+    another worker are skipped.
+    """
+
+    def __init__(self, collection, owner=None, lease_seconds=300.0):
+        """
+        Args:
+            collection: Request_Progress_Log collection
+            owner (str, optional): Worker id (defaults to new_worker_id())
+            lease_seconds (float): How long a claim is held before others may reclaim it
+        """
+        self.collection = collection
+        self.owner = owner or new_worker_id()
+        self.lease_seconds = lease_seconds
+
+    def claim(self, ids, projection=None):
+        """
+        Claim the given requests for this worker.
+
+        Args:
+            ids (list): _id values of candidate requests
+            projection (dict, optional): Fields to return for the claimed requests
+
+        Returns:
+            list: The claimed documents; requests held by another worker are left out
+        """
+        ids = list(ids)
+        if not ids:
+            return []
+        now = time.time()
+        claim_id = uuid.uuid4().hex
+        self.collection.update_many(
+            build_claimable_filter(now, ids=ids),
+            build_claim_update(self.owner, claim_id, now + self.lease_seconds)
+        )
+        claimed = list(self.collection.find({"_id": {"$in": ids}, "claim_id": claim_id}, projection))
+        if len(claimed) < len(ids):
+            logger.debug(f"Claimed {len(claimed)} of {len(ids)} requests; the rest are held by other workers")
+        return claimed
+
+    def renew(self, ids):
+        """
+        Extend the lease of requests this worker still holds.
+
+        Args:
+            ids (list): _id values of the requests about to be processed
+
+        Returns:
+            tuple: (set of _id values still held, lease_expires_at of the renewed leases)
+        """
+        ids = list(ids)
+        lease_expires_at = time.time() + self.lease_seconds
+        if not ids:
+            return set(), lease_expires_at
+        query, update = build_renew_update(self.owner, ids, lease_expires_at)
+        self.collection.update_many(query, update)
+        held = {doc['_id'] for doc in self.collection.find(
+            {**query, "lease_expires_at": lease_expires_at}, {"_id": 1}
+        )}
+        if len(held) < len(ids):
+            logger.warning(f"Lost the lease on {len(ids) - len(held)} of {len(ids)} requests; "
+                           f"another worker has reclaimed them")
+        return held, lease_expires_at
+
+    def release(self, ids):
+        """
+        Return requests this worker still holds to the Open set.
+
+        Args:
+            ids (list): _id values of requests that were not completed
+
+        Returns:
+            int: Number of requests released
+        """
+        ids = list(ids)
+        if not ids:
+            return 0
+        query, update = build_release_update(self.owner, ids)
+        return self.collection.update_many(query, update).modified_count
@@ -0,0 +1,100 @@
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import OperationFailure, PyMongoError
+from utils.logger.logger import get_logger
+
+# Initialize logger for order processing tasks
+logger = get_logger("task_status_logger")
+
+# Indexes backing the queries OrderProcessor runs against Request_Progress_Log
+REQUEST_LOG_INDEXES = [
+    # Open-order polls and claims: request_status (+ order_id), including expired In_Progress leases;
+    # shard_key lets a shard's $mod filter and the search for unkeyed requests run on the index
+    ([("request_status", ASCENDING), ("order_id", ASCENDING), ("shard_key", ASCENDING)],
+     {"name": "request_status_1_order_id_1_shard_key_1"}),
+    # Completion updates on migrated documents
+    ([("account_number", ASCENDING), ("parameters.incident_id", ASCENDING)],
+     {"name": "account_number_1_parameters.incident_id_1"}),
+    # Completion updates on documents still using the legacy field; only those are indexed
+    ([("account_num", ASCENDING), ("parameters.incident_id", ASCENDING)],
+     {"name": "account_num_1_parameters.incident_id_1",
+      "partialFilterExpression": {"account_num": {"$exists": True}}}),
+]
+
+# Documents that still carry the legacy account_num field
+LEGACY_ACCOUNT_FILTER = {"account_num": {"$exists": True}}
+
+
+def ensure_request_log_indexes(collection):
+    """
+    Create the REQUEST_LOG_INDEXES that are missing. Existing identical indexes are left
+    as they are; an index that conflicts with an existing one is logged and skipped.
+
+    Args:
+        collection: Request_Progress_Log collection
+
+    Returns:
+        list: Names of the indexes that now exist
+    """
+    names = []
+    for keys, options in REQUEST_LOG_INDEXES:
+        try:
+            names.append(collection.create_index(keys, **options))
+        except OperationFailure as e:
+            logger.warning(f"Could not create index {options['name']}: {e}")
+    logger.info(f"Request_Progress_Log indexes ensured: {names}")
+    return names
+
+
+def count_legacy_account_documents(collection):
+    """
+    Returns:
+        int: Documents that still store their account number in account_num
+    """
+    return collection.count_documents(LEGACY_ACCOUNT_FILTER)
+
+
+def migrate_account_field(collection, batch_size=1000, max_batches=None):
+    """
+    Move account_num into account_number on every document that still has the legacy
+    field, in batches. Each batch reads up to batch_size legacy documents and rewrites
+    them with one bulk_write; a document keeps an existing account_number and loses
+    account_num. The migration is resumable: it only ever selects documents that still
+    have account_num, so it can be stopped and run again at any point.
+
+    Args:
+        collection: Request_Progress_Log collection
+        batch_size (int): Documents per batch
+        max_batches (int, optional): Stop after this many batches (None = until done)
+
+    Returns:
+        int: Documents migrated by this call
+    """
+    migrated = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        documents = list(collection.find(
+            LEGACY_ACCOUNT_FILTER, {"account_num": 1, "account_number": 1}, limit=batch_size
+        ))
+        if not documents:
+            break
+
+        operations = []
+        for doc in documents:
+            update = {"$unset": {"account_num": ""}}
+            if not doc.get("account_number"):
+                update["$set"] = {"account_number": doc["account_num"]}
+            # Match the value read so a concurrent change to the document is not overwritten
+            operations.append(UpdateOne({"_id": doc["_id"], "account_num": doc["account_num"]}, update))
+        try:
+            result = collection.bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            logger.error(f"Account field migration stopped after {migrated} documents: {e}")
+            raise
+
+        if not result.modified_count:
+            logger.warning("Account field migration made no progress; documents are changing concurrently")
+            break
+        migrated += result.modified_count
+        batches += 1
+        logger.info(f"Account field migration: {migrated} documents migrated")
+    return migrated
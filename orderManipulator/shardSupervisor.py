@@ -0,0 +1,160 @@
+import multiprocessing
+import threading
+import time
+from utils.logger.logger import get_logger
+
+# Initialize logger for order processing tasks
+logger = get_logger("task_status_logger")
+
+# Seconds between shard health checks, and between aggregated count log lines
+CHECK_INTERVAL = 1.0
+REPORT_INTERVAL = 60.0
+# Restart delay for a crashed shard: doubles while it keeps crashing soon after start
+RESTART_DELAY_MIN = 1.0
+RESTART_DELAY_MAX = 60.0
+# A shard that ran this long before exiting is considered healthy again
+STABLE_RUNTIME = 60.0
+
+
+def run_shard(shard_index, shard_count, mode, counts):
+    """
+    Entry point of one shard process. Builds its own OrderProcessor, and with it its own
+    MongoDB, MySQL and HTTP pools, then runs the daemon loop for its partition of accounts.
+
+    Args:
+        shard_index (int): Partition this process owns
+        shard_count (int): Number of partitions
+        mode (str): "daemon" (the only mode that can be sharded)
+        counts (multiprocessing.Array): Shared [processed, errors] totals for this shard
+    """
+    # Imported here so the supervisor process does not open any connections itself
+    from orderManipulator.OrderMani import OrderProcessor
+    from utils.metrics.metrics import start_metrics_exporter
+
+    start_metrics_exporter(instance=shard_index)
+    processor = OrderProcessor(shard_index=shard_index, shard_count=shard_count)
+    logger.info(f"Shard {shard_index + 1}/{shard_count} started")
+
+    # Carry totals over from earlier runs of this shard
+    base_processed, base_errors = counts[0], counts[1]
+
+    def report_counts():
+        counts[0] = base_processed + processor.processed_total
+        counts[1] = base_errors + processor.error_total
+
+    def report_periodically():
+        while True:
+            time.sleep(CHECK_INTERVAL)
+            report_counts()
+
+    threading.Thread(target=report_periodically, name="shard-counts", daemon=True).start()
+    try:
+        if mode == "daemon":
+            processor.run_daemon()
+    finally:
+        report_counts()
+
+
+class ShardSupervisor:
+    """
+    Runs one OrderProcessor process per hash partition of account numbers, restarts
+    shards that exit unexpectedly and aggregates their processed and error counts.
+    Processes are started with the spawn method so none inherits another's connections.
+    """
+
+    def __init__(self, shard_count, mode="daemon"):
+        """
+        Args:
+            shard_count (int): Number of shard processes
+            mode (str): Processing mode passed to every shard
+        """
+        self.shard_count = shard_count
+        self.mode = mode
+        self.context = multiprocessing.get_context("spawn")
+        self.target = run_shard
+        self.counts = [self.context.Array('q', 2) for _ in range(shard_count)]
+        self.processes = [None] * shard_count
+        self.started_at = [0.0] * shard_count
+        self.restart_delay = [RESTART_DELAY_MIN] * shard_count
+        self.restart_at = [None] * shard_count
+        self.restarts = 0
+        self._stopping = False
+
+    def start_shard(self, shard_index):
+        process = self.context.Process(
+            target=self.target,
+            args=(shard_index, self.shard_count, self.mode, self.counts[shard_index]),
+            name=f"order-shard-{shard_index}",
+            daemon=False
+        )
+        process.start()
+        self.processes[shard_index] = process
+        self.started_at[shard_index] = time.monotonic()
+        self.restart_at[shard_index] = None
+        logger.info(f"Started shard {shard_index} (pid {process.pid})")
+
+    def totals(self):
+        """
+        Returns:
+            dict: {'processed', 'errors', 'restarts'} summed over all shards
+        """
+        return {
+            'processed': sum(counts[0] for counts in self.counts),
+            'errors': sum(counts[1] for counts in self.counts),
+            'restarts': self.restarts
+        }
+
+    def check_shards(self):
+        """Schedule a restart for every shard that exited, and start the ones that are due."""
+        now = time.monotonic()
+        for shard_index, process in enumerate(self.processes):
+            if self.restart_at[shard_index] is not None:
+                if now >= self.restart_at[shard_index]:
+                    self.restarts += 1
+                    self.start_shard(shard_index)
+                continue
+            if process is None or process.is_alive():
+                continue
+
+            runtime = now - self.started_at[shard_index]
+            if runtime >= STABLE_RUNTIME:
+                self.restart_delay[shard_index] = RESTART_DELAY_MIN
+            delay = self.restart_delay[shard_index]
+            self.restart_delay[shard_index] = min(delay * 2, RESTART_DELAY_MAX)
+            self.restart_at[shard_index] = now + delay
+            logger.error(f"Shard {shard_index} exited with code {process.exitcode} after {runtime:.0f}s; "
+                         f"restarting in {delay:.0f}s")
+
+    def run(self):
+        """Start every shard and supervise them until interrupted."""
+        logger.info(f"Starting {self.shard_count} shard processes in {self.mode} mode")
+        for shard_index in range(self.shard_count):
+            self.start_shard(shard_index)
+
+        last_report = time.monotonic()
+        try:
+            while not self._stopping:
+                time.sleep(CHECK_INTERVAL)
+                self.check_shards()
+                if time.monotonic() - last_report >= REPORT_INTERVAL:
+                    last_report = time.monotonic()
+                    logger.info(f"Shard totals: {self.totals()}")
+        except KeyboardInterrupt:
+            logger.info("Program terminated by user")
+        finally:
+            self.stop()
+        return self.totals()
+
+    def stop(self, timeout=30.0):
+        """Stop every shard: wait for them to exit on their own, then terminate stragglers."""
+        self._stopping = True
+        deadline = time.monotonic() + timeout
+        for process in self.processes:
+            if process is not None:
+                process.join(max(0.0, deadline - time.monotonic()))
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                logger.warning(f"Terminating shard {process.name} (pid {process.pid})")
+                process.terminate()
+                process.join()
+        logger.info(f"Shard totals: {self.totals()}")
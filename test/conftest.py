@@ -0,0 +1,127 @@
+"""
+Shared fixtures: the order processors run against the local stand-ins in
+benchmarks/localServices (an in-memory Request_Progress_Log, a SQLite debt_cust_detail
+and debt_payment database behind the MySQL pool) with the incident API replaced by a
+recorder, so the tests need no MongoDB, MySQL or API server.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.localServices import SQLiteMySQLConnection, create_customer_database
+from utils.config import configRegistry, processingConfig
+from utils.database import connectMongoDB, connectSQL
+from utils.database.connectSQL import MySQLConnectionPool
+from utils.database.connectMongoDB import _build_mongo_config
+from utils.config.processingConfig import _build_processing_config
+from utils.api import connectAPI
+from utils.api.connectAPI import reset_api_circuit_breaker
+import orderManipulator.caseRegistration as caseRegistration
+import orderManipulator.OrderMani as OrderMani
+from orderManipulator.customerSnapshotCache import reset_customer_snapshot_cache
+
+ACCOUNTS = [f"{index:010d}" for index in range(6)]
+
+
+@pytest.fixture
+def customer_db(tmp_path):
+    """SQLite customer database for ACCOUNTS, installed as the shared MySQL pool."""
+    path = str(tmp_path / "customers.sqlite")
+    create_customer_database(path, ACCOUNTS)
+    previous = connectSQL._pool
+    connectSQL._pool = MySQLConnectionPool(lambda: SQLiteMySQLConnection(path), size=4)
+    yield path
+    connectSQL._pool = previous
+
+
+@pytest.fixture
+def api_posts(monkeypatch):
+    """
+    Replaces the incident API with a recorder. Returns the list of posted payloads;
+    incidents in api_posts.fail_incidents get no response (the POST fails), and
+    api_posts.hook, if set, is called with every payload after it is recorded.
+    """
+    class Posts(list):
+        hook = None
+        fail_incidents = set()
+
+    posts = Posts()
+
+    def send_to_api(self, json_output, api_url):
+        payload = json.loads(json_output)
+        posts.append(payload)
+        failed = payload["Incident_Id"] in posts.fail_incidents
+        if posts.hook is not None:
+            posts.hook(payload)
+        if failed:
+            return None
+        return {"status": "success", "Incident_Id": payload["Incident_Id"]}
+
+    monkeypatch.setattr(caseRegistration, "read_api_config", lambda: "http://incident-api.local/")
+    monkeypatch.setattr(caseRegistration.IncidentProcessor, "send_to_api", send_to_api)
+    return posts
+
+
+@pytest.fixture
+def order_processor_factory(monkeypatch, customer_db):
+    """
+    Returns make(collection, mongo=None, processing=None, **kwargs) building an
+    OrderProcessor(**kwargs) over the given collection, with config values overridden
+    by the mongo/processing dicts.
+    """
+    reset_api_circuit_breaker()
+    reset_customer_snapshot_cache()
+    processors = []
+
+    def make(collection, mongo=None, processing=None, **kwargs):
+        mongo_config = _build_mongo_config(None)
+        mongo_config.update(mongo or {})
+        processing_config = _build_processing_config(None)
+        processing_config.update(processing or {})
+        monkeypatch.setattr(OrderMani, "get_mongo_collection", lambda: collection)
+        monkeypatch.setattr(OrderMani, "get_mongo_config", lambda: dict(mongo_config))
+        monkeypatch.setattr(OrderMani, "get_processing_config", lambda: dict(processing_config))
+        processor = OrderMani.OrderProcessor(**kwargs)
+        processors.append(processor)
+        return processor
+
+    yield make
+    for processor in processors:
+        processor.close()
+    reset_customer_snapshot_cache()
+    reset_api_circuit_breaker()
+
+
+@pytest.fixture
+def write_config(tmp_path, monkeypatch):
+    """
+    Points every config reader at a temporary databaseConfig.ini and returns
+    write(sections), which (re)writes it from {section: {key: value}}.
+    """
+    path = tmp_path / "databaseConfig.ini"
+    for module in (connectSQL, connectMongoDB, processingConfig, OrderMani):
+        monkeypatch.setattr(module, "get_filePath", lambda key: path)
+    monkeypatch.setattr(connectAPI, "get_config_paths", lambda: [path])
+    monkeypatch.setattr(configRegistry._registry, "check_interval", 0.0)
+    monkeypatch.setattr(connectSQL, "_pool", None)
+    monkeypatch.setattr(connectSQL, "_pool_settings", None)
+    monkeypatch.setattr(connectSQL, "_statement_pool", None)
+    monkeypatch.setattr(connectSQL, "_statement_pool_settings", None)
+    monkeypatch.setattr(connectAPI, "_session", None)
+    monkeypatch.setattr(connectAPI, "_breaker", None)
+
+    def write(sections):
+        mtime = path.stat().st_mtime_ns if path.exists() else None
+        path.write_text("".join(
+            f"[{section}]\n" + "".join(f"{key} = {value}\n" for key, value in values.items())
+            for section, values in sections.items()
+        ))
+        if mtime is not None:
+            os.utime(path, ns=(mtime + 10 ** 9, mtime + 10 ** 9))  # Edits within one mtime tick
+
+    yield write
+    connectAPI.close_http_session()
@@ -0,0 +1,138 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from benchmarks.localServices import (
+    InMemoryCollection, AsyncInMemoryCollection, AsyncSQLitePool, LatencyHTTPServer, build_open_orders
+)
+import orderManipulator.asyncCaseRegistration as asyncCaseRegistration
+import orderManipulator.caseRegistration as caseRegistration
+from orderManipulator.asyncCaseRegistration import AsyncOrderProcessor, AsyncIncidentProcessor
+from orderManipulator.caseRegistration import IncidentProcessor
+from orderManipulator.customerSnapshotCache import reset_customer_snapshot_cache
+from orderManipulator.incidentDocument import TIMESTAMP_FIELDS
+from utils.api.connectAPI import get_api_circuit_breaker, get_http_config, reset_api_circuit_breaker
+from utils.database.connectMongoDB import _build_mongo_config
+from conftest import ACCOUNTS
+
+REQUEST_COUNT = 20
+BATCH_SIZE = 8
+FAILING_INCIDENT = 5  # Answered with 400, which is not retried, so its request goes back to Open
+
+
+class TransitionRecorder(InMemoryCollection):
+    """InMemoryCollection that records every request_status each request moves through."""
+
+    def __init__(self, documents):
+        self.transitions = {}
+        super().__init__(documents)
+
+    def _apply(self, document, update):
+        super()._apply(document, update)
+        status = update.get("$set", {}).get("request_status")
+        if status is not None:
+            self.transitions.setdefault(document["_id"], []).append(status)
+
+
+def comparable_payloads(payloads):
+    return sorted(({key: value for key, value in payload.items() if key not in TIMESTAMP_FIELDS}
+                   for payload in payloads), key=lambda payload: payload["Incident_Id"])
+
+
+def final_documents(collection):
+    volatile = {"completed_at", "released_at"}
+    return sorted(({key: value for key, value in document.items() if key not in volatile}
+                   for document in collection.find()), key=lambda document: document["_id"])
+
+
+def run_sync_engine(order_processor_factory, monkeypatch, work_claims):
+    collection = TransitionRecorder(build_open_orders(REQUEST_COUNT, ACCOUNTS))
+    with LatencyHTTPServer(fail_status=400, fail_incidents={FAILING_INCIDENT}, keep_payloads=True) as server:
+        monkeypatch.setattr(caseRegistration, "read_api_config", lambda: server.url)
+        processor = order_processor_factory(collection, mongo={"open_order_batch_size": BATCH_SIZE,
+                                                               "work_claims": work_claims})
+        result = processor.process_option_1(processor.get_open_orders(order_id=1))
+        processor.close()
+    return result, server.payloads, collection
+
+
+async def run_async_engine(customer_db):
+    collection = TransitionRecorder(build_open_orders(REQUEST_COUNT, ACCOUNTS))
+    with LatencyHTTPServer(fail_status=400, fail_incidents={FAILING_INCIDENT}, keep_payloads=True) as server:
+        async with aiohttp.ClientSession() as session:
+            processor = AsyncOrderProcessor(AsyncInMemoryCollection(collection), AsyncSQLitePool(customer_db),
+                                            session, server.url, concurrency=4, batch_size=BATCH_SIZE)
+            result = await processor.process_option_1(processor.get_open_orders(order_id=1))
+    return result, server.payloads, collection
+
+
+@pytest.mark.parametrize("work_claims", [False, True])
+def test_async_engine_matches_sync_engine(order_processor_factory, monkeypatch, customer_db, work_claims):
+    sync_result, sync_payloads, sync_collection = run_sync_engine(order_processor_factory, monkeypatch, work_claims)
+    mongo_config = dict(_build_mongo_config(None), work_claims=work_claims)
+    monkeypatch.setattr(asyncCaseRegistration, "get_mongo_config", lambda: dict(mongo_config))
+    # Start the async engine with an empty snapshot cache so it reads MySQL itself
+    reset_customer_snapshot_cache()
+    reset_api_circuit_breaker()
+    async_result, async_payloads, async_collection = asyncio.run(run_async_engine(customer_db))
+
+    assert sync_result == async_result == (REQUEST_COUNT - 1, 1)
+    assert len(sync_payloads) == len(async_payloads) == REQUEST_COUNT
+    assert comparable_payloads(sync_payloads) == comparable_payloads(async_payloads)
+    assert sync_collection.transitions == async_collection.transitions
+    if work_claims:
+        assert sync_collection.transitions[FAILING_INCIDENT] == ["In_Progress", "Open"]
+        assert sync_collection.transitions[1] == ["In_Progress", "Completed"]
+    else:
+        assert FAILING_INCIDENT not in sync_collection.transitions
+        assert sync_collection.transitions[1] == ["Completed"]
+    assert final_documents(sync_collection) == final_documents(async_collection)
+
+
+def send_sync(api_url):
+    return IncidentProcessor("0000000000", 1, None).send_to_api(b"{}", api_url)
+
+
+def send_async(api_url):
+    async def send():
+        async with aiohttp.ClientSession() as session:
+            return await AsyncIncidentProcessor("0000000000", 1, None, None, session, api_url).send_to_api_async(b"{}")
+    return asyncio.run(send())
+
+
+def test_request_rejected_before_reaching_the_api_is_not_a_breaker_success():
+    for send in (send_sync, send_async):
+        reset_api_circuit_breaker()
+        breaker = get_api_circuit_breaker()
+        for _ in range(get_http_config()['breaker_failure_threshold'] - 1):
+            breaker.record_failure()
+
+        # An invalid URL fails locally; it must neither count as a failure nor reset the count
+        assert send("not-a-url") is None
+        assert not breaker.is_open()
+        breaker.record_failure()
+        assert breaker.is_open(), send.__name__
+    reset_api_circuit_breaker()
+
+
+def test_async_checkouts_are_rolled_back(customer_db):
+    """As in the sync pool, a connection goes back to the pool with no open transaction."""
+    pool = AsyncSQLitePool(customer_db)
+    processor = AsyncIncidentProcessor(ACCOUNTS[0], 1, None, pool, None, None)
+    assert asyncio.run(processor.get_payment_data_async()) == "success"
+    connection = pool._idle[0]
+    assert pool.acquires == connection.rollbacks == 1
+
+    async def failed_rollback():
+        raise ConnectionError("server has gone away")
+
+    async def checkout():
+        async with asyncCaseRegistration.acquire_mysql_connection(pool) as checked_out:
+            return checked_out
+
+    # A connection that cannot be rolled back is closed rather than reused as is
+    closed = []
+    connection.rollback = failed_rollback
+    connection.close = lambda: closed.append(True)
+    assert asyncio.run(checkout()) is connection and closed == [True]
@@ -0,0 +1,37 @@
+import logging
+import sqlite3
+
+from benchmarks.localServices import InMemoryCollection
+from orderManipulator.caseRegistration import IncidentProcessor
+from conftest import ACCOUNTS
+
+
+def drop_table(path, table):
+    db = sqlite3.connect(path)
+    db.execute(f"DROP TABLE {table}")
+    db.commit()
+    db.close()
+
+
+def process(account):
+    return IncidentProcessor(account, 1, InMemoryCollection([])).process_incident()
+
+
+def test_failed_payment_query_is_only_a_warning(customer_db, api_posts, caplog):
+    drop_table(customer_db, "debt_payment")
+    with caplog.at_level(logging.WARNING, logger="task_status_logger"):
+        success, response = process(ACCOUNTS[0])
+
+    assert success, response
+    assert len(api_posts) == 1
+    assert api_posts[0]["Customer_Details"]
+    assert any("Failed to retrieve payment data" in record.getMessage() for record in caplog.records)
+
+
+def test_failed_customer_query_fails_the_incident(customer_db, api_posts):
+    drop_table(customer_db, "debt_cust_detail")
+    success, message = process(ACCOUNTS[0])
+
+    assert not success
+    assert message == f"No customer details found for account {ACCOUNTS[0]}"
+    assert api_posts == []
@@ -0,0 +1,114 @@
+import threading
+
+from benchmarks.localServices import InMemoryCollection
+from utils.config import configRegistry, processingConfig
+from utils.database import connectMongoDB, connectSQL
+from utils.api import connectAPI
+import orderManipulator.OrderMani as OrderMani
+
+
+def connection_settings(pool_size=2, host="127.0.0.1"):
+    return {
+        "DATABASE": {"MYSQL_HOST": host, "MYSQL_DATABASE": "drs", "MYSQL_USER": "root",
+                     "MYSQL_PASSWORD": "", "MYSQL_POOL_SIZE": pool_size},
+        "API": {"api_url": "http://incident-api.local/", "POOL_SIZE": 4, "READ_TIMEOUT": 30,
+                "BREAKER_FAILURE_THRESHOLD": 5}
+    }
+
+
+def test_pool_and_api_client_follow_config_edits(write_config):
+    write_config(connection_settings())
+    pool = connectSQL.get_mysql_pool()
+    session = connectAPI.get_http_session()
+    breaker = connectAPI.get_api_circuit_breaker()
+    assert pool.size == 2
+
+    settings = connection_settings(pool_size=6)
+    settings["API"].update({"READ_TIMEOUT": 7, "BREAKER_FAILURE_THRESHOLD": 9})
+    write_config(settings)
+    connectSQL.get_mysql_config()
+
+    # Limits are applied to the live objects
+    assert connectSQL.get_mysql_pool() is pool and pool.size == 6
+    assert connectAPI.get_http_session() is session and connectAPI._session_timeout[1] == 7.0
+    assert connectAPI.get_api_circuit_breaker() is breaker and breaker.failure_threshold == 9
+
+    # New connection settings replace the pool and the session
+    settings = connection_settings(pool_size=6, host="10.0.0.5")
+    settings["API"]["POOL_SIZE"] = 8
+    write_config(settings)
+    connectAPI.get_http_config()
+    assert connectSQL.get_mysql_pool() is not pool
+    assert connectAPI.get_http_session() is not session
+
+
+def test_reload_hooks_do_not_block_config_readers(write_config):
+    """
+    While one thread runs the reload hooks, others that hold the pool or session lock
+    and read config must not wait on it (the hooks take those locks too).
+    """
+    write_config(connection_settings())
+    processingConfig.get_processing_config()
+    readers_finished = []
+
+    def run_readers(path):
+        readers = [threading.Thread(target=connectSQL.get_mysql_pool, kwargs={"multi_statements": True},
+                                    daemon=True),
+                   threading.Thread(target=connectAPI.get_http_session, daemon=True)]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join(2)
+        readers_finished.append(not any(reader.is_alive() for reader in readers))
+
+    configRegistry.add_reload_hook(run_readers)
+    try:
+        write_config(connection_settings(pool_size=3))
+        reloader = threading.Thread(target=processingConfig.get_processing_config, daemon=True)
+        reloader.start()
+        reloader.join(10)
+        assert not reloader.is_alive()
+    finally:
+        configRegistry.remove_reload_hook(run_readers)
+    assert readers_finished == [True]
+    assert connectSQL.get_mysql_pool().size == 3
+
+
+def test_processor_follows_config_edits(write_config, order_processor_factory, monkeypatch):
+    write_config({"MONGODB": {"OPEN_ORDER_BATCH_SIZE": 100, "CLAIM_LEASE_SECONDS": 60},
+                  "PROCESSING": {"MAX_IN_FLIGHT": 4}})
+    processor = order_processor_factory(InMemoryCollection([]), mongo={"work_claims": True})
+    monkeypatch.setattr(OrderMani, "get_mongo_config", connectMongoDB.get_mongo_config)
+    monkeypatch.setattr(OrderMani, "get_processing_config", processingConfig.get_processing_config)
+    processor.reload_settings()
+    assert (processor.batch_size, processor.max_in_flight, processor.claims.lease_seconds) == (100, 4, 60.0)
+    assert processor.enabled_order_ids == (1,)
+
+    write_config({"MONGODB": {"OPEN_ORDER_BATCH_SIZE": 7, "CLAIM_LEASE_SECONDS": 20},
+                  "PROCESSING": {"MAX_IN_FLIGHT": 3, "LATEST_PAYMENT_QUERY": "window"},
+                  "DAEMON": {"ENABLED_ORDER_IDS": "1,2"}})
+    processor.dispatch_open_orders()  # Each scan checks the file for edits
+    assert (processor.batch_size, processor.max_in_flight, processor.claims.lease_seconds) == (7, 3, 20.0)
+    assert processor.latest_payment_query == "window"
+    assert processor.enabled_order_ids == (1, 2)
+
+    # A closed processor no longer listens
+    processor.close()
+    write_config({"MONGODB": {"OPEN_ORDER_BATCH_SIZE": 50}})
+    connectMongoDB.get_mongo_config()
+    assert processor.batch_size == 7
+
+
+def test_check_config_reports_reloads(tmp_path):
+    path = tmp_path / "settings.ini"
+    path.write_text("[DAEMON]\nWAKEUP = poll\n")
+    registry = configRegistry.ConfigRegistry(check_interval=0.0)
+    reloaded = []
+    registry.add_reload_hook(reloaded.append)
+    assert registry.check(path) is False  # First parse
+    assert registry.check(path) is False
+
+    path.write_text("[DAEMON]\nWAKEUP = events\nENABLED_ORDER_IDS = 1\n")
+    assert registry.check(path) is True
+    assert reloaded == [str(path)]
+    assert registry.get(path)["DAEMON"]["WAKEUP"] == "events"
@@ -0,0 +1,126 @@
+import time
+
+import pytest
+import requests
+from tenacity import wait_none
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from utils.api import connectAPI
+from utils.api.circuitBreaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from utils.custom_exceptions.customize_exceptions import CircuitOpenError
+
+API_URL = "http://incident-api.local/"
+
+
+def response(status):
+    result = requests.Response()
+    result.status_code = status
+    result.url = API_URL
+    result._content = b'{"status": "success"}'
+    return result
+
+
+def connection_refused():
+    return requests.exceptions.ConnectionError(
+        MaxRetryError(None, API_URL, reason=NewConnectionError(None, "Connection refused")))
+
+
+class StubSession:
+    """Answers each POST with the next outcome: a status code or an exception to raise."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.posts = 0
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        self.posts += 1
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return response(outcome)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Installs a stub session and a fresh breaker; returns install(*outcomes) -> session."""
+    http_config = dict(connectAPI.get_http_config(), retry_attempts=3, breaker_failure_threshold=2,
+                       breaker_reset_timeout=0.05)
+    breaker = CircuitBreaker("Incident API", failure_threshold=2, reset_timeout=0.05)
+    monkeypatch.setattr(connectAPI, "get_http_config", lambda: http_config)
+    monkeypatch.setattr(connectAPI, "api_retry_wait", lambda config: wait_none())
+    monkeypatch.setattr(connectAPI, "get_api_circuit_breaker", lambda: breaker)
+
+    def install(*outcomes):
+        session = StubSession(*outcomes)
+        monkeypatch.setattr(connectAPI, "get_http_session", lambda: session)
+        return session
+
+    install.breaker = breaker
+    return install
+
+
+@pytest.mark.parametrize("failure", [connection_refused(), requests.exceptions.ConnectTimeout("connect"), 503, 429])
+def test_failures_before_the_api_acted_are_retried(api, failure):
+    session = api(failure, 200)
+    assert connectAPI.post_json(API_URL, b"{}").status_code == 200
+    assert session.posts == 2
+    assert api.breaker.state == CLOSED
+
+
+def test_retries_stop_after_retry_attempts(api):
+    session = api(connection_refused())
+    with pytest.raises(requests.exceptions.ConnectionError):
+        connectAPI.post_json(API_URL, b"{}")
+    assert session.posts == 3
+
+
+@pytest.mark.parametrize("failure", [
+    requests.exceptions.ReadTimeout("read"),
+    requests.exceptions.ConnectionError(ProtocolError("Connection aborted.")),
+    500, 502, 504
+])
+def test_failures_after_sending_are_not_retried(api, failure):
+    """The incident may already exist, so it is not posted again; the breaker still counts it."""
+    session = api(failure, 200)
+    with pytest.raises(requests.exceptions.RequestException):
+        connectAPI.post_json(API_URL, b"{}")
+    assert session.posts == 1
+    assert api.breaker._failures == 1
+
+
+def test_client_error_is_not_retried_and_does_not_trip_the_breaker(api):
+    session = api(400)
+    for _ in range(3):
+        assert connectAPI.post_json(API_URL, b"{}").status_code == 400
+    assert session.posts == 3
+    assert api.breaker.state == CLOSED
+
+
+def test_breaker_opens_half_opens_and_closes(api):
+    session = api(500)
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.HTTPError):
+            connectAPI.post_json(API_URL, b"{}")
+    assert api.breaker.state == OPEN
+
+    # Open: refused without a request
+    with pytest.raises(CircuitOpenError):
+        connectAPI.post_json(API_URL, b"{}")
+    assert session.posts == 2
+
+    time.sleep(0.06)
+    assert api.breaker.state == HALF_OPEN
+    session.outcomes = [200]
+    assert connectAPI.post_json(API_URL, b"{}").status_code == 200
+    assert api.breaker.state == CLOSED
+
+
+def test_failed_probe_reopens_the_breaker(api):
+    api(500)
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.HTTPError):
+            connectAPI.post_json(API_URL, b"{}")
+    time.sleep(0.06)
+    with pytest.raises(requests.exceptions.HTTPError):
+        connectAPI.post_json(API_URL, b"{}")
+    assert api.breaker.state == OPEN
@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+from utils.database import connectMongoDB
+
+
+class FakeClient:
+    """MongoClient stand-in whose ping blocks until release is set."""
+
+    release = {}
+    pings = {}
+    pinging = threading.Event()
+
+    def __init__(self, uri):
+        self.uri = uri
+        self.admin = self
+
+    def command(self, name):
+        FakeClient.pings[self.uri] = FakeClient.pings.get(self.uri, 0) + 1
+        FakeClient.pinging.set()
+        FakeClient.release[self.uri].wait(5)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_clients(monkeypatch):
+    monkeypatch.setattr(connectMongoDB, "MongoClient", FakeClient)
+    monkeypatch.setattr(connectMongoDB, "_clients", {})
+    FakeClient.release = {"mongodb://slow/": threading.Event(), "mongodb://fast/": threading.Event()}
+    FakeClient.pings = {}
+    FakeClient.pinging = threading.Event()
+    FakeClient.release["mongodb://fast/"].set()
+    yield
+    FakeClient.release["mongodb://slow/"].set()
+
+
+def test_slow_ping_holds_up_only_its_own_uri(fake_clients):
+    slow_callers = [threading.Thread(target=connectMongoDB.get_mongo_client, args=("mongodb://slow/",))
+                    for _ in range(3)]
+    for thread in slow_callers:
+        thread.start()
+    assert FakeClient.pinging.wait(5)
+
+    # Answered while the slow server is still being pinged
+    fast_caller = threading.Thread(target=connectMongoDB.get_mongo_client, args=("mongodb://fast/",))
+    fast_caller.start()
+    fast_caller.join(2)
+    assert not fast_caller.is_alive()
+    assert all(thread.is_alive() for thread in slow_callers)
+
+    FakeClient.release["mongodb://slow/"].set()
+    for thread in slow_callers:
+        thread.join(5)
+    assert FakeClient.pings == {"mongodb://slow/": 1, "mongodb://fast/": 1}
@@ -0,0 +1,144 @@
+import threading
+
+import pymysql
+import pytest
+
+from utils.database import connectSQL
+from utils.database.connectSQL import MySQLConnectionPool
+from utils.database.sqlStatements import get_statement_mode, supports_multi_statements
+
+
+class FakeConnection:
+    def __init__(self, client_flag=0, **kwargs):
+        self.client_flag = client_flag
+        self.healthy = True
+        self.rollbacks = 0
+        self.closed = False
+
+    def ping(self, reconnect=False):
+        if not self.healthy:
+            raise ConnectionError("server has gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def opened():
+    """Connections opened through connect(), in order."""
+    return []
+
+
+def make_pool(opened, **limits):
+    def connect():
+        opened.append(FakeConnection())
+        return opened[-1]
+    return MySQLConnectionPool(connect, **limits)
+
+
+def database_settings(**overrides):
+    settings = {"MYSQL_HOST": "127.0.0.1", "MYSQL_DATABASE": "drs", "MYSQL_USER": "root", "MYSQL_PASSWORD": ""}
+    settings.update(overrides)
+    return {"DATABASE": settings}
+
+
+def checkout(multi_statements=False):
+    connection = connectSQL.get_mysql_connection(multi_statements=multi_statements)
+    supported = supports_multi_statements(connection)
+    connection.close()
+    return supported
+
+
+def test_only_statement_connections_allow_multi_statements(write_config, monkeypatch):
+    monkeypatch.setattr(connectSQL.pymysql, "connect", FakeConnection)
+
+    write_config(database_settings(MYSQL_MULTI_STATEMENTS="true"))
+    assert checkout() is False
+    assert checkout(multi_statements=True) is True
+    assert connectSQL.get_mysql_pool(multi_statements=True) is not connectSQL.get_mysql_pool()
+
+    # Turned off: run_statements callers share the regular pool
+    write_config(database_settings(MYSQL_MULTI_STATEMENTS="false"))
+    connectSQL.get_mysql_config()
+    assert checkout(multi_statements=True) is False
+    assert connectSQL.get_mysql_pool(multi_statements=True) is connectSQL.get_mysql_pool()
+
+
+def test_multi_statements_and_prepared_statements_are_off_by_default(write_config, monkeypatch):
+    monkeypatch.setattr(connectSQL.pymysql, "connect", FakeConnection)
+    write_config(database_settings())
+    assert checkout() is False
+    assert checkout(multi_statements=True) is False
+    assert connectSQL.get_mysql_pool_stats(multi_statements=True) == {}
+    assert get_statement_mode() == "client"
+
+
+def test_released_connection_is_rolled_back_and_reused(opened):
+    pool = make_pool(opened, size=2)
+    first = pool.get_connection()
+    first.close()
+    first.close()  # A second close does not return it twice
+    second = pool.get_connection()
+
+    assert second._connection is opened[0]
+    assert opened[0].rollbacks == 1
+    with pytest.raises(pymysql.err.InterfaceError):
+        first.cursor()  # The released wrapper no longer reaches the reused connection
+    stats = pool.stats()
+    assert (stats["created"], stats["checkouts"], stats["open"], stats["in_use"]) == (1, 2, 1, 1)
+
+
+def test_old_and_unhealthy_connections_are_replaced(opened):
+    pool = make_pool(opened, size=2, max_age=3600)
+    pool.get_connection().close()
+    opened[0].healthy = False
+    pool.get_connection().close()  # Fails its health check on checkout
+    assert opened[0].closed and len(opened) == 2
+
+    pool.resize(max_age=0)
+    connection = pool.get_connection()  # Past max_age on checkout
+    assert opened[1].closed and connection._connection is opened[2]
+    connection.close()  # Past max_age on release
+    assert opened[2].closed
+
+    stats = pool.stats()
+    assert (stats["health_check_failures"], stats["recycled"], stats["open"]) == (1, 2, 0)
+
+
+def test_checkout_waits_for_a_free_connection_then_times_out(opened):
+    pool = make_pool(opened, size=1, timeout=5)
+    held = pool.get_connection()
+    checked_out = []
+    waiter = threading.Thread(target=lambda: checked_out.append(pool.get_connection()))
+    waiter.start()
+    waiter.join(0.1)
+    assert waiter.is_alive()
+
+    held.close()
+    waiter.join(5)
+    assert checked_out[0]._connection is opened[0]
+
+    pool.resize(timeout=0.05)
+    with pytest.raises(TimeoutError):
+        pool.get_connection()
+    stats = pool.stats()
+    assert (stats["timeouts"], stats["created"]) == (1, 1)
+    assert stats["waits"] >= 2
+
+
+def test_failed_connect_frees_its_slot():
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("refused")
+        return FakeConnection()
+
+    pool = MySQLConnectionPool(connect, size=1, timeout=0.05)
+    with pytest.raises(ConnectionError):
+        pool.get_connection()
+    assert pool.get_connection() is not None
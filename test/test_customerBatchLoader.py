@@ -0,0 +1,54 @@
+import sqlite3
+
+import pytest
+
+from orderManipulator.customerBatchLoader import (
+    CustomerDetailsBatchLoader, LatestPaymentBatchLoader, LATEST_PAYMENT_STRATEGIES
+)
+from conftest import ACCOUNTS
+
+UNDATED, PARTLY_DATED = ACCOUNTS[0], ACCOUNTS[1]
+
+
+@pytest.fixture
+def undated_payments(customer_db):
+    """Clears every payment date of UNDATED and one payment date of PARTLY_DATED."""
+    db = sqlite3.connect(customer_db)
+    db.execute("UPDATE debt_payment SET ACCOUNT_PAYMENT_DAT = NULL WHERE AP_ACCOUNT_NUMBER = ?", (UNDATED,))
+    db.execute("UPDATE debt_payment SET ACCOUNT_PAYMENT_DAT = NULL "
+               "WHERE AP_ACCOUNT_NUMBER = ? AND ACCOUNT_PAYMENT_SEQ = 2", (PARTLY_DATED,))
+    db.commit()
+    db.close()
+    return customer_db
+
+
+def latest_payment(path, account):
+    """The row the per-account query (ORDER BY ACCOUNT_PAYMENT_DAT DESC LIMIT 1) returns."""
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    row = db.execute("SELECT * FROM debt_payment WHERE AP_ACCOUNT_NUMBER = ? "
+                     "ORDER BY ACCOUNT_PAYMENT_DAT DESC LIMIT 1", (account,)).fetchone()
+    db.close()
+    return dict(row)
+
+
+@pytest.mark.parametrize("strategy", LATEST_PAYMENT_STRATEGIES)
+def test_strategies_match_the_per_account_query_with_null_dates(undated_payments, strategy):
+    payments = LatestPaymentBatchLoader(strategy=strategy).load(ACCOUNTS)
+
+    # Every undated payment ties for latest; any one of them is the account's payment
+    undated = payments[UNDATED]
+    assert len(undated) == 1 and undated[0]["ACCOUNT_PAYMENT_DAT"] is None
+    assert undated[0]["AP_ACCOUNT_NUMBER"] == UNDATED
+
+    for account in ACCOUNTS[1:]:
+        assert payments[account] == [latest_payment(undated_payments, account)]
+
+
+@pytest.mark.parametrize("loader_class", [CustomerDetailsBatchLoader, LatestPaymentBatchLoader])
+def test_chunked_load_matches_a_single_query(customer_db, loader_class):
+    accounts = ACCOUNTS + ["9999999999"]
+    loaded = loader_class(chunk_size=2).load(accounts)
+    assert loaded == loader_class(chunk_size=len(accounts)).load(accounts)
+    assert list(loaded) == accounts and loaded["9999999999"] == []
+    assert all(loaded[account] for account in ACCOUNTS)
@@ -0,0 +1,78 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from orderManipulator.caseRegistration import IncidentProcessor
+from orderManipulator.customerSnapshotBuilder import build_customer_snapshots
+
+SECTIONS = ("Contact_Details", "Product_Details", "Customer_Details", "Account_Details")
+
+
+def customer_row(account, asset_id, **values):
+    row = {
+        "ACCOUNT_NUM": account, "LOAD_DATE": "2024-01-05 10:00:00", "TECNICAL_CONTACT_EMAIL": "ops@example.com",
+        "MOBILE_CONTACT": "0711111111", "WORK_CONTACT": None, "CONTACT_PERSON": "Example Customer",
+        "ASSET_ADDRESS": "1 Main Street", "ZIP_CODE": "10100", "NIC": Decimal("851234567"),
+        "CUSTOMER_TYPE_ID": Decimal("2"), "CUSTOMER_TYPE": "Individual",
+        "ACCOUNT_EFFECTIVE_DTM_BSS": datetime(2019, 6, 1, 8, 30, 15, 250000), "ACCOUNT_STATUS_BSS": "Active",
+        "CREDIT_CLASS_ID": Decimal("3"), "CREDIT_CLASS_NAME": "Gold", "BILLING_CENTER_NAME": "Colombo",
+        "CUSTOMER_SEGMENT_ID": Decimal("4.50"), "EMAIL": None, "ASSET_ID": asset_id,
+        "PROMOTION_INTEG_ID": "P-1", "CUSTOMER_REF": "C-1", "BSS_PRODUCT_SEQ": Decimal("7"),
+        "PRODUCT_NAME": "Fibre", "ASSET_STATUS": "Active", "CUSTOMER_TYPE_CAT": "Retail",
+        "OSS_SERVICE_ABBREVIATION": "FTTH", "CITY": "Colombo", "PROVINCE": "Western"
+    }
+    row.update(values)
+    return row
+
+
+ROWS_BY_ACCOUNT = {
+    # 1, 1.0 and True are one product to the per-row set; 0 and None are no product
+    "0000000001": [
+        customer_row("0000000001", 1),
+        customer_row("0000000001", 1.0, TECNICAL_CONTACT_EMAIL="not-an-email", LOAD_DATE=date(2024, 2, 1)),
+        customer_row("0000000001", True, WORK_CONTACT="0112345678", BSS_PRODUCT_SEQ=8),
+        customer_row("0000000001", 2.5, LOAD_DATE=datetime(2024, 3, 1, 9, 0, 0, 999999),
+                     ACCOUNT_EFFECTIVE_DTM_BSS="2020-01-01 00:00:00"),
+        customer_row("0000000001", 0, MOBILE_CONTACT="0722222222", ACCOUNT_EFFECTIVE_DTM_BSS=date(2021, 5, 4)),
+        customer_row("0000000001", None, LOAD_DATE=None, ACCOUNT_EFFECTIVE_DTM_BSS=None),
+    ],
+    # The first type seen is the one kept
+    "0000000002": [
+        customer_row("0000000002", True, CUSTOMER_TYPE_ID=1, NIC="851234567V", LOAD_DATE=date(2024, 1, 1)),
+        customer_row("0000000002", 1, MOBILE_CONTACT="0711111111", TECNICAL_CONTACT_EMAIL="ops@example.com"),
+        customer_row("0000000002", "A-1", TECNICAL_CONTACT_EMAIL=""),
+        customer_row("0000000002", 2.0),
+        customer_row("0000000002", 2),
+    ],
+    "0000000003": [customer_row("0000000003", 5, CUSTOMER_TYPE_ID=Decimal("1.0"), CREDIT_CLASS_ID=4.0)],
+    "0000000004": [],
+}
+
+
+def typed(value):
+    """value with every scalar paired with its type, so 1, 1.0 and True do not compare equal."""
+    if isinstance(value, dict):
+        return {key: typed(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [typed(item) for item in value]
+    return type(value).__name__, value
+
+
+def per_row_sections(account, rows):
+    processor = IncidentProcessor(account, 1, None)
+    processor.apply_customer_rows(rows)
+    return {section: processor.mongo_data[section] for section in SECTIONS}
+
+
+@pytest.mark.parametrize("account", [account for account, rows in ROWS_BY_ACCOUNT.items() if rows])
+def test_vectorized_sections_match_the_per_row_builder(account):
+    snapshots = build_customer_snapshots(ROWS_BY_ACCOUNT)
+    expected = per_row_sections(account, ROWS_BY_ACCOUNT[account])
+
+    assert typed(snapshots[account]) == typed(expected)
+    assert list(snapshots[account]) == list(SECTIONS)
+
+
+def test_accounts_without_rows_get_no_snapshot():
+    assert "0000000004" not in build_customer_snapshots(ROWS_BY_ACCOUNT)
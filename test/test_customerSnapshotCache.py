@@ -0,0 +1,114 @@
+from benchmarks.localServices import InMemoryCollection, build_open_orders
+from orderManipulator import customerSnapshotCache
+from orderManipulator.caseRegistration import IncidentProcessor
+from orderManipulator.customerBatchLoader import CustomerDetailsBatchLoader
+from orderManipulator.customerSnapshotCache import (
+    CustomerSnapshotCache, get_customer_snapshot_cache, reset_customer_snapshot_cache
+)
+from conftest import ACCOUNTS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def snapshot(name):
+    return {"Contact_Details": [], "Product_Details": [], "Customer_Details": {"Customer_Name": name},
+            "Account_Details": {}}
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = CustomerSnapshotCache(maxsize=10, ttl=30, timer=clock)
+    cache.put("1", snapshot("first"))
+    clock.now = 29.9
+    assert cache.get("1") == snapshot("first")
+    clock.now = 30.0
+    assert cache.get("1") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "invalidations": 0, "size": 0, "maxsize": 10, "ttl": 30}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = CustomerSnapshotCache(maxsize=2, ttl=60)
+    cache.put("1", snapshot("first"))
+    cache.put("2", snapshot("second"))
+    cache.get("1")
+    cache.put("3", snapshot("third"))
+    assert set(cache.get_many(["1", "2", "3"])) == {"1", "3"}
+
+
+def test_invalidate_and_clear():
+    cache = CustomerSnapshotCache(maxsize=10, ttl=60)
+    cache.put_many({"1": snapshot("first"), "2": snapshot("second"), "3": snapshot("third")})
+    assert cache.invalidate(1) is True
+    assert cache.invalidate("1") is False
+    assert cache.get("1") is None
+    cache.clear()
+    assert cache.get_many(["2", "3"]) == {}
+    assert cache.stats()["invalidations"] == 3
+
+
+def test_accounts_without_customer_details_are_not_cached():
+    cache = CustomerSnapshotCache(maxsize=10, ttl=60)
+    cache.put("1", {"Contact_Details": [], "Product_Details": [], "Customer_Details": {}, "Account_Details": {}})
+    cache.put("2", None)
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_is_off_when_size_or_ttl_is_zero(monkeypatch):
+    settings = {"customer_cache_size": 0, "customer_cache_ttl": 300.0}
+    monkeypatch.setattr(customerSnapshotCache, "get_processing_config", lambda: dict(settings))
+    reset_customer_snapshot_cache()
+    assert get_customer_snapshot_cache() is None
+    settings.update(customer_cache_size=5, customer_cache_ttl=0)
+    assert get_customer_snapshot_cache() is None
+    settings.update(customer_cache_ttl=10)
+    assert get_customer_snapshot_cache().stats()["maxsize"] == 5
+    reset_customer_snapshot_cache()
+
+
+def test_incidents_do_not_share_snapshot_records():
+    shared = snapshot("first")
+    shared["Contact_Details"].append({"Contact_Type": "email", "Contact": "first@example.com"})
+    shared["Product_Details"].append({"Product_Id": "P1", "Product_Status": "OK"})
+    first, second = (IncidentProcessor("1", incident_id, None) for incident_id in (1, 2))
+    for processor in (first, second):
+        processor.apply_customer_snapshot(shared)
+
+    first.mongo_data["Contact_Details"][0]["Contact"] = "changed@example.com"
+    first.mongo_data["Product_Details"][0]["Product_Status"] = "Changed"
+    assert second.mongo_data["Contact_Details"] == shared["Contact_Details"]
+    assert shared["Contact_Details"][0]["Contact"] == "first@example.com"
+    assert shared["Product_Details"][0]["Product_Status"] == "OK"
+
+
+def process_batch(order_processor_factory, count):
+    collection = InMemoryCollection(build_open_orders(count, ACCOUNTS))
+    processor = order_processor_factory(collection)
+    return processor.process_option_1(processor.get_open_orders(order_id=1))
+
+
+def test_cached_accounts_skip_the_customer_query(order_processor_factory, api_posts, monkeypatch):
+    batch_loads = []
+    load = CustomerDetailsBatchLoader.load
+
+    def record_load(loader, account_numbers):
+        batch_loads.append(list(account_numbers))
+        return load(loader, account_numbers)
+
+    monkeypatch.setattr(CustomerDetailsBatchLoader, "load", record_load)
+    assert process_batch(order_processor_factory, 2) == (2, 0)
+    assert batch_loads == [ACCOUNTS[:2]]
+
+    # Only the accounts that are not cached yet are read
+    assert process_batch(order_processor_factory, 3) == (3, 0)
+    assert batch_loads[1] == [ACCOUNTS[2]]
+
+    get_customer_snapshot_cache().invalidate(ACCOUNTS[0])
+    assert process_batch(order_processor_factory, 3) == (3, 0)
+    assert batch_loads[2] == [ACCOUNTS[0]]
+    assert all(payload["Customer_Details"] for payload in api_posts)
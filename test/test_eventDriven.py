@@ -0,0 +1,55 @@
+from benchmarks.localServices import InMemoryCollection, build_open_orders
+from conftest import ACCOUNTS
+
+
+class IdleChangeStream:
+    """Change stream that never delivers an event; stops the loop after max_polls polls."""
+
+    def __init__(self, max_polls, stop_when=lambda: False):
+        self.max_polls = max_polls
+        self.stop_when = stop_when
+        self.polls = 0
+        self.alive = True
+        self.resume_token = {"_data": "token"}
+
+    def try_next(self):
+        self.polls += 1
+        if self.polls > self.max_polls or self.stop_when():
+            raise KeyboardInterrupt
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class WatchableCollection(InMemoryCollection):
+    def __init__(self, documents, stream):
+        super().__init__(documents)
+        self.stream = stream
+
+    def watch(self, *args, **kwargs):
+        return self.stream
+
+
+def test_failed_request_is_retried_without_a_new_event(order_processor_factory, api_posts):
+    stream = IdleChangeStream(max_polls=500)
+    collection = WatchableCollection(build_open_orders(1, ACCOUNTS), stream)
+    stream.stop_when = lambda: collection.status_counts() == {"Completed": 1}
+    processor = order_processor_factory(
+        collection,
+        mongo={"work_claims": False, "status_bulk_size": 1, "poll_interval_max": 0.0}
+    )
+    # The first attempt fails at the API; the request stays Open and no change event follows
+    api_posts.fail_incidents = {1}
+
+    def recover(payload):
+        api_posts.fail_incidents = set()
+
+    api_posts.hook = recover
+    processor.run_event_driven()
+
+    assert [payload["Incident_Id"] for payload in api_posts] == [1, 1]
+    assert collection.status_counts() == {"Completed": 1}
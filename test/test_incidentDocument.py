@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from orderManipulator.incidentDocument import (
+    IncidentDocument, INCIDENT_TEMPLATE, SLOT_FIELDS, TIMESTAMP_FIELDS
+)
+
+CREATED = "2024-05-01T12:30:00.000Z"
+
+
+def decode_ordered(payload):
+    """Decodes objects as lists of (key, value) pairs, so key order is compared too."""
+    return json.loads(payload, object_pairs_hook=list)
+
+
+def test_new_document_has_the_template_fields_in_order():
+    document = IncidentDocument(7, "0000000007", created=CREATED)
+    plain = document.as_dict()
+
+    assert list(document) == list(INCIDENT_TEMPLATE)
+    assert len(document) == len(INCIDENT_TEMPLATE)
+    assert (plain["Incident_Id"], plain["Account_Num"]) == (7, "0000000007")
+    assert all(plain[key] == CREATED for key in TIMESTAMP_FIELDS)
+    for key, value in INCIDENT_TEMPLATE.items():
+        if key not in SLOT_FIELDS and key not in TIMESTAMP_FIELDS:
+            assert plain[key] == value
+    assert document._overrides is None  # as_dict copies without keeping the copies
+
+
+def test_template_values_are_copied_before_they_can_change():
+    first = IncidentDocument(1, "0000000001", created=CREATED)
+    second = IncidentDocument(2, "0000000002", created=CREATED)
+    first["Marketing_Details"][0]["Informed_To"] = "Collections"
+    first["DRC"].append({"drc_id": 1})
+    first.as_dict()["RO"].append({"ro_id": 1})
+
+    assert first["Marketing_Details"][0]["Informed_To"] == "Collections"
+    assert first["RO"] == []
+    assert second["Marketing_Details"][0]["Informed_To"] == ""
+    assert second["DRC"] == []
+    assert INCIDENT_TEMPLATE["Marketing_Details"][0]["Informed_To"] == ""
+    with pytest.raises(TypeError):
+        INCIDENT_TEMPLATE["Remark"] = "changed"
+
+
+def test_slot_fields_and_extra_keys():
+    document = IncidentDocument(3, "0000000003", created=CREATED)
+    document["Customer_Details"] = {"Nic": "851234567V"}
+    document["Last_Actions"].append({"Payment_Seq": 1})
+    document["Extra_Field"] = "kept"
+
+    assert document.customer_details == {"Nic": "851234567V"}
+    assert document.last_actions == [{"Payment_Seq": 1}]
+    assert list(document)[-1] == "Extra_Field"
+    assert document["Extra_Field"] == "kept"
+    with pytest.raises(TypeError):
+        del document["Remark"]
+
+
+@pytest.mark.parametrize("override", [None, ("Remark", "changed"), ("Extra_Field", 1)])
+def test_to_json_is_the_plain_document_in_template_order(override):
+    document = IncidentDocument(4, "0000000004", created=CREATED)
+    document["Contact_Details"].append({"Contact_Type": "mobile", "Contact": "0711111111"})
+    document["Customer_Details"] = {"Customer_Name": "Example", "Nic": 851234567}
+    if override is not None:
+        document[override[0]] = override[1]
+
+    expected = json.dumps(dict(document.as_dict(), Customer_Details={"Customer_Name": "Example",
+                                                                     "Nic": "851234567"}))
+    assert decode_ordered(document.to_json()) == decode_ordered(expected)
@@ -0,0 +1,81 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from orderManipulator import incidentEncoder
+from orderManipulator.incidentDocument import IncidentDocument
+
+CREATED = "2024-05-01T12:30:00.000Z"
+
+
+def baseline_json(document):
+    """The payload the previous IncidentProcessor.format_json_object produced."""
+    def serialize(obj):
+        if isinstance(obj, (datetime, date)):
+            if isinstance(obj, date) and not isinstance(obj, datetime):
+                obj = datetime.combine(obj, datetime.min.time())
+            return obj.replace(microsecond=0).isoformat() + ".000Z"
+        if isinstance(obj, Decimal):
+            return float(obj)
+        if obj is None:
+            return ""
+        raise TypeError(f"Type {type(obj)} not serializable")
+
+    json_data = json.loads(json.dumps(document, default=serialize))
+    json_data["Customer_Details"]["Nic"] = str(json_data["Customer_Details"].get("Nic", ""))
+    json_data["Account_Details"]["Email_Address"] = str(json_data["Account_Details"].get("Email_Address", ""))
+    return json.dumps(json_data, indent=4)
+
+
+def populated_document(nic, email):
+    document = IncidentDocument(42, "0000000042", created=CREATED)
+    document["Contact_Details"].append({"Contact_Type": "mobile", "Contact": "0711111111",
+                                        "Create_Dtm": CREATED, "Create_By": "drs_admin"})
+    document["Product_Details"].append({"Product_Id": 1.0, "Product_Seq": 7, "Product_Name": "Fibre é中",
+                                        "Effective_Dtm": date(2020, 1, 1)})
+    document["Customer_Details"] = {"Customer_Name": "Example \"Customer\"", "Nic": nic,
+                                    "Customer_Type_Id": 2, "Zip_Code": None}
+    document["Account_Details"] = {"Email_Address": email, "Credit_Class_Id": 3,
+                                   "Customer_Segment": Decimal("4.50")}
+    document["Last_Actions"].append({"Payment_Seq": 9, "Payment_Amount": Decimal("1250.75"),
+                                     "Payment_Date": datetime(2024, 4, 30, 8, 15, 59, 123456)})
+    return document
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(incidentEncoder, "orjson", None)
+    return request.param
+
+
+@pytest.mark.parametrize("nic, email", [
+    ("851234567V", "ops@example.com"),
+    (851234567, None),
+    (Decimal("851234567"), datetime(2024, 1, 2, 3, 4, 5)),
+])
+def test_to_json_matches_the_baseline_payload(backend, nic, email):
+    document = populated_document(nic, email)
+    expected = baseline_json(document.as_dict())
+
+    encoded = document.to_json()
+    assert json.loads(encoded) == json.loads(expected)
+    assert list(json.loads(encoded)) == list(json.loads(expected))
+    assert b"\n" not in encoded
+
+
+def test_to_json_matches_the_baseline_payload_with_template_overrides(backend):
+    document = populated_document("851234567V", "ops@example.com")
+    document["Arrears"] = Decimal("1500.25")
+    document["Marketing_Details"][0]["Informed_To"] = "Collections"
+    document["Remark"] = None
+
+    assert json.loads(document.to_json()) == json.loads(baseline_json(document.as_dict()))
+
+
+def test_pretty_encoding_matches_the_baseline_output(backend):
+    document = populated_document(851234567, "ops@example.com")
+    expected = baseline_json(document.as_dict()).encode("utf-8")
+    assert incidentEncoder.encode_incident(document.as_dict(), pretty=True) == expected
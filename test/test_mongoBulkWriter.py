@@ -0,0 +1,102 @@
+import time
+
+from pymongo.errors import BulkWriteError
+
+from benchmarks.localServices import InMemoryCollection, build_open_orders
+from utils.database.mongoBulkWriter import BulkUpdateBuffer
+from conftest import ACCOUNTS
+
+
+class RecordingCollection(InMemoryCollection):
+    """Records the size of every bulk_write; fail_indexes are reported as write errors."""
+
+    def __init__(self, documents=()):
+        self.batches = []
+        self.fail_indexes = set()
+        self.error = None
+        super().__init__(documents)
+
+    def bulk_write(self, operations, ordered=True, **kwargs):
+        self.batches.append(len(operations))
+        if self.error is not None:
+            raise self.error
+        if not self.fail_indexes:
+            return super().bulk_write(operations, ordered=ordered)
+        modified = 0
+        for index, operation in enumerate(operations):
+            if index not in self.fail_indexes:
+                modified += self.update_one(operation._filter, operation._doc).modified_count
+        raise BulkWriteError({"writeErrors": [{"index": index, "errmsg": "failed"} for index in self.fail_indexes],
+                              "nModified": modified})
+
+
+def complete(buffer, request_id, results):
+    buffer.add({"_id": request_id}, {"$set": {"request_status": "Completed"}},
+               verify_filter={"_id": request_id, "request_status": "Completed"},
+               callback=lambda modified: results.append((request_id, modified)))
+
+
+def test_batch_is_written_once_it_is_full():
+    collection = RecordingCollection(build_open_orders(5, ACCOUNTS))
+    buffer = BulkUpdateBuffer(collection, max_batch=2, max_delay=60)
+    results = []
+    for request_id in (1, 2, 3):
+        complete(buffer, request_id, results)
+
+    assert collection.batches == [2]
+    assert results == [(1, True), (2, True)]
+    assert buffer.flush() == 0
+    assert collection.batches == [2, 1]
+    assert collection.status_counts() == {"Completed": 3, "Open": 2}
+
+
+def test_batch_is_written_once_its_oldest_update_is_due():
+    collection = RecordingCollection(build_open_orders(2, ACCOUNTS))
+    buffer = BulkUpdateBuffer(collection, max_batch=100, max_delay=0.05)
+    results = []
+    complete(buffer, 1, results)
+    buffer.flush_if_due()
+    assert collection.batches == []
+
+    time.sleep(0.06)
+    buffer.flush_if_due()
+    assert collection.batches == [1] and results == [(1, True)]
+    buffer.flush_if_due()
+    assert collection.batches == [1]
+
+
+def test_partly_failed_batch_reports_each_update():
+    collection = RecordingCollection(build_open_orders(3, ACCOUNTS))
+    collection.fail_indexes = {1}
+    buffer = BulkUpdateBuffer(collection, max_batch=100)
+    results = []
+    # Request 2 gets a write error; request 99 does not exist, so nothing is modified
+    for request_id in (1, 2, 99):
+        complete(buffer, request_id, results)
+
+    assert buffer.flush() == 2
+    assert results == [(1, True), (2, False), (99, False)]
+    assert collection.status_counts() == {"Completed": 1, "Open": 2}
+
+
+def test_failed_bulk_write_fails_every_update():
+    collection = RecordingCollection(build_open_orders(2, ACCOUNTS))
+    collection.error = ConnectionError("mongod is down")
+    buffer = BulkUpdateBuffer(collection, max_batch=100)
+    results = []
+    complete(buffer, 1, results)
+    complete(buffer, 2, results)
+
+    assert buffer.flush() == 2
+    assert results == [(1, False), (2, False)]
+    assert collection.status_counts() == {"Open": 2}
+
+
+def test_processor_writes_completions_in_bulk(order_processor_factory, api_posts):
+    collection = RecordingCollection(build_open_orders(7, ACCOUNTS))
+    processor = order_processor_factory(collection, mongo={"status_bulk_size": 3, "status_flush_interval": 60})
+    assert processor.process_option_1(processor.get_open_orders(order_id=1)) == (7, 0)
+
+    assert collection.batches == [3, 3, 1]
+    assert collection.status_counts() == {"Completed": 7}
+    assert processor.completion_failures == 0
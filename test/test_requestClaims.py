@@ -0,0 +1,76 @@
+import time
+
+from benchmarks.localServices import InMemoryCollection, build_open_orders
+from orderManipulator.requestClaims import RequestClaims, IN_PROGRESS
+from conftest import ACCOUNTS
+
+
+def test_renew_keeps_only_requests_still_held():
+    collection = InMemoryCollection(build_open_orders(4, ACCOUNTS))
+    worker_a = RequestClaims(collection, owner="worker-a", lease_seconds=60)
+    worker_b = RequestClaims(collection, owner="worker-b", lease_seconds=60)
+    assert len(worker_a.claim([1, 2, 3, 4])) == 4
+
+    # Requests 3 and 4 outlive worker a's lease and are reclaimed by worker b
+    collection.update_many({"_id": {"$in": [3, 4]}}, {"$set": {"lease_expires_at": time.time() - 1}})
+    assert [doc["_id"] for doc in worker_b.claim([3, 4])] == [3, 4]
+
+    held, lease_expires_at = worker_a.renew([1, 2, 3, 4])
+    assert held == {1, 2}
+    assert lease_expires_at > time.time() + 59
+    assert collection.find_one({"_id": 1})["lease_expires_at"] == lease_expires_at
+    assert collection.find_one({"_id": 3})["claimed_by"] == "worker-b"
+
+
+def test_lease_expiring_mid_batch_is_not_sent_twice(order_processor_factory, api_posts):
+    collection = InMemoryCollection(build_open_orders(6, ACCOUNTS))
+    processor = order_processor_factory(
+        collection,
+        mongo={"work_claims": True, "claim_lease_seconds": 60, "status_bulk_size": 1},
+        processing={"worker_threads": 1, "max_in_flight": 2}
+    )
+    other_worker = RequestClaims(collection, owner="worker-b", lease_seconds=60)
+
+    def expire_after_first_group(payload):
+        # The batch has run past its lease: the remaining leases lapse and worker b reclaims 5 and 6
+        if len(api_posts) == 2:
+            collection.update_many({"request_status": IN_PROGRESS},
+                                   {"$set": {"lease_expires_at": time.time() - 1}})
+            assert [doc["_id"] for doc in other_worker.claim([5, 6])] == [5, 6]
+
+    api_posts.hook = expire_after_first_group
+    processed, errors = processor.process_option_1(processor.get_open_orders(order_id=1))
+
+    assert sorted(payload["Incident_Id"] for payload in api_posts) == [1, 2, 3, 4]
+    assert (processed, errors) == (4, 0)
+    for request_id in (5, 6):
+        document = collection.find_one({"_id": request_id})
+        assert document["request_status"] == IN_PROGRESS
+        assert document["claimed_by"] == "worker-b"
+    assert collection.status_counts() == {"Completed": 4, IN_PROGRESS: 2}
+
+
+def test_request_whose_lease_ran_out_is_skipped(order_processor_factory, api_posts):
+    collection = InMemoryCollection(build_open_orders(1, ACCOUNTS))
+    processor = order_processor_factory(collection, mongo={"work_claims": True})
+    document = collection.find_one({"_id": 1})
+
+    assert processor.process_option_1_document(document, None, lease_expires_at=time.time() - 1) is None
+    assert api_posts == []
+
+
+def test_workers_reading_the_same_open_set_send_each_incident_once(order_processor_factory, api_posts):
+    collection = InMemoryCollection(build_open_orders(6, ACCOUNTS))
+    settings = {"work_claims": True, "status_bulk_size": 1}
+    worker_a = order_processor_factory(collection, mongo=settings)
+    worker_b = order_processor_factory(collection, mongo=settings)
+
+    # Both read the Open set before either has claimed anything
+    orders_a = list(worker_a.get_open_orders(order_id=1))
+    orders_b = list(worker_b.get_open_orders(order_id=1))
+    assert len(orders_a) == len(orders_b) == 6
+    assert worker_a.process_option_1(orders_a) == (6, 0)
+    assert worker_b.process_option_1(orders_b) == (0, 0)
+
+    assert sorted(payload["Incident_Id"] for payload in api_posts) == [1, 2, 3, 4, 5, 6]
+    assert collection.status_counts() == {"Completed": 6}
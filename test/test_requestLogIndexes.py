@@ -0,0 +1,87 @@
+import pytest
+from pymongo.errors import OperationFailure
+
+from benchmarks.localServices import InMemoryCollection, build_open_orders
+from orderManipulator.requestLogIndexes import (
+    REQUEST_LOG_INDEXES, ensure_request_log_indexes, migrate_account_field, count_legacy_account_documents
+)
+from conftest import ACCOUNTS
+
+
+class QueryRecorder(InMemoryCollection):
+    """Records update filters and created indexes; index names in conflicts fail to create."""
+
+    def __init__(self, documents=(), conflicts=()):
+        self.update_filters = []
+        self.conflicts = set(conflicts)
+        super().__init__(documents)
+
+    def update_one(self, query, update, **kwargs):
+        self.update_filters.append(query)
+        return super().update_one(query, update, **kwargs)
+
+    def create_index(self, keys, **kwargs):
+        if kwargs.get("name") in self.conflicts:
+            raise OperationFailure("Index with name already exists with different options", code=85)
+        return kwargs["name"]
+
+
+def leading_fields():
+    return {tuple(field for field, _ in keys[:2]) for keys, _ in REQUEST_LOG_INDEXES}
+
+
+def uses_index_prefix(query, fields):
+    """True if fields lead an index and every $or branch of the query filters on them."""
+    branches = [dict(query, **branch) for branch in query.get("$or", [{}])]
+    return any(fields[:len(lead)] == lead[:len(fields)] for lead in leading_fields()) and \
+        all(field in branch for branch in branches for field in fields)
+
+
+def legacy_orders(count):
+    documents = build_open_orders(count, ACCOUNTS)
+    for document in documents[::2]:
+        document["account_num"] = document.pop("account_number")
+    return documents
+
+
+def test_conflicting_index_is_skipped():
+    collection = QueryRecorder(conflicts={"account_number_1_parameters.incident_id_1"})
+    names = ensure_request_log_indexes(collection)
+    assert names == ["request_status_1_order_id_1_shard_key_1", "account_num_1_parameters.incident_id_1"]
+
+
+def test_completion_filters_name_one_account_field(order_processor_factory, api_posts):
+    collection = QueryRecorder(legacy_orders(4))
+    processor = order_processor_factory(collection, mongo={"status_bulk_size": 1})
+    assert processor.process_option_1(processor.get_open_orders(order_id=1)) == (4, 0)
+
+    assert collection.status_counts() == {"Completed": 4}
+    account_fields = [[key for key in query if key.startswith("account")] for query in collection.update_filters]
+    assert account_fields == [["account_num"], ["account_number"], ["account_num"], ["account_number"]]
+    for query, fields in zip(collection.update_filters, account_fields):
+        assert "$or" not in query
+        assert uses_index_prefix(query, (fields[0], "parameters.incident_id"))
+
+
+@pytest.mark.parametrize("work_claims", [False, True])
+def test_open_orders_filter_leads_with_the_status_index(order_processor_factory, work_claims):
+    processor = order_processor_factory(InMemoryCollection([]), mongo={"work_claims": work_claims})
+    assert uses_index_prefix(processor.build_open_orders_filter(order_id=1), ("request_status", "order_id"))
+    assert uses_index_prefix(processor.build_open_orders_filter(), ("request_status",))
+
+
+def test_account_field_migration_is_resumable():
+    documents = legacy_orders(7)
+    documents[0]["account_number"] = "kept"  # Both fields: the existing account_number wins
+    collection = InMemoryCollection(documents)
+    assert count_legacy_account_documents(collection) == 4
+
+    assert migrate_account_field(collection, batch_size=2, max_batches=1) == 2
+    assert count_legacy_account_documents(collection) == 2
+    assert migrate_account_field(collection, batch_size=2) == 2
+    assert migrate_account_field(collection, batch_size=2) == 0
+
+    migrated = {document["_id"]: document for document in collection.find()}
+    assert all("account_num" not in document for document in migrated.values())
+    assert migrated[1]["account_number"] == "kept"
+    assert migrated[3]["account_number"] == ACCOUNTS[2]
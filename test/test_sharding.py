@@ -0,0 +1,81 @@
+from benchmarks.localServices import InMemoryCollection, build_open_orders
+from orderManipulator.OrderMani import shard_of
+from conftest import ACCOUNTS
+
+SHARD_COUNT = 3
+
+
+class ShardView:
+    """Forwards to a shared collection and records the documents each find returns."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.unkeyed_reads = []
+        self.reads = []
+
+    def find(self, query=None, projection=None, **kwargs):
+        documents = list(self.collection.find(query, projection, **kwargs))
+        if (query or {}).get("shard_key", "") is None:
+            self.unkeyed_reads.extend(documents)
+        else:
+            self.reads.extend(documents)
+        return self.collection.find(query, projection, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+
+def make_shards(order_processor_factory, collection, **mongo):
+    views = [ShardView(collection) for _ in range(SHARD_COUNT)]
+    shards = [
+        order_processor_factory(view, mongo={"status_bulk_size": 1, **mongo},
+                                shard_index=index, shard_count=SHARD_COUNT)
+        for index, view in enumerate(views)
+    ]
+    return views, shards
+
+
+def test_shards_read_only_their_own_requests(order_processor_factory, api_posts):
+    collection = InMemoryCollection(build_open_orders(30, ACCOUNTS))
+    views, shards = make_shards(order_processor_factory, collection)
+
+    for shard in shards:
+        shard.dispatch_open_orders()
+
+    assert collection.status_counts() == {"Completed": 30}
+    assert sorted(payload["Incident_Id"] for payload in api_posts) == list(range(1, 31))
+    for index, view in enumerate(views):
+        assert view.reads, f"shard {index} read nothing"
+        assert all(shard_of(doc["account_number"], SHARD_COUNT) == index
+                   for doc in view.reads if "account_number" in doc)
+    # Only the first shard found requests without a shard_key; it stored them for everyone
+    assert len(views[0].unkeyed_reads) == 30
+    assert views[1].unkeyed_reads == views[2].unkeyed_reads == []
+    assert all(doc["shard_key"] % SHARD_COUNT == shard_of(doc["account_number"], SHARD_COUNT)
+               for doc in collection.find())
+
+
+def test_has_open_orders_ignores_other_shards_requests(order_processor_factory, api_posts):
+    collection = InMemoryCollection(build_open_orders(30, ACCOUNTS))
+    views, shards = make_shards(order_processor_factory, collection)
+    shards[0].assign_shard_keys()
+    assert all(shard.has_open_orders(order_id=1) for shard in shards)
+
+    shards[0].process_option_1(shards[0].get_open_orders(order_id=1))
+
+    assert not shards[0].has_open_orders(order_id=1)
+    assert shards[1].has_open_orders(order_id=1) and shards[2].has_open_orders(order_id=1)
+
+
+def test_expired_claims_from_before_sharding_are_picked_up(order_processor_factory, api_posts):
+    documents = build_open_orders(6, ACCOUNTS)
+    for doc in documents[:3]:
+        # Claimed by a worker that stopped before shard keys were assigned
+        doc.update(request_status="In_Progress", claimed_by="stopped-worker", lease_expires_at=0.0)
+    collection = InMemoryCollection(documents)
+    views, shards = make_shards(order_processor_factory, collection, work_claims=True)
+
+    for shard in shards:
+        shard.dispatch_open_orders()
+
+    assert collection.status_counts() == {"Completed": 6}
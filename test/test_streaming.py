@@ -0,0 +1,91 @@
+import pymysql
+
+from benchmarks.localServices import InMemoryCollection, SQLiteMySQLConnection, build_open_orders
+from orderManipulator.caseDataAccess import CUSTOMER_DETAILS_STATEMENT, fetch_case_data
+from orderManipulator.customerBatchLoader import CustomerDetailsBatchLoader
+from orderManipulator.customerSnapshotCache import get_customer_snapshot_cache
+from orderManipulator.incidentDocument import TIMESTAMP_FIELDS
+from utils.database.sqlStatements import stream_rows
+from conftest import ACCOUNTS
+
+ROWS_PER_ACCOUNT = 3  # create_customer_database default
+
+
+class CursorRecorder:
+    """Records the cursor class of every cursor opened on SQLiteMySQLConnection."""
+
+    def __init__(self, monkeypatch):
+        self.classes = []
+        cursor = SQLiteMySQLConnection.cursor
+
+        def record(connection, cursor_class=None):
+            self.classes.append(cursor_class)
+            return cursor(connection, cursor_class)
+
+        monkeypatch.setattr(SQLiteMySQLConnection, "cursor", record)
+
+
+def test_stream_rows_fetches_in_chunks_through_one_view(customer_db):
+    connection = SQLiteMySQLConnection(customer_db)
+    expected = connection.cursor(pymysql.cursors.DictCursor)
+    expected.execute(CUSTOMER_DETAILS_STATEMENT.sql, (ACCOUNTS[0],))
+    expected = expected.fetchall()
+
+    cursor = connection.cursor(pymysql.cursors.SSCursor)
+    fetches = []
+    fetchmany = cursor.fetchmany
+
+    def record_fetch(size):
+        fetches.append(fetchmany(size))
+        return fetches[-1]
+
+    cursor.fetchmany = record_fetch
+    views = []
+    rows = []
+    for view in stream_rows(cursor, CUSTOMER_DETAILS_STATEMENT, (ACCOUNTS[0],), fetch_size=2):
+        views.append(view)
+        rows.append({column: view[column] for column in view.keys()})
+    connection.close()
+
+    assert rows == expected
+    assert [len(fetched) for fetched in fetches] == [2, 1, 0]
+    assert all(view is views[0] for view in views)
+
+
+def test_accounts_over_the_row_limit_are_left_out_of_the_batch(customer_db):
+    assert CustomerDetailsBatchLoader(row_limit=ROWS_PER_ACCOUNT - 1).load(ACCOUNTS[:2]) == {
+        ACCOUNTS[0]: None, ACCOUNTS[1]: None
+    }
+    loaded = CustomerDetailsBatchLoader(row_limit=ROWS_PER_ACCOUNT).load(ACCOUNTS[:2])
+    assert [len(rows) for rows in loaded.values()] == [ROWS_PER_ACCOUNT] * 2
+
+
+def test_per_incident_read_flags_an_account_over_the_limit(customer_db):
+    case_data = fetch_case_data(ACCOUNTS[0], customer_row_limit=ROWS_PER_ACCOUNT - 1)
+    assert case_data.customer_overflow and case_data.customer_rows is None
+    assert len(case_data.payment_rows) == 1
+
+    case_data = fetch_case_data(ACCOUNTS[0], customer_row_limit=ROWS_PER_ACCOUNT)
+    assert not case_data.customer_overflow and len(case_data.customer_rows) == ROWS_PER_ACCOUNT
+
+
+def run_incidents(order_processor_factory, api_posts, threshold):
+    api_posts.clear()
+    collection = InMemoryCollection(build_open_orders(len(ACCOUNTS), ACCOUNTS))
+    processor = order_processor_factory(collection, processing={"stream_row_threshold": threshold})
+    assert processor.process_option_1(processor.get_open_orders(order_id=1)) == (len(ACCOUNTS), 0)
+    return sorted(({key: value for key, value in payload.items() if key not in TIMESTAMP_FIELDS}
+                   for payload in api_posts), key=lambda payload: payload["Incident_Id"])
+
+
+def test_streamed_incidents_match_buffered_ones(order_processor_factory, api_posts, monkeypatch):
+    buffered = run_incidents(order_processor_factory, api_posts, threshold=0)
+    get_customer_snapshot_cache().clear()
+
+    cursors = CursorRecorder(monkeypatch)
+    streamed = run_incidents(order_processor_factory, api_posts, threshold=ROWS_PER_ACCOUNT - 1)
+
+    assert streamed == buffered
+    assert cursors.classes.count(pymysql.cursors.SSCursor) == len(ACCOUNTS)
+    # Streamed accounts are never cached
+    assert get_customer_snapshot_cache().stats()["size"] == 0
@@ -0,0 +1,135 @@
+import threading
+import time
+from utils.logger.logger import get_logger
+from utils.custom_exceptions.customize_exceptions import CircuitOpenError
+
+logger = get_logger("API_Config")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for a remote dependency.
+
+    closed: calls go through; failure_threshold consecutive failures open the circuit.
+    open: calls are refused until reset_timeout seconds have passed.
+    half_open: one probe call is let through; success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0, on_state_change=None):
+        """
+        Args:
+            name (str): Dependency name used in log messages
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds the circuit stays open before a probe is allowed
+            on_state_change (callable, optional): Called with the new state on every transition
+        """
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self.on_state_change = on_state_change
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state):
+        if state == self._state:
+            return
+        self._state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            logger.warning(f"{self.name} circuit opened after {self._failures} consecutive failures; "
+                           f"pausing calls for {self.reset_timeout}s")
+        elif state == HALF_OPEN:
+            logger.info(f"{self.name} circuit half-open; sending a probe call")
+        else:
+            logger.info(f"{self.name} circuit closed")
+        if self.on_state_change is not None:
+            try:
+                self.on_state_change(state)
+            except Exception as e:
+                logger.error(f"Circuit state callback failed: {e}")
+
+    def configure(self, failure_threshold=None, reset_timeout=None):
+        """
+        Change the thresholds without resetting the current state or failure count.
+
+        Args:
+            failure_threshold (int, optional): New number of consecutive failures that open the circuit
+            reset_timeout (float, optional): New seconds the circuit stays open
+        """
+        with self._lock:
+            if failure_threshold is not None:
+                self.failure_threshold = max(1, int(failure_threshold))
+            if reset_timeout is not None:
+                self.reset_timeout = float(reset_timeout)
+
+    def is_open(self):
+        """
+        True while new calls would be refused: the circuit is open, or half-open with
+        its probe still in flight. Callers use this to leave work queued instead of failing it.
+        """
+        with self._lock:
+            state = self._current_state()
+            return state == OPEN or (state == HALF_OPEN and self._probe_in_flight)
+
+    def retry_after(self):
+        """Seconds until the circuit half-opens (0 if calls are allowed now)."""
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def before_call(self):
+        """
+        Reserve permission for one call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or its half-open probe is taken
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            remaining = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(f"{self.name} circuit is open; retry in {remaining:.1f}s")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self._transition(CLOSED)
+
+    def release(self):
+        """End a call without an outcome (e.g. it was rejected locally), freeing the half-open probe."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            was_probe = self._probe_in_flight
+            self._probe_in_flight = False
+            state = self._current_state()
+            if state == OPEN:
+                return  # A call that started before the circuit opened; keep the current open period
+            if was_probe or state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._transition(OPEN)
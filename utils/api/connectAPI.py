@@ -1,32 +1,316 @@
-import configparser
+import atexit
+import threading
+import time
 from urllib.parse import urlparse
 from pathlib import Path
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError, ConnectTimeoutError
+from tenacity import Retrying, stop_after_attempt, wait_random_exponential, retry_if_exception
 from utils.logger.logger import get_logger
+from utils.config.configRegistry import get_cached_config, add_reload_hook
+from utils.api.circuitBreaker import CircuitBreaker
+from utils.metrics.metrics import Counter, register_metric, increment
 
 logger = get_logger("API_Config")
 
-def read_api_config() -> str:
-    """Directly reads config with fallback paths"""
-    config_paths = [
+# HTTP client defaults used when the API section does not override them
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF_INITIAL = 0.5
+DEFAULT_RETRY_BACKOFF_MAX = 10.0
+DEFAULT_BREAKER_FAILURE_THRESHOLD = 5
+DEFAULT_BREAKER_RESET_TIMEOUT = 30.0
+
+# Creating an incident is not idempotent, so a POST is only retried when the API cannot
+# have acted on it: the connection was never made, or the API refused it up front
+RETRYABLE_STATUSES = frozenset({429, 503})
+# Statuses that count as the API failing (circuit breaker), whether or not they are retried
+SERVER_FAILURE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+API_RETRIES = register_metric(Counter(
+    "request_log_api_retries_total",
+    "Incident API attempts that failed and were retried"
+))
+API_CIRCUIT_TRANSITIONS = register_metric(Counter(
+    "request_log_api_circuit_transitions_total",
+    "Incident API circuit breaker state changes, by new state",
+    ("state",)
+))
+
+_session = None
+_session_timeout = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+_session_pool_size = None
+_session_lock = threading.Lock()
+_breaker = None
+_breaker_lock = threading.Lock()
+_latency_lock = threading.Lock()
+_latency_stats = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "last_seconds": 0.0}
+
+def get_config_paths():
+    """Config files probed, in order, for the API section"""
+    return [
         Path(r"D:\SLT_DRS\Git_DRS\request_log\Config\databaseConfig.ini"),  # Primary path
         Path(__file__).parent.parent.parent / "Config" / "databaseConfig.ini"  # Fallback
     ]
 
-    config = configparser.ConfigParser()
-    
-    for path in config_paths:
+def _build_api_url(config):
+    """Returns the validated api_url from a parsed config file, or None"""
+    if config is not None and 'API' in config and config['API'].get('api_url'):
+        url = config['API']['api_url'].strip()
+        if url:
+            parsed = urlparse(url)
+            if parsed.scheme and parsed.netloc:
+                logger.info(f"Using API URL: {url}")
+                return url
+    return None
+
+def read_api_config() -> str:
+    """Reads the API URL with fallback paths, cached until the config file changes"""
+    for path in get_config_paths():
         try:
-            if path.exists():
-                config.read(str(path))
-                if 'API' in config and config['API'].get('api_url'):
-                    url = config['API']['api_url'].strip()
-                    if url:
-                        parsed = urlparse(url)
-                        if parsed.scheme and parsed.netloc:
-                            logger.info(f"Using API URL: {url}")
-                            return url
+            url = get_cached_config(path, 'API_URL', _build_api_url)
+            if url:
+                return url
         except Exception as e:
             logger.warning(f"Failed to read {path}: {e}")
 
     logger.error("No valid API configuration found in any path")
-    raise ValueError("API URL not configured")
\ No newline at end of file
+    raise ValueError("API URL not configured")
+
+def _build_http_config(config):
+    """Returns the HTTP settings of a parsed config file, or None if it has no API section"""
+    if config is None or 'API' not in config:
+        return None
+    return {
+        'pool_size': config['API'].getint('POOL_SIZE', DEFAULT_POOL_SIZE),
+        'connect_timeout': config['API'].getfloat('CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT),
+        'read_timeout': config['API'].getfloat('READ_TIMEOUT', DEFAULT_READ_TIMEOUT),
+        'retry_attempts': config['API'].getint('RETRY_ATTEMPTS', DEFAULT_RETRY_ATTEMPTS),
+        'retry_backoff_initial': config['API'].getfloat('RETRY_BACKOFF_INITIAL', DEFAULT_RETRY_BACKOFF_INITIAL),
+        'retry_backoff_max': config['API'].getfloat('RETRY_BACKOFF_MAX', DEFAULT_RETRY_BACKOFF_MAX),
+        'breaker_failure_threshold': config['API'].getint('BREAKER_FAILURE_THRESHOLD',
+                                                          DEFAULT_BREAKER_FAILURE_THRESHOLD),
+        'breaker_reset_timeout': config['API'].getfloat('BREAKER_RESET_TIMEOUT', DEFAULT_BREAKER_RESET_TIMEOUT)
+    }
+
+def get_http_config():
+    """
+    Returns HTTP client settings from the API section as a dictionary (hash map),
+    falling back to defaults for missing values
+    """
+    config_map = {
+        'pool_size': DEFAULT_POOL_SIZE,
+        'connect_timeout': DEFAULT_CONNECT_TIMEOUT,
+        'read_timeout': DEFAULT_READ_TIMEOUT,
+        'retry_attempts': DEFAULT_RETRY_ATTEMPTS,
+        'retry_backoff_initial': DEFAULT_RETRY_BACKOFF_INITIAL,
+        'retry_backoff_max': DEFAULT_RETRY_BACKOFF_MAX,
+        'breaker_failure_threshold': DEFAULT_BREAKER_FAILURE_THRESHOLD,
+        'breaker_reset_timeout': DEFAULT_BREAKER_RESET_TIMEOUT
+    }
+
+    for path in get_config_paths():
+        try:
+            http_config = get_cached_config(path, 'API_HTTP', _build_http_config)
+            if http_config:
+                config_map.update(http_config)
+                break
+        except Exception as e:
+            logger.warning(f"Failed to read {path}: {e}")
+
+    return config_map
+
+def get_http_session():
+    """
+    Returns the process-wide requests session, creating it on first use.
+    The session keeps connections alive and pools up to POOL_SIZE per host.
+    """
+    global _session, _session_timeout, _session_pool_size
+    session = _session
+    if session is not None:
+        return session
+    # Read before taking the lock: the reload hook takes it while the config is read
+    http_config = get_http_config()
+    with _session_lock:
+        if _session is None:
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=max(1, http_config['pool_size'])
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"Connection": "keep-alive"})
+            _session_timeout = (http_config['connect_timeout'], http_config['read_timeout'])
+            _session_pool_size = http_config['pool_size']
+            _session = session
+        return _session
+
+def close_http_session():
+    """Close the shared session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def get_api_circuit_breaker():
+    """
+    Returns the process-wide circuit breaker guarding the incident API, shared by the
+    sync and async clients. Thresholds come from BREAKER_FAILURE_THRESHOLD and
+    BREAKER_RESET_TIMEOUT in the API section.
+    """
+    global _breaker
+    breaker = _breaker
+    if breaker is not None:
+        return breaker
+    http_config = get_http_config()
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(
+                "Incident API",
+                failure_threshold=http_config['breaker_failure_threshold'],
+                reset_timeout=http_config['breaker_reset_timeout'],
+                on_state_change=lambda state: increment(API_CIRCUIT_TRANSITIONS, state)
+            )
+        return _breaker
+
+def reset_api_circuit_breaker():
+    """Drop the shared breaker so the next call rebuilds it from the current config."""
+    global _breaker
+    with _breaker_lock:
+        _breaker = None
+
+def _apply_reloaded_config(path):
+    """
+    Reload hook: applies changed API settings to the live client. Timeouts take effect
+    on the next request and breaker thresholds keep the breaker's current state; a new
+    POOL_SIZE replaces the session, whose connections close once in-flight requests end.
+    Retry settings need nothing here, post_json reads them on every call.
+    """
+    global _session, _session_timeout
+    http_config = get_http_config()
+    with _session_lock:
+        _session_timeout = (http_config['connect_timeout'], http_config['read_timeout'])
+        if _session is not None and http_config['pool_size'] != _session_pool_size:
+            logger.info(f"API pool size changed to {http_config['pool_size']}; opening a new session")
+            _session.close()
+            _session = None
+    with _breaker_lock:
+        if _breaker is not None:
+            _breaker.configure(
+                failure_threshold=http_config['breaker_failure_threshold'],
+                reset_timeout=http_config['breaker_reset_timeout']
+            )
+
+def api_retry_wait(http_config):
+    """Full-jitter exponential backoff between attempts, capped at RETRY_BACKOFF_MAX."""
+    return wait_random_exponential(multiplier=http_config['retry_backoff_initial'],
+                                   max=http_config['retry_backoff_max'])
+
+def _failed_before_send(exc):
+    """True if the request never reached the API: connecting to it failed or timed out."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(exc, requests.exceptions.ConnectionError) or not exc.args:
+        return False
+    # urllib3 wraps the connect error in a MaxRetryError; a dropped connection is a ProtocolError
+    reason = getattr(exc.args[0], "reason", exc.args[0])
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+def _status_of(exc):
+    response = getattr(exc, "response", None)
+    return response.status_code if response is not None else None
+
+def _is_retryable(exc):
+    """
+    Connect-phase failures and 429/503 only. A read timeout, a dropped connection or
+    a 500/502/504 may come after the API created the incident, and retrying would
+    create it again.
+    """
+    if _failed_before_send(exc):
+        return True
+    return isinstance(exc, requests.exceptions.HTTPError) and _status_of(exc) in RETRYABLE_STATUSES
+
+def _is_server_failure(exc):
+    """True if exc means the API is unreachable or failing, which the circuit breaker counts."""
+    if isinstance(exc, requests.exceptions.HTTPError):
+        return _status_of(exc) in SERVER_FAILURE_STATUSES
+    return isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+def _log_retry(retry_state):
+    increment(API_RETRIES)
+    logger.warning(f"API attempt {retry_state.attempt_number} failed: "
+                   f"{retry_state.outcome.exception()}; retrying")
+
+def record_api_latency(seconds):
+    """Add one API call duration to the latency statistics."""
+    with _latency_lock:
+        _latency_stats["count"] += 1
+        _latency_stats["total_seconds"] += seconds
+        _latency_stats["last_seconds"] = seconds
+        _latency_stats["max_seconds"] = max(_latency_stats["max_seconds"], seconds)
+
+def get_api_latency_stats():
+    """
+    Returns: {'count', 'total_seconds', 'max_seconds', 'last_seconds', 'avg_seconds'}
+    """
+    with _latency_lock:
+        stats = dict(_latency_stats)
+    stats["avg_seconds"] = stats["total_seconds"] / stats["count"] if stats["count"] else 0.0
+    return stats
+
+def _post_once(session, api_url, json_output, headers):
+    started = time.perf_counter()
+    try:
+        response = session.post(api_url, data=json_output, headers=headers, timeout=_session_timeout)
+    finally:
+        elapsed = time.perf_counter() - started
+        record_api_latency(elapsed)
+        logger.debug(f"API call to {api_url} took {elapsed * 1000:.1f} ms")
+    if response.status_code in SERVER_FAILURE_STATUSES:
+        response.raise_for_status()
+    return response
+
+def post_json(api_url, json_output, headers=None):
+    """
+    POSTs a JSON payload through the shared session with the configured timeouts.
+    Failures to connect and 429/503 responses are retried up to RETRY_ATTEMPTS times
+    with jittered exponential backoff (see _is_retryable); other failures are not, since
+    the API may already have created the incident. The outcome is recorded on the API
+    circuit breaker: connection errors, timeouts and 429/5xx count as failures.
+
+    Raises:
+        CircuitOpenError: If the circuit breaker is open and the call was not attempted
+        requests.exceptions.RequestException: If the last attempt failed
+    """
+    session = get_http_session()
+    http_config = get_http_config()
+    breaker = get_api_circuit_breaker()
+    breaker.before_call()
+    retrying = Retrying(
+        stop=stop_after_attempt(max(1, http_config['retry_attempts'])),
+        wait=api_retry_wait(http_config),
+        retry=retry_if_exception(_is_retryable),
+        before_sleep=_log_retry,
+        reraise=True
+    )
+    try:
+        response = retrying(_post_once, session, api_url, json_output, headers)
+    except requests.exceptions.RequestException as e:
+        if _is_server_failure(e):
+            breaker.record_failure()
+        else:
+            breaker.release()  # Rejected before reaching the API (e.g. an invalid URL)
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+    return response
+
+add_reload_hook(_apply_reloaded_config)
+atexit.register(close_http_session)
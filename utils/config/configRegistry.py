@@ -0,0 +1,196 @@
+import configparser
+import logging
+import os
+import threading
+import time
+
+# The logger module reads its own config through filePath, so this module logs directly
+logger = logging.getLogger("System_logger")
+
+# Seconds between mtime checks of a file that has already been parsed
+DEFAULT_CHECK_INTERVAL = 2.0
+
+
+class ConfigRegistry:
+    """
+    Process-wide cache of parsed INI files.
+    Each file is parsed once and re-parsed only when its mtime (or size) changes.
+    Derived values built from a file, such as typed section maps, are cached alongside
+    it and dropped whenever the file is re-parsed.
+    """
+
+    def __init__(self, check_interval=DEFAULT_CHECK_INTERVAL):
+        """
+        Args:
+            check_interval (float): Minimum seconds between stat() calls per file
+        """
+        self.check_interval = check_interval
+        self._entries = {}  # path -> {'signature', 'checked_at', 'config', 'derived'}
+        self._reload_hooks = []
+        self._lock = threading.RLock()
+
+    def get(self, path):
+        """
+        Returns the parsed ConfigParser for a file, or None if the file does not exist.
+        """
+        path = str(path)
+        with self._lock:
+            entry, hooks = self._refresh(path)
+        self._run_hooks(path, hooks)
+        return entry['config']
+
+    def get_cached(self, path, key, builder):
+        """
+        Returns builder(config) for a file, computed once per parse of that file.
+
+        Args:
+            path: Config file path
+            key: Name of the derived value, e.g. a section name
+            builder (callable): Takes the ConfigParser (None if the file is missing)
+                and returns the value to cache
+
+        Returns:
+            The cached value built from the current contents of the file
+        """
+        path = str(path)
+        with self._lock:
+            entry, hooks = self._refresh(path)
+            derived = entry['derived']
+            if key not in derived:
+                derived[key] = builder(entry['config'])
+            value = derived[key]
+        self._run_hooks(path, hooks)
+        return value
+
+    def _refresh(self, path):
+        """
+        Re-parses path if it changed. The caller holds the lock.
+
+        Returns:
+            tuple: (entry, hooks), where hooks is a copy of the reload hooks to run once
+                the lock is released (empty unless the file was reloaded). Hooks take
+                locks of their own, so running them under the registry lock would invert
+                the order of callers that read config while holding those locks.
+        """
+        entry = self._entries.get(path)
+        now = time.monotonic()
+        if entry is not None and now - entry['checked_at'] < self.check_interval:
+            return entry, []
+
+        signature = self._signature(path)
+        if entry is not None and entry['signature'] == signature:
+            entry['checked_at'] = now
+            return entry, []
+
+        reloaded = entry is not None
+        config = None
+        if signature is not None:
+            config = configparser.ConfigParser()
+            config.read(path)
+        entry = self._entries[path] = {
+            'signature': signature,
+            'checked_at': now,
+            'config': config,
+            'derived': {}
+        }
+        if not reloaded:
+            return entry, []
+        logger.info(f"Configuration file changed, reloaded: {path}")
+        return entry, list(self._reload_hooks)
+
+    def check(self, path):
+        """
+        Re-parse path now if it changed, running the reload hooks, without reading it.
+
+        Returns:
+            bool: True if the file was reloaded
+        """
+        path = str(path)
+        with self._lock:
+            previous = self._entries.get(path)
+            entry, hooks = self._refresh(path)
+        self._run_hooks(path, hooks)
+        return previous is not None and entry is not previous
+
+    def reload(self, path=None):
+        """
+        Drop the cached parse of one file, or of every file when path is None,
+        and run the reload hooks. The next get() re-reads the file.
+        """
+        with self._lock:
+            paths = [str(path)] if path is not None else list(self._entries)
+            for cached_path in paths:
+                self._entries.pop(cached_path, None)
+            hooks = list(self._reload_hooks)
+        for cached_path in paths:
+            self._run_hooks(cached_path, hooks)
+
+    def add_reload_hook(self, callback):
+        """Register callback(path), called after a cached file is reloaded."""
+        with self._lock:
+            self._reload_hooks.append(callback)
+
+    def remove_reload_hook(self, callback):
+        """Unregister a callback added with add_reload_hook; unknown callbacks are ignored."""
+        with self._lock:
+            if callback in self._reload_hooks:
+                self._reload_hooks.remove(callback)
+
+    @staticmethod
+    def _run_hooks(path, hooks):
+        for callback in hooks:
+            try:
+                callback(path)
+            except Exception as e:
+                logger.error(f"Config reload hook failed for {path}: {e}")
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+_registry = ConfigRegistry()
+
+
+def get_config(path):
+    """Returns the cached ConfigParser for path, or None if the file does not exist."""
+    return _registry.get(path)
+
+
+def get_cached_config(path, key, builder):
+    """Returns builder(config) for path, cached until the file changes."""
+    return _registry.get_cached(path, key, builder)
+
+
+def check_config(path):
+    """
+    Re-read path now if it changed since it was last parsed, running the reload hooks.
+    For long-running loops that apply settings through hooks between reads.
+
+    Returns:
+        bool: True if the file was reloaded
+    """
+    return _registry.check(path)
+
+
+def reload_config(path=None):
+    """Force one file, or every cached file, to be re-read on next use."""
+    _registry.reload(path)
+
+
+def add_reload_hook(callback):
+    """
+    Register callback(path) to run whenever a cached config file is reloaded.
+    Hooks run in the thread that noticed the change, after the new parse is cached,
+    so a hook can read the new values through get_cached_config.
+    """
+    _registry.add_reload_hook(callback)
+
+
+def remove_reload_hook(callback):
+    """Unregister a callback added with add_reload_hook."""
+    _registry.remove_reload_hook(callback)
@@ -0,0 +1,87 @@
+from utils.logger.logger import get_logger
+from utils.filePath.filePath import get_filePath
+from utils.config.configRegistry import get_cached_config
+
+logger = get_logger("task_status_logger")
+
+def get_processing_config():
+    """
+    Returns order processing settings from the PROCESSING section of databaseConfig.ini
+    as a dictionary (hash map), falling back to defaults for missing values.
+    Cached until the file changes.
+    """
+    try:
+        return dict(get_cached_config(get_filePath("databaseConfig"), 'PROCESSING', _build_processing_config))
+    except Exception as e:
+        logger.error(f"Error reading processing config: {e}")
+        return _build_processing_config(None)
+
+def _build_processing_config(config):
+    config_map = {
+        'worker_threads': 1,  # 1 processes incidents sequentially
+        'max_in_flight': 0,  # 0 means twice the number of worker threads
+        'async_concurrency': 500,  # Incidents in flight at once on the asyncio engine
+        'vectorized_transform': True,  # Build customer sections per batch with pandas
+        'latest_payment_query': 'grouped',  # 'grouped' (MAX join) or 'window' (ROW_NUMBER, MySQL 8.0+)
+        'stream_row_threshold': 5000,  # Accounts with more debt_cust_detail rows are streamed (0 = never)
+        'customer_cache_size': 10000,  # Accounts held in the customer snapshot cache (0 = no cache)
+        'customer_cache_ttl': 300.0  # Seconds a cached customer snapshot stays valid
+    }
+
+    if config is not None and 'PROCESSING' in config:
+        config_map.update({
+            'worker_threads': config['PROCESSING'].getint('WORKER_THREADS', config_map['worker_threads']),
+            'max_in_flight': config['PROCESSING'].getint('MAX_IN_FLIGHT', config_map['max_in_flight']),
+            'async_concurrency': config['PROCESSING'].getint('ASYNC_CONCURRENCY', config_map['async_concurrency']),
+            'vectorized_transform': config['PROCESSING'].getboolean('VECTORIZED_TRANSFORM',
+                                                                    config_map['vectorized_transform']),
+            'latest_payment_query': config['PROCESSING'].get('LATEST_PAYMENT_QUERY',
+                                                             config_map['latest_payment_query']).strip().lower(),
+            'stream_row_threshold': config['PROCESSING'].getint('STREAM_ROW_THRESHOLD',
+                                                                config_map['stream_row_threshold']),
+            'customer_cache_size': config['PROCESSING'].getint('CUSTOMER_CACHE_SIZE',
+                                                               config_map['customer_cache_size']),
+            'customer_cache_ttl': config['PROCESSING'].getfloat('CUSTOMER_CACHE_TTL',
+                                                                config_map['customer_cache_ttl'])
+        })
+
+    config_map['worker_threads'] = max(1, config_map['worker_threads'])
+    config_map['async_concurrency'] = max(1, config_map['async_concurrency'])
+    config_map['stream_row_threshold'] = max(0, config_map['stream_row_threshold'])
+    config_map['customer_cache_size'] = max(0, config_map['customer_cache_size'])
+    config_map['customer_cache_ttl'] = max(0.0, config_map['customer_cache_ttl'])
+    if config_map['max_in_flight'] <= 0:
+        config_map['max_in_flight'] = config_map['worker_threads'] * 2
+    return config_map
+
+def get_daemon_config():
+    """
+    Returns daemon-mode settings from the DAEMON section of databaseConfig.ini
+    as a dictionary (hash map): which order types are handled, their cursor batch
+    sizes and how the daemon wakes up ('events' or 'polling'). Cached until the file changes.
+    """
+    try:
+        return dict(get_cached_config(get_filePath("databaseConfig"), 'DAEMON', _build_daemon_config))
+    except Exception as e:
+        logger.error(f"Error reading daemon config: {e}")
+        return _build_daemon_config(None)
+
+def _build_daemon_config(config):
+    config_map = {
+        'enabled_order_ids': [1],
+        'batch_sizes': {},  # order_id -> batch size; missing types use OPEN_ORDER_BATCH_SIZE
+        'wakeup': 'events'
+    }
+
+    if config is not None and 'DAEMON' in config:
+        section = config['DAEMON']
+        enabled = section.get('ENABLED_ORDER_IDS', '')
+        if enabled.strip():
+            config_map['enabled_order_ids'] = [int(value) for value in enabled.split(',') if value.strip()]
+        for order_id in (1, 2, 3, 4):
+            batch_size = section.getint(f'BATCH_SIZE_{order_id}', 0)
+            if batch_size > 0:
+                config_map['batch_sizes'][order_id] = batch_size
+        config_map['wakeup'] = section.get('WAKEUP', config_map['wakeup']).strip().lower()
+
+    return config_map
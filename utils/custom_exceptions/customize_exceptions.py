@@ -8,4 +8,8 @@ class IncidentCreationError(Exception):
 
 class PaymentDataError(Exception):
     """Raised when payment data is invalid."""
+    pass
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because its circuit breaker is open."""
     pass
\ No newline at end of file
@@ -1,38 +1,112 @@
+import atexit
+import threading
 import pymongo
 from pymongo import MongoClient
-import configparser
 from utils.logger.logger import get_logger
 from utils.filePath.filePath import get_filePath
+from utils.config.configRegistry import get_cached_config
 
 logger = get_logger("task_status_logger")
 
-def get_mongo_config():
+# Shared MongoClient registry: {mongo_uri: {'client': MongoClient, 'healthy': bool, 'lock': Lock}}
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _build_mongo_config(config):
     """
-    Returns MongoDB configuration as a dictionary (hash map)
-    without authentication parameters
+    Builds the MongoDB configuration map from a parsed databaseConfig.ini (or None)
     """
-    config = configparser.ConfigParser()
-    config_file = get_filePath("databaseConfig")
-    
     config_map = {
         'mongo_uri': 'mongodb://localhost:27017/',
         'db_name': 'DRS',
-        'collection_name': 'Request_Progress_Log'
+        'collection_name': 'Request_Progress_Log',
+        'open_order_batch_size': 1000,
+        'status_bulk_size': 500,
+        'status_flush_interval': 1.0,
+        'poll_interval_min': 0.5,
+        'poll_interval_max': 5.0,
+        'change_stream_max_await_ms': 250,
+        'work_claims': False,
+        'claim_lease_seconds': 300.0,
+        'ensure_indexes': True
     }
 
+    if config is not None and 'MONGODB' in config:
+        config_map.update({
+            'mongo_uri': config['MONGODB'].get('MONGO_URI', config_map['mongo_uri']),
+            'db_name': config['MONGODB'].get('DRS_DATABASE', config_map['db_name']),
+            'collection_name': config['MONGODB'].get('REQUEST_PROGRESS_LOG_COLLECTION', 
+                                  config_map['collection_name']),
+            'open_order_batch_size': config['MONGODB'].getint('OPEN_ORDER_BATCH_SIZE',
+                                  config_map['open_order_batch_size']),
+            'status_bulk_size': config['MONGODB'].getint('STATUS_BULK_SIZE',
+                                  config_map['status_bulk_size']),
+            'status_flush_interval': config['MONGODB'].getfloat('STATUS_FLUSH_INTERVAL',
+                                  config_map['status_flush_interval']),
+            'poll_interval_min': config['MONGODB'].getfloat('POLL_INTERVAL_MIN',
+                                  config_map['poll_interval_min']),
+            'poll_interval_max': config['MONGODB'].getfloat('POLL_INTERVAL_MAX',
+                                  config_map['poll_interval_max']),
+            'change_stream_max_await_ms': config['MONGODB'].getint('CHANGE_STREAM_MAX_AWAIT_MS',
+                                  config_map['change_stream_max_await_ms']),
+            'work_claims': config['MONGODB'].getboolean('WORK_CLAIMS', config_map['work_claims']),
+            'claim_lease_seconds': config['MONGODB'].getfloat('CLAIM_LEASE_SECONDS',
+                                  config_map['claim_lease_seconds']),
+            'ensure_indexes': config['MONGODB'].getboolean('ENSURE_INDEXES', config_map['ensure_indexes'])
+        })
+    return config_map
+
+def get_mongo_config():
+    """
+    Returns MongoDB configuration as a dictionary (hash map)
+    without authentication parameters.
+    Parsed once from databaseConfig.ini and cached until the file changes.
+    """
     try:
-        config.read(config_file)
-        if 'MONGODB' in config:
-            config_map.update({
-                'mongo_uri': config['MONGODB'].get('MONGO_URI', config_map['mongo_uri']),
-                'db_name': config['MONGODB'].get('DRS_DATABASE', config_map['db_name']),
-                'collection_name': config['MONGODB'].get('REQUEST_PROGRESS_LOG_COLLECTION', 
-                                      config_map['collection_name'])
-            })
-        return config_map
+        config_file = get_filePath("databaseConfig")
+        return dict(get_cached_config(config_file, 'MONGODB', _build_mongo_config))
     except Exception as e:
         logger.error(f"Error reading MongoDB config: {e}")
-        return config_map  # Return defaults if error occurs
+        return _build_mongo_config(None)  # Return defaults if error occurs
+
+def get_mongo_client(mongo_uri):
+    """
+    Returns the shared MongoClient for a URI, creating it on first use.
+    The client is pinged only until it has been seen healthy once, so later
+    callers reuse the driver's warm connection pool without a round-trip.
+    The ping holds only that URI's lock: callers of other URIs are not held up
+    by a slow server, and concurrent callers of the same URI share one ping.
+    Raises pymongo.errors.ConnectionFailure if the ping fails.
+    """
+    with _clients_lock:
+        entry = _clients.get(mongo_uri)
+        if entry is None:
+            # MongoClient connects in the background, so creating it here does not block
+            entry = {'client': MongoClient(mongo_uri), 'healthy': False, 'lock': threading.Lock()}
+            _clients[mongo_uri] = entry
+
+    if not entry['healthy']:
+        with entry['lock']:
+            if not entry['healthy']:
+                # On failure the client is kept; the driver reconnects and the next caller pings again
+                entry['client'].admin.command('ping')
+                entry['healthy'] = True
+                logger.info("Successfully connected to MongoDB")
+
+    return entry['client']
+
+def close_mongo_clients():
+    """
+    Closes every shared MongoClient. Registered to run at interpreter shutdown.
+    """
+    with _clients_lock:
+        entries = list(_clients.values())
+        _clients.clear()
+    for entry in entries:
+        try:
+            entry['client'].close()
+        except Exception as e:
+            logger.warning(f"Error closing MongoDB client: {e}")
 
 def get_mongo_connection():
     """
@@ -47,15 +121,11 @@ def get_mongo_connection():
     try:
         config = get_mongo_config()
         
-        # Establish connection (no authentication)
-        client = MongoClient(config['mongo_uri'])
+        # Reuse the shared client for this URI (no authentication)
+        client = get_mongo_client(config['mongo_uri'])
         db = client[config['db_name']]
         collection = db[config['collection_name']]
         
-        # Verify connection
-        client.admin.command('ping')
-        logger.info("Successfully connected to MongoDB")
-        
         return {
             'config': config,
             'client': client,
@@ -76,4 +146,6 @@ def get_mongo_collection():
     Returns: MongoDB collection object or None if connection fails
     """
     connection = get_mongo_connection()
-    return connection['collection'] if connection else None
\ No newline at end of file
+    return connection['collection'] if connection else None
+
+atexit.register(close_mongo_clients)
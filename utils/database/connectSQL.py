@@ -1,33 +1,393 @@
+import atexit
+import threading
+import time
 import pymysql
-import configparser
+from pymysql.constants import CLIENT
 from utils.logger.logger import get_logger
 from utils.filePath.filePath import get_filePath
+from utils.config.configRegistry import get_cached_config, add_reload_hook
 
 logger = get_logger("task_status_logger")
 
-def get_mysql_connection():
+# Pool defaults used when databaseConfig.ini does not override them
+DEFAULT_POOL_SIZE = 5
+DEFAULT_POOL_MAX_AGE = 3600  # seconds before a connection is recycled
+DEFAULT_POOL_TIMEOUT = 30  # seconds to wait for a free connection
+
+# Regular pool: no multi-statements, so a query can never carry a second statement
+_pool = None
+_pool_settings = None  # Connection settings the pool was built with
+# Pool for run_statements callers, opened with CLIENT.MULTI_STATEMENTS (see get_mysql_pool)
+_statement_pool = None
+_statement_pool_settings = None
+# Never held while reading config: the reload hook takes it after the config is read
+_pool_lock = threading.Lock()
+
+# DATABASE keys that need new connections when changed; the pool limits are applied in place
+CONNECTION_KEYS = ('mysql_host', 'mysql_database', 'mysql_user', 'mysql_password', 'mysql_multi_statements')
+
+
+class PooledConnection:
+    """
+    Wraps a pymysql connection checked out from a MySQLConnectionPool.
+    Behaves like the underlying connection, except that close() hands it back to the pool.
+    Once closed it raises InterfaceError, as a closed pymysql connection does, since the
+    connection may already be checked out by another caller.
+    """
+
+    def __init__(self, pool, connection, created_at):
+        self._pool = pool
+        self._connection = connection
+        self.created_at = created_at
+        self._released = False
+
+    def close(self):
+        """Return the connection to the pool instead of closing the socket."""
+        if not self._released:
+            self._released = True
+            self._pool.release(self)
+
+    def __getattr__(self, name):
+        if self._released:
+            raise pymysql.err.InterfaceError(0, "Connection was returned to the pool")
+        return getattr(self._connection, name)
+
+
+class MySQLConnectionPool:
+    """
+    Process-wide, thread-safe pool of MySQL connections.
+    Connections are health checked on checkout and recycled once they exceed max_age.
+    """
+
+    def __init__(self, connect, size=DEFAULT_POOL_SIZE, max_age=DEFAULT_POOL_MAX_AGE,
+                 timeout=DEFAULT_POOL_TIMEOUT):
+        """
+        Args:
+            connect (callable): Zero-argument factory returning a new pymysql connection
+            size (int): Maximum number of open connections
+            max_age (float): Seconds after which a connection is closed and replaced
+            timeout (float): Seconds to wait for a free connection before giving up
+        """
+        self._connect = connect
+        self.size = max(1, int(size))
+        self.max_age = float(max_age)
+        self.timeout = float(timeout)
+        self._idle = []  # (connection, created_at) tuples, most recently used last
+        self._open = 0
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+        self._stats = {
+            "created": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "recycled": 0,
+            "health_check_failures": 0,
+        }
+
+    def get_connection(self):
+        """
+        Check out a healthy connection, opening a new one if the pool has capacity.
+
+        Returns:
+            PooledConnection: A connection that returns to the pool on close()
+
+        Raises:
+            TimeoutError: If no connection becomes free within the pool timeout
+        """
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            while not self._idle and self._open >= self.size:
+                self._stats["waits"] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    if not self._idle and self._open >= self.size:
+                        self._stats["timeouts"] += 1
+                        raise TimeoutError(f"No MySQL connection available within {self.timeout}s")
+            if self._idle:
+                connection, created_at = self._idle.pop()
+            else:
+                connection, created_at = None, None
+                self._open += 1
+            self._stats["checkouts"] += 1
+
+        try:
+            if connection is not None and not self._is_usable(connection, created_at):
+                self._discard(connection)
+                connection = None
+            if connection is None:
+                connection, created_at = self._connect(), time.monotonic()
+                with self._condition:
+                    self._stats["created"] += 1
+        except Exception:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+
+        return PooledConnection(self, connection, created_at)
+
+    def release(self, pooled):
+        """Return a checked-out connection to the pool."""
+        connection = pooled._connection
+        try:
+            # End any implicit transaction so the next user sees fresh data
+            connection.rollback()
+        except Exception:
+            self._discard(connection)
+            self._forget()
+            return
+
+        if time.monotonic() - pooled.created_at > self.max_age:
+            with self._condition:
+                self._stats["recycled"] += 1
+            self._discard(connection)
+            self._forget()
+            return
+
+        with self._condition:
+            if self._open <= self.size and not self._closed:
+                self._idle.append((connection, pooled.created_at))
+                self._condition.notify()
+                return
+        # The pool was shrunk or closed while this connection was checked out
+        self._discard(connection)
+        self._forget()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Pool counters plus the current size, idle and in-use connection counts
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats.update({
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+            })
+        return stats
+
+    def resize(self, size=None, max_age=None, timeout=None):
+        """
+        Change the pool limits in place. Shrinking closes idle connections beyond the
+        new size; checked-out connections are closed as they come back until the pool
+        is within size again.
+
+        Args:
+            size (int, optional): New maximum number of open connections
+            max_age (float, optional): New recycle age in seconds
+            timeout (float, optional): New checkout timeout in seconds
+        """
+        with self._condition:
+            if size is not None:
+                self.size = max(1, int(size))
+            if max_age is not None:
+                self.max_age = float(max_age)
+            if timeout is not None:
+                self.timeout = float(timeout)
+            excess = max(0, min(len(self._idle), self._open - self.size))
+            surplus = [self._idle.pop(0) for _ in range(excess)]
+            self._open -= excess
+            self._condition.notify_all()  # Waiters re-check against the new size
+        for connection, _ in surplus:
+            self._discard(connection)
+
+    def close_all(self):
+        """Close every idle connection. Checked-out connections close when released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def _is_usable(self, connection, created_at):
+        if time.monotonic() - created_at > self.max_age:
+            with self._condition:
+                self._stats["recycled"] += 1
+            return False
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy MySQL connection: {e}")
+            with self._condition:
+                self._stats["health_check_failures"] += 1
+            return False
+
+    def _forget(self):
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+def get_mysql_config():
     """
-    Establishes a MySQL connection using the configuration from DB_Config.ini.
-    :return: A MySQL connection object.
+    Reads the DATABASE section of databaseConfig.ini, cached until the file changes.
+    :return: The DATABASE section as a dictionary.
     """
-    config = configparser.ConfigParser()
     config_file = get_filePath("databaseConfig")
 
-    try:
-        config.read(config_file)
-        if 'DATABASE' not in config:
+    def build(config):
+        if config is None or 'DATABASE' not in config:
             raise KeyError(f"'DATABASE' section missing in {config_file}")
+        return dict(config['DATABASE'])
 
+    return dict(get_cached_config(config_file, 'DATABASE', build))
+
+
+def multi_statements_enabled(db_config):
+    """
+    Returns:
+        bool: True if MYSQL_MULTI_STATEMENTS in the DATABASE section is on (off by default)
+    """
+    return str(db_config.get('mysql_multi_statements', 'false')).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _pool_limits(db_config):
+    return {
+        'size': int(db_config.get('mysql_pool_size', DEFAULT_POOL_SIZE)),
+        'max_age': float(db_config.get('mysql_pool_max_age', DEFAULT_POOL_MAX_AGE)),
+        'timeout': float(db_config.get('mysql_pool_timeout', DEFAULT_POOL_TIMEOUT))
+    }
+
+
+def _build_pool(db_config, multi_statements):
+    def connect():
         connection = pymysql.connect(
-            host=config['DATABASE']['MYSQL_HOST'],
-            database=config['DATABASE']['MYSQL_DATABASE'],
-            user=config['DATABASE']['MYSQL_USER'],
-            password=config['DATABASE']['MYSQL_PASSWORD']
+            host=db_config['mysql_host'],
+            database=db_config['mysql_database'],
+            user=db_config['mysql_user'],
+            password=db_config['mysql_password'],
+            client_flag=CLIENT.MULTI_STATEMENTS if multi_statements else 0
         )
         logger.info("Successfully connected to MySQL.")
         return connection
+
+    return MySQLConnectionPool(connect, **_pool_limits(db_config))
+
+
+def get_mysql_pool(multi_statements=False):
+    """
+    Returns a process-wide MySQL connection pool, creating it on first use.
+
+    The regular pool's connections never allow multi-statements. Code that sends its
+    SQL through sqlStatements.run_statements asks for multi_statements=True and, when
+    MYSQL_MULTI_STATEMENTS is on, gets a second pool whose connections are opened with
+    CLIENT.MULTI_STATEMENTS, so it can send several statements in one round-trip.
+    Otherwise it gets the regular pool.
+
+    Args:
+        multi_statements (bool): Return the pool used for run_statements
+
+    Returns:
+        MySQLConnectionPool: The pool
+    """
+    global _pool, _pool_settings, _statement_pool, _statement_pool_settings
+    if multi_statements:
+        pool = _statement_pool
+        if pool is not None:
+            return pool
+        try:
+            db_config = get_mysql_config()
+        except KeyError:
+            db_config = {}  # The regular pool below reports the missing section
+        if multi_statements_enabled(db_config):
+            with _pool_lock:
+                if _statement_pool is None:
+                    _statement_pool = _build_pool(db_config, multi_statements=True)
+                    _statement_pool_settings = _connection_settings(db_config)
+                return _statement_pool
+
+    pool = _pool
+    if pool is not None:
+        return pool
+    db_config = get_mysql_config()
+    with _pool_lock:
+        if _pool is None:
+            _pool = _build_pool(db_config, multi_statements=False)
+            _pool_settings = _connection_settings(db_config)
+        return _pool
+
+
+def _connection_settings(db_config):
+    return tuple(db_config.get(key) for key in CONNECTION_KEYS)
+
+
+def _apply_reloaded_config(path):
+    """
+    Reload hook: applies a changed DATABASE section to the live pools. New pool limits
+    resize a pool in place; new connection settings drop it, so the next checkout builds
+    a pool that connects with them. Connections already checked out finish their work.
+    """
+    global _pool, _statement_pool
+    if _pool is None and _statement_pool is None:
+        return
+    try:
+        db_config = get_mysql_config()
+    except KeyError:
+        return  # The DATABASE section is missing; keep the pools as they are
+    settings = _connection_settings(db_config)
+    with _pool_lock:
+        if _pool is not None and settings != _pool_settings:
+            logger.info("MySQL connection settings changed; reconnecting on next checkout")
+            _pool.close_all()
+            _pool = None
+        if _statement_pool is not None and settings != _statement_pool_settings:
+            _statement_pool.close_all()
+            _statement_pool = None
+        for pool in (_pool, _statement_pool):
+            if pool is not None:
+                pool.resize(**_pool_limits(db_config))
+
+
+def get_mysql_pool_stats(multi_statements=False):
+    """
+    Returns statistics for the regular pool, or for the run_statements pool with
+    multi_statements=True; an empty dict if that pool was never created.
+    """
+    pool = _statement_pool if multi_statements else _pool
+    return pool.stats() if pool is not None else {}
+
+
+def close_mysql_pool():
+    """Close all idle pooled connections and drop the process-wide pools."""
+    global _pool, _statement_pool
+    with _pool_lock:
+        for pool in (_pool, _statement_pool):
+            if pool is not None:
+                pool.close_all()
+        _pool = _statement_pool = None
+
+
+def get_mysql_connection(multi_statements=False):
+    """
+    Checks out a MySQL connection from the process-wide pool.
+    Calling close() on the returned connection hands it back to the pool.
+
+    Args:
+        multi_statements (bool): The connection is used with sqlStatements.run_statements,
+            which can batch statements when MYSQL_MULTI_STATEMENTS is on (see get_mysql_pool)
+
+    :return: A pooled MySQL connection object.
+    """
+    try:
+        return get_mysql_pool(multi_statements).get_connection()
     except KeyError as e:
         logger.error(f"Configuration error: {e}")
     except Exception as e:
         logger.error(f"Error connecting to MySQL: {e}")
     return None
+
+
+add_reload_hook(_apply_reloaded_config)
+atexit.register(close_mysql_pool)
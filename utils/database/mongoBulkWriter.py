@@ -0,0 +1,121 @@
+import threading
+import time
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from utils.logger.logger import get_logger
+from utils.metrics.metrics import timed
+
+logger = get_logger("task_status_logger")
+
+
+class BulkUpdateBuffer:
+    """
+    Buffers update_one operations and writes them as unordered bulk_write batches.
+    A batch is flushed once it holds max_batch operations or its oldest operation has
+    waited max_delay seconds. Every operation's callback receives True if that
+    operation modified its document and False otherwise.
+    """
+
+    def __init__(self, collection, max_batch=500, max_delay=1.0):
+        """
+        Args:
+            collection: MongoDB collection the updates are applied to
+            max_batch (int): Operations per bulk_write
+            max_delay (float): Seconds an operation may wait before a flush is forced
+        """
+        self.collection = collection
+        self.max_batch = max(1, int(max_batch))
+        self.max_delay = float(max_delay)
+        self._pending = []  # (filter, update, verify_filter, callback) tuples
+        self._oldest = None
+        self._lock = threading.Lock()
+
+    def add(self, query, update, verify_filter=None, callback=None):
+        """
+        Queue one update_one operation, flushing if the size or time limit is reached.
+
+        Args:
+            query (dict): Filter selecting the document to update
+            update (dict): Update document
+            verify_filter (dict, optional): Filter that matches the document only after this
+                update was applied; used to attribute results when a batch partially fails
+            callback (callable, optional): Called with True/False once the batch is written
+        """
+        with self._lock:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((query, update, verify_filter, callback))
+            due = len(self._pending) >= self.max_batch or self._is_overdue()
+        if due:
+            self.flush()
+
+    def flush_if_due(self):
+        """Flush if the oldest queued operation has waited longer than max_delay."""
+        with self._lock:
+            due = bool(self._pending) and self._is_overdue()
+        if due:
+            self.flush()
+
+    def flush(self):
+        """
+        Write every queued operation in unordered bulk_write batches and report results.
+
+        Returns:
+            int: Number of operations that did not modify their document
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._oldest = None
+
+        failed = 0
+        for start in range(0, len(pending), self.max_batch):
+            failed += self._write(pending[start:start + self.max_batch])
+        return failed
+
+    def _is_overdue(self):
+        return self._oldest is not None and time.monotonic() - self._oldest >= self.max_delay
+
+    def _write(self, batch):
+        operations = [UpdateOne(query, update) for query, update, _, _ in batch]
+        errored = set()
+        try:
+            with timed("status_bulk_write"):
+                result = self.collection.bulk_write(operations, ordered=False)
+            modified = result.modified_count
+        except BulkWriteError as e:
+            errored = {error["index"] for error in e.details.get("writeErrors", [])}
+            modified = e.details.get("nModified", 0)
+            logger.error(f"Bulk status update had {len(errored)} write errors")
+        except Exception as e:
+            logger.error(f"Bulk status update failed: {e}")
+            return self._report(batch, [False] * len(batch))
+
+        if modified == len(batch) and not errored:
+            results = [True] * len(batch)
+        else:
+            # Partial success: check each operation individually
+            results = [
+                index not in errored and self._was_applied(verify_filter)
+                for index, (_, _, verify_filter, _) in enumerate(batch)
+            ]
+        logger.info(f"Bulk status update wrote {len(batch)} operations, {modified} modified")
+        return self._report(batch, results)
+
+    def _was_applied(self, verify_filter):
+        if verify_filter is None:
+            return False
+        try:
+            return self.collection.count_documents(verify_filter, limit=1) == 1
+        except Exception as e:
+            logger.error(f"Error verifying bulk status update: {e}")
+            return False
+
+    @staticmethod
+    def _report(batch, results):
+        for (_, _, _, callback), ok in zip(batch, results):
+            if callback is not None:
+                try:
+                    callback(ok)
+                except Exception as e:
+                    logger.error(f"Bulk status update callback failed: {e}")
+        return results.count(False)
@@ -0,0 +1,516 @@
+import re
+import threading
+import time
+import weakref
+import pymysql
+from pymysql.constants import CLIENT, ER
+from utils.logger.logger import get_logger
+from utils.metrics.metrics import Histogram, register_metric, metrics_enabled
+
+logger = get_logger("task_status_logger")
+
+# "prepared": server-side PREPARE once per connection, then SET + EXECUTE in one round-trip
+# "client": the driver escapes the arguments into the statement text on every call
+STATEMENT_MODES = ("prepared", "client")
+DEFAULT_STATEMENT_MODE = "client"
+
+# Rows read from the server per fetchmany() call when streaming
+STREAM_FETCH_SIZE = 500
+
+SQL_STATEMENT_SECONDS = register_metric(Histogram(
+    "request_log_sql_statement_seconds",
+    "Duration of registered SQL statements in seconds, by statement name",
+    ("statement",)
+))
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_statements = {}  # name -> SQLStatement
+_statements_lock = threading.Lock()
+
+_stats = {}  # name -> {'executions', 'errors', 'prepares', 'total_seconds', 'max_seconds'}
+_stats_lock = threading.Lock()
+
+# Raw connection -> names of the statements prepared in its session (None: PREPARE unsupported)
+_prepared = weakref.WeakKeyDictionary()
+_prepared_lock = threading.Lock()
+
+
+class SQLStatement:
+    """
+    A named, parameterized statement. The SQL uses %s placeholders, like pymysql.
+    """
+
+    __slots__ = ("name", "sql", "param_count")
+
+    def __init__(self, name, sql):
+        """
+        Args:
+            name (str): Identifier, also used as the server-side prepared statement name
+            sql (str): Row-returning statement with %s placeholders
+        """
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid statement name: {name!r}")
+        self.name = name
+        self.sql = sql
+        self.param_count = sql.count("%s")
+
+    def __repr__(self):
+        return f"SQLStatement({self.name!r})"
+
+
+def register_statement(name, sql):
+    """
+    Register a statement under name. Registering the same SQL again returns the
+    existing statement.
+
+    Args:
+        name (str): Statement name
+        sql (str): Row-returning statement with %s placeholders
+
+    Returns:
+        SQLStatement: The registered statement
+
+    Raises:
+        ValueError: If the name is already registered with different SQL
+    """
+    with _statements_lock:
+        statement = _statements.get(name)
+        if statement is not None:
+            if statement.sql != sql:
+                raise ValueError(f"Statement {name!r} is already registered with different SQL")
+            return statement
+        statement = _statements[name] = SQLStatement(name, sql)
+        return statement
+
+
+def get_statement(name):
+    """
+    Returns:
+        SQLStatement: The statement registered under name
+
+    Raises:
+        KeyError: If no statement has that name
+    """
+    return _statements[name]
+
+
+def get_statement_mode():
+    """
+    Returns:
+        str: MYSQL_STATEMENT_MODE from the DATABASE section, or the default
+    """
+    from utils.database.connectSQL import get_mysql_config
+    try:
+        mode = str(get_mysql_config().get('mysql_statement_mode', DEFAULT_STATEMENT_MODE)).strip().lower()
+    except Exception:
+        return DEFAULT_STATEMENT_MODE
+    return mode if mode in STATEMENT_MODES else DEFAULT_STATEMENT_MODE
+
+
+def supports_multi_statements(connection):
+    """
+    Returns:
+        bool: True if the connection was opened with CLIENT.MULTI_STATEMENTS
+    """
+    return bool(getattr(connection, "client_flag", 0) & CLIENT.MULTI_STATEMENTS)
+
+
+def get_statement_stats():
+    """
+    Returns:
+        dict: {name: {'executions', 'errors', 'prepares', 'total_seconds', 'max_seconds',
+            'avg_seconds'}} for every statement that ran. Statements sent together in one
+            round-trip share its duration equally.
+    """
+    with _stats_lock:
+        stats = {name: dict(values) for name, values in _stats.items()}
+    for values in stats.values():
+        values['avg_seconds'] = values['total_seconds'] / values['executions'] if values['executions'] else 0.0
+    return stats
+
+
+def reset_statement_stats():
+    """Clear the counters returned by get_statement_stats."""
+    with _stats_lock:
+        _stats.clear()
+
+
+def _stats_entry(name):
+    values = _stats.get(name)
+    if values is None:
+        values = _stats[name] = {
+            'executions': 0, 'errors': 0, 'prepares': 0, 'total_seconds': 0.0, 'max_seconds': 0.0
+        }
+    return values
+
+
+def _record(statements, seconds, error=False):
+    share = seconds / len(statements)
+    with _stats_lock:
+        for statement in statements:
+            values = _stats_entry(statement.name)
+            values['executions'] += 1
+            values['errors'] += int(error)
+            values['total_seconds'] += share
+            values['max_seconds'] = max(values['max_seconds'], share)
+    if metrics_enabled():
+        for statement in statements:
+            SQL_STATEMENT_SECONDS.observe(share, statement.name)
+
+
+def _record_prepare(statement):
+    with _stats_lock:
+        _stats_entry(statement.name)['prepares'] += 1
+
+
+def _prepared_names(connection):
+    """Returns the set of statements prepared on connection, or None if PREPARE is unsupported."""
+    with _prepared_lock:
+        if connection not in _prepared:
+            _prepared[connection] = set()
+        return _prepared[connection]
+
+
+def _forget_prepared(connection, unsupported=False):
+    with _prepared_lock:
+        _prepared[connection] = None if unsupported else set()
+
+
+def _use_prepared(connection, mode):
+    if (mode or get_statement_mode()) != "prepared" or not supports_multi_statements(connection):
+        # Without multi-statements SET and EXECUTE would cost two round-trips instead of one
+        return False
+    try:
+        return _prepared_names(connection) is not None
+    except TypeError:
+        return False  # Connection type that cannot be weakly referenced
+
+
+def build_prepare_sql(cursor, statement):
+    """
+    Returns:
+        str: PREPARE statement for statement, with ? placeholders
+    """
+    return cursor.mogrify(f"PREPARE {statement.name} FROM %s", (statement.sql.replace("%s", "?"),))
+
+
+def build_prepared_batch(cursor, calls):
+    """
+    Build one multi-statement text that binds every argument to a user variable and
+    executes each prepared statement in order.
+
+    Args:
+        cursor: Cursor used to escape the arguments
+        calls (list): (SQLStatement, args) pairs
+
+    Returns:
+        str: "SET @p0_0 = ..., ...;EXECUTE name USING @p0_0;..."
+    """
+    assignments, values, executes = [], [], []
+    for position, (statement, args) in enumerate(calls):
+        args = tuple(args or ())
+        if len(args) != statement.param_count:
+            raise ValueError(f"Statement {statement.name!r} takes {statement.param_count} arguments, "
+                             f"got {len(args)}")
+        variables = [f"@p{position}_{index}" for index in range(len(args))]
+        assignments.extend(f"{variable} = %s" for variable in variables)
+        values.extend(args)
+        executes.append(f"EXECUTE {statement.name}" + (f" USING {', '.join(variables)}" if variables else ""))
+    parts = [cursor.mogrify("SET " + ", ".join(assignments), values)] if assignments else []
+    return ";".join(parts + executes)
+
+
+def build_client_batch(cursor, calls):
+    """
+    Returns:
+        str: The calls escaped client-side and joined into one multi-statement text
+    """
+    return ";".join(cursor.mogrify(statement.sql, args) for statement, args in calls)
+
+
+def _is_unknown_statement(error):
+    return isinstance(error, pymysql.err.MySQLError) and error.args and error.args[0] == ER.UNKNOWN_STMT_HANDLER
+
+
+def _missing_statements(connection, calls):
+    prepared = _prepared_names(connection)
+    missing = []
+    for statement, _ in calls:
+        if statement.name not in prepared and statement not in missing:
+            missing.append(statement)
+    return missing
+
+
+def _mark_prepared(connection, statement):
+    _prepared_names(connection).add(statement.name)
+    _record_prepare(statement)
+
+
+def _prepare_failed(connection, statement, error):
+    logger.warning(f"Server-side prepare of {statement.name} failed, using client-side statements: {error}")
+    _forget_prepared(connection, unsupported=True)
+
+
+def _collect_check(calls, results):
+    if len(results) < len(calls):
+        raise pymysql.err.InterfaceError(f"Expected {len(calls)} result sets, got {len(results)}")
+    return results
+
+
+def run_statements(cursor, calls, mode=None):
+    """
+    Run registered statements on cursor and return their rows. In "prepared" mode each
+    statement is prepared once per connection and reused by every later call; the
+    arguments and all EXECUTEs then go to the server in one round-trip. Connections
+    without multi-statements, or whose server rejects PREPARE, use "client" mode: one
+    round-trip for all calls with multi-statements, otherwise one per call.
+
+    Args:
+        cursor: pymysql cursor (any row type)
+        calls (list): (SQLStatement, args) pairs
+        mode (str, optional): "prepared" or "client" (defaults to MYSQL_STATEMENT_MODE)
+
+    Returns:
+        list: One list of rows per call, in order
+    """
+    calls = list(calls)
+    if not calls:
+        return []
+    connection = getattr(cursor, "connection", None)
+    if _use_prepared(connection, mode):
+        try:
+            return _run_prepared(cursor, connection, calls)
+        except pymysql.err.MySQLError as e:
+            if not _is_unknown_statement(e):
+                raise
+            # The session lost its statements; prepare them again once
+            logger.warning(f"Prepared statements missing on connection, preparing again: {e}")
+            _forget_prepared(connection)
+            return _run_prepared(cursor, connection, calls)
+    return _run_client(cursor, connection, calls)
+
+
+def _run_prepared(cursor, connection, calls):
+    for statement in _missing_statements(connection, calls):
+        try:
+            cursor.execute(build_prepare_sql(cursor, statement))
+        except pymysql.err.MySQLError as e:
+            _prepare_failed(connection, statement, e)
+            return _run_client(cursor, connection, calls)
+        _mark_prepared(connection, statement)
+    return _run_batch(cursor, calls, build_prepared_batch(cursor, calls))
+
+
+def _run_client(cursor, connection, calls):
+    if len(calls) > 1 and supports_multi_statements(connection):
+        return _run_batch(cursor, calls, build_client_batch(cursor, calls))
+
+    results = []
+    for statement, args in calls:
+        started = time.perf_counter()
+        try:
+            cursor.execute(statement.sql, args)
+            results.append(cursor.fetchall())
+        except Exception:
+            _record([statement], time.perf_counter() - started, error=True)
+            raise
+        _record([statement], time.perf_counter() - started)
+    return results
+
+
+def _run_batch(cursor, calls, sql):
+    """Send sql in one round-trip and collect the row-returning result sets."""
+    statements = [statement for statement, _ in calls]
+    started = time.perf_counter()
+    try:
+        cursor.execute(sql)
+        results = []
+        while True:
+            if cursor.description is not None:
+                results.append(cursor.fetchall())
+                if len(results) == len(calls):
+                    break
+            if not cursor.nextset():
+                break
+        _collect_check(calls, results)
+    except Exception:
+        _record(statements, time.perf_counter() - started, error=True)
+        raise
+    _record(statements, time.perf_counter() - started)
+    return results
+
+
+async def run_statements_async(cursor, calls, mode=None):
+    """
+    run_statements for aiomysql cursors, with the same modes and statistics.
+
+    Args:
+        cursor: aiomysql cursor (any row type)
+        calls (list): (SQLStatement, args) pairs
+        mode (str, optional): "prepared" or "client" (defaults to MYSQL_STATEMENT_MODE)
+
+    Returns:
+        list: One list of rows per call, in order
+    """
+    calls = list(calls)
+    if not calls:
+        return []
+    connection = getattr(cursor, "connection", None)
+    if _use_prepared(connection, mode):
+        try:
+            return await _run_prepared_async(cursor, connection, calls)
+        except pymysql.err.MySQLError as e:
+            if not _is_unknown_statement(e):
+                raise
+            logger.warning(f"Prepared statements missing on connection, preparing again: {e}")
+            _forget_prepared(connection)
+            return await _run_prepared_async(cursor, connection, calls)
+    return await _run_client_async(cursor, connection, calls)
+
+
+async def _run_prepared_async(cursor, connection, calls):
+    for statement in _missing_statements(connection, calls):
+        try:
+            await cursor.execute(build_prepare_sql(cursor, statement))
+        except pymysql.err.MySQLError as e:
+            _prepare_failed(connection, statement, e)
+            return await _run_client_async(cursor, connection, calls)
+        _mark_prepared(connection, statement)
+    return await _run_batch_async(cursor, calls, build_prepared_batch(cursor, calls))
+
+
+async def _run_client_async(cursor, connection, calls):
+    if len(calls) > 1 and supports_multi_statements(connection):
+        return await _run_batch_async(cursor, calls, build_client_batch(cursor, calls))
+
+    results = []
+    for statement, args in calls:
+        started = time.perf_counter()
+        try:
+            await cursor.execute(statement.sql, args)
+            results.append(await cursor.fetchall())
+        except Exception:
+            _record([statement], time.perf_counter() - started, error=True)
+            raise
+        _record([statement], time.perf_counter() - started)
+    return results
+
+
+async def _run_batch_async(cursor, calls, sql):
+    statements = [statement for statement, _ in calls]
+    started = time.perf_counter()
+    try:
+        await cursor.execute(sql)
+        results = []
+        while True:
+            if cursor.description is not None:
+                results.append(await cursor.fetchall())
+                if len(results) == len(calls):
+                    break
+            if not await cursor.nextset():
+                break
+        _collect_check(calls, results)
+    except Exception:
+        _record(statements, time.perf_counter() - started, error=True)
+        raise
+    _record(statements, time.perf_counter() - started)
+    return results
+
+
+class ColumnRow:
+    """
+    Read-only view of a tuple row that looks columns up by name through a shared
+    column index, like a DictCursor row. stream_rows moves one view along the rows
+    instead of building a dict per row.
+    """
+
+    __slots__ = ("index", "row")
+
+    def __init__(self, index, row=None):
+        """
+        Args:
+            index (dict): {column name: position} from column_index
+            row (tuple, optional): Current row
+        """
+        self.index = index
+        self.row = row
+
+    def __getitem__(self, name):
+        return self.row[self.index[name]]
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def get(self, name, default=None):
+        position = self.index.get(name)
+        return default if position is None else self.row[position]
+
+    def keys(self):
+        return self.index.keys()
+
+
+def column_index(cursor):
+    """
+    Returns:
+        dict: {column name: position} for the cursor's current result set
+    """
+    return {column[0]: position for position, column in enumerate(cursor.description or ())}
+
+
+def stream_rows(cursor, statement, args=None, fetch_size=STREAM_FETCH_SIZE):
+    """
+    Run a registered statement on an unbuffered cursor (pymysql.cursors.SSCursor) and
+    yield its rows one at a time, reading fetch_size rows from the server at a time.
+    Each row is the same ColumnRow view moved to the next tuple, so callers must copy
+    values they keep. Streams always escape arguments client-side: an unbuffered result
+    has to be read to the end before the session can run anything else.
+
+    Args:
+        cursor: Unbuffered tuple cursor
+        statement (SQLStatement): Statement to run
+        args (tuple, optional): Statement arguments
+        fetch_size (int): Rows per fetchmany() call
+
+    Yields:
+        ColumnRow: The current row
+    """
+    started = time.perf_counter()
+    try:
+        cursor.execute(statement.sql, args)
+        view = ColumnRow(column_index(cursor))
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            for row in rows:
+                view.row = row
+                yield view
+    except Exception:
+        _record([statement], time.perf_counter() - started, error=True)
+        raise
+    _record([statement], time.perf_counter() - started)
+
+
+async def stream_rows_async(cursor, statement, args=None, fetch_size=STREAM_FETCH_SIZE):
+    """
+    stream_rows for unbuffered aiomysql cursors (aiomysql.SSCursor).
+
+    Yields:
+        ColumnRow: The current row
+    """
+    started = time.perf_counter()
+    try:
+        await cursor.execute(statement.sql, args)
+        view = ColumnRow(column_index(cursor))
+        while True:
+            rows = await cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            for row in rows:
+                view.row = row
+                yield view
+    except Exception:
+        _record([statement], time.perf_counter() - started, error=True)
+        raise
+    _record([statement], time.perf_counter() - started)
@@ -1,7 +1,7 @@
-import configparser
 import platform
 from pathlib import Path
 import logging
+from utils.config.configRegistry import get_config
  
 def get_project_root():
     """
@@ -11,28 +11,29 @@ def get_project_root():
     return Path(__file__).resolve().parent.parent.parent  # Adjust depth if needed
 
 
+# Resolved once; neither the OS nor the project location changes while the process runs
+OS_TYPE = platform.system().lower()  # 'windows' or 'linux'
+FILE_PATH_CONFIG = get_project_root() / "Config" / "filePathConfig.ini"
+
+_logging_configured = False
+
 def get_filePath(key):
+    global _logging_configured
     try:
        
         logger = logging.getLogger("System_logger")
-        logging.basicConfig(level=logging.INFO)  # Configure logging if not already set
-
-        # Initialize ConfigParser
-        config = configparser.ConfigParser()
+        if not _logging_configured:
+            logging.basicConfig(level=logging.INFO)  # Configure logging if not already set
+            _logging_configured = True
 
-        # Get the project root dynamically
-        project_root = get_project_root()
+        config_file_path = FILE_PATH_CONFIG
 
-        # Construct the config file path
-        config_file_path = project_root / "Config" / "filePathConfig.ini" 
-
-        if not config_file_path.is_file():
+        # Parsed once and cached; re-read only when the file's mtime changes
+        config = get_config(config_file_path)
+        if config is None:
             raise FileNotFoundError(f"Configuration file '{config_file_path}' not found.")
 
-        config.read(str(config_file_path))  # read content of filePathConfig.ini
-
-        # Determine the operating system
-        os_type = platform.system().lower()  # 'windows' or 'linux'
+        os_type = OS_TYPE
 
         # Map OS type to key suffix
         os_suffix = "WIN" if os_type == 'windows' else "LIN" # change this into preffix
@@ -15,5 +15,18 @@ def get_logger(logger_name):
     """Retrieve a logger by name."""
     return logging.getLogger(logger_name)
 
+class IncidentLoggerAdapter(logging.LoggerAdapter):
+    """Prefixes every message with the account and incident it belongs to."""
+
+    def process(self, msg, kwargs):
+        return f"[account={self.extra['account_num']} incident={self.extra['incident_id']}] {msg}", kwargs
+
+def get_incident_logger(logger_name, account_num, incident_id):
+    """Retrieve a logger whose messages stay correlated with one incident across threads."""
+    return IncidentLoggerAdapter(
+        logging.getLogger(logger_name),
+        {"account_num": account_num, "incident_id": incident_id}
+    )
+
 # Setup logging on module import
 setup_logging()
\ No newline at end of file
@@ -0,0 +1,322 @@
+import atexit
+import os
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.logger.logger import get_logger
+from utils.filePath.filePath import get_filePath
+from utils.config.configRegistry import get_cached_config
+
+logger = get_logger("task_status_logger")
+
+# Upper bounds (seconds) of the stage latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_enabled = False
+_exporters = []
+_exporters_lock = threading.Lock()
+
+
+def _format_labels(label_names, label_values, extra=""):
+    pairs = [f'{name}="{value}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels, rendered in Prometheus text format."""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}  # label values tuple -> count
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in values:
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels, rendered in Prometheus text format."""
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values tuple -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        with self._lock:
+            series_items = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, series in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _format_labels(self.label_names, label_values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+# Process-wide metrics
+STAGE_SECONDS = Histogram(
+    "request_log_stage_seconds",
+    "Duration of each case registration stage in seconds",
+    ("stage",)
+)
+STAGE_ERRORS = Counter(
+    "request_log_stage_errors_total",
+    "Stages that raised an exception",
+    ("stage",)
+)
+INCIDENTS = Counter(
+    "request_log_incidents_total",
+    "Incidents processed, by result",
+    ("result",)
+)
+STATUS_UPDATES = Counter(
+    "request_log_status_updates_total",
+    "Request status updates written to MongoDB, by result",
+    ("result",)
+)
+_METRICS = [STAGE_SECONDS, STAGE_ERRORS, INCIDENTS, STATUS_UPDATES]
+
+
+def register_metric(metric):
+    """Add a Counter or Histogram to the exported metrics and return it."""
+    _METRICS.append(metric)
+    return metric
+
+
+class _StageTimer:
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        STAGE_SECONDS.observe(time.perf_counter() - self.started, self.stage)
+        if exc_type is not None:
+            STAGE_ERRORS.inc(self.stage)
+        return False
+
+
+_NOOP_TIMER = nullcontext()
+
+
+def timed(stage):
+    """
+    Context manager recording how long a stage took in STAGE_SECONDS.
+    Returns a shared no-op context when metrics are disabled.
+
+    Args:
+        stage (str): Stage name, e.g. "customer_read"
+    """
+    if not _enabled:
+        return _NOOP_TIMER
+    return _StageTimer(stage)
+
+
+def increment(counter, *label_values, amount=1):
+    """Increment a counter if metrics are enabled."""
+    if _enabled:
+        counter.inc(*label_values, amount=amount)
+
+
+def metrics_enabled():
+    return _enabled
+
+
+def set_metrics_enabled(enabled):
+    """Turn recording on or off without starting an exporter."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def render_metrics():
+    """
+    Returns:
+        str: Every registered metric in Prometheus text exposition format
+    """
+    lines = []
+    for metric in list(_METRICS):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _build_metrics_config(config):
+    config_map = {
+        'enabled': False,
+        'http_host': '127.0.0.1',
+        'http_port': 0,  # 0 disables the HTTP endpoint
+        'file_path': '',  # Empty disables the file export
+        'file_interval': 15.0
+    }
+    if config is not None and 'METRICS' in config:
+        section = config['METRICS']
+        config_map.update({
+            'enabled': section.getboolean('ENABLED', config_map['enabled']),
+            'http_host': section.get('HTTP_HOST', config_map['http_host']).strip(),
+            'http_port': section.getint('HTTP_PORT', config_map['http_port']),
+            'file_path': section.get('FILE_PATH', config_map['file_path']).strip(),
+            'file_interval': section.getfloat('FILE_INTERVAL', config_map['file_interval'])
+        })
+    return config_map
+
+
+def get_metrics_config():
+    """
+    Returns metrics settings from the METRICS section of databaseConfig.ini
+    as a dictionary (hash map), falling back to defaults for missing values
+    """
+    try:
+        return dict(get_cached_config(get_filePath("databaseConfig"), 'METRICS', _build_metrics_config))
+    except Exception as e:
+        logger.error(f"Error reading metrics config: {e}")
+        return _build_metrics_config(None)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_metrics_file(file_path):
+    """Atomically replace file_path with the current metrics (textfile collector format)."""
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as metrics_file:
+        metrics_file.write(render_metrics())
+    os.replace(temp_path, file_path)
+
+
+def _write_periodically(file_path, interval, stop_event):
+    while not stop_event.wait(interval):
+        try:
+            write_metrics_file(file_path)
+        except Exception as e:
+            logger.error(f"Error writing metrics file {file_path}: {e}")
+
+
+def start_metrics_exporter(instance=None):
+    """
+    Enable metrics and start the exporters configured in the METRICS section:
+    an HTTP endpoint serving /metrics and/or a file rewritten every FILE_INTERVAL seconds.
+    Does nothing when METRICS.ENABLED is false. Safe to call more than once.
+
+    Args:
+        instance (int, optional): Index of this process when several run side by side
+            (e.g. shard workers). Instance i serves on HTTP_PORT + 1 + i and writes
+            FILE_PATH with a ".i" suffix so the processes do not collide.
+
+    Returns:
+        bool: True if metrics are enabled
+    """
+    metrics_config = get_metrics_config()
+    if not metrics_config['enabled']:
+        return False
+    if instance is not None:
+        if metrics_config['http_port']:
+            metrics_config['http_port'] += 1 + instance
+        if metrics_config['file_path']:
+            metrics_config['file_path'] = f"{metrics_config['file_path']}.{instance}"
+
+    with _exporters_lock:
+        set_metrics_enabled(True)
+        if _exporters:
+            return True
+
+        if metrics_config['http_port']:
+            try:
+                server = ThreadingHTTPServer((metrics_config['http_host'], metrics_config['http_port']),
+                                             _MetricsHandler)
+                server.daemon_threads = True
+                threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+                _exporters.append(("http", server))
+                logger.info(f"Serving metrics on http://{metrics_config['http_host']}:"
+                            f"{server.server_address[1]}/metrics")
+            except OSError as e:
+                logger.error(f"Could not start metrics endpoint: {e}")
+
+        if metrics_config['file_path']:
+            stop_event = threading.Event()
+            threading.Thread(
+                target=_write_periodically,
+                args=(metrics_config['file_path'], max(1.0, metrics_config['file_interval']), stop_event),
+                name="metrics-file",
+                daemon=True
+            ).start()
+            _exporters.append(("file", (metrics_config['file_path'], stop_event)))
+            logger.info(f"Writing metrics to {metrics_config['file_path']} "
+                        f"every {metrics_config['file_interval']}s")
+    return True
+
+
+def stop_metrics_exporter():
+    """Stop the exporters, writing the metrics file one last time."""
+    with _exporters_lock:
+        exporters = list(_exporters)
+        _exporters.clear()
+    for kind, exporter in exporters:
+        try:
+            if kind == "http":
+                exporter.shutdown()
+                exporter.server_close()
+            else:
+                file_path, stop_event = exporter
+                stop_event.set()
+                write_metrics_file(file_path)
+        except Exception as e:
+            logger.error(f"Error stopping metrics exporter: {e}")
+
+
+atexit.register(stop_metrics_exporter)